@@ -0,0 +1,3 @@
+"""
+plotting benchmarks for airspeed velocity
+"""
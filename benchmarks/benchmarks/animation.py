@@ -0,0 +1,72 @@
+"""
+Benchmarks for plotting.animation
+"""
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from plotting.animation import animate
+from plotting.colormaps import contour_plot
+from plotting.points import line_plot
+
+from .common import grid, random_walk
+
+N_FRAMES = 20
+
+
+class LineAnimation:
+    """
+    Rendering a PNG sequence of line frames by updating the artists of one
+    figure compared to one line_plot call per frame
+    """
+    timeout = 600
+    params = [[10 ** 3, 10 ** 5], ['update', 'blit', 'replot']]
+    param_names = ['n_points', 'method']
+
+    def setup(self, n_points, method):
+        line = random_walk(n_points)
+        self.frames = [line + [0, i] for i in range(N_FRAMES)]
+        self.ylim = (line[:, 1].min(), line[:, 1].max() + N_FRAMES)
+        self.out_dir = tempfile.mkdtemp()
+        self.pattern = os.path.join(self.out_dir, 'frame_{:03d}.png')
+
+    def teardown(self, n_points, method):
+        shutil.rmtree(self.out_dir, ignore_errors=True)
+
+    def time_frames(self, n_points, method):
+        if method == 'replot':
+            for i, line in enumerate(self.frames):
+                line_plot(line, ylim=self.ylim,
+                          filename=self.pattern.format(i), showplot=False)
+        else:
+            animate(line_plot, self.frames, self.pattern, ylim=self.ylim,
+                    blit=method == 'blit')
+
+
+class ContourAnimation:
+    """
+    Rendering a PNG sequence of contour frames by re-contouring on one
+    figure compared to one contour_plot call per frame
+    """
+    timeout = 600
+    params = [[10 ** 4, 10 ** 6], ['blit', 'replot']]
+    param_names = ['n_points', 'method']
+
+    def setup(self, n_points, method):
+        x, y, z = grid(n_points)
+        self.frames = [(x, y, np.roll(z, i, axis=1))
+                       for i in range(N_FRAMES)]
+        self.out_dir = tempfile.mkdtemp()
+        self.pattern = os.path.join(self.out_dir, 'frame_{:03d}.png')
+
+    def teardown(self, n_points, method):
+        shutil.rmtree(self.out_dir, ignore_errors=True)
+
+    def time_frames(self, n_points, method):
+        if method == 'replot':
+            for i, frame in enumerate(self.frames):
+                contour_plot(frame, zlim=(-1, 1),
+                             filename=self.pattern.format(i), showplot=False)
+        else:
+            animate(contour_plot, self.frames, self.pattern, zlim=(-1, 1))
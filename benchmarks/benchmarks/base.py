@@ -0,0 +1,113 @@
+"""
+Benchmarks for plotting.base
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from plotting.colormaps import heatmap_plot
+from plotting.layout import LayoutCache
+from plotting.points import line_plot, scatter_plot
+
+from .common import (_RenderBenchmark, FORMATS, random_points,
+                     random_walk)
+
+
+class MultiFormatExport:
+    """
+    Saving one figure as png, pdf and svg from a single draw compared to one
+    plotting call per format
+    """
+    params = [10 ** 3, 10 ** 5]
+    param_names = ['n_points']
+
+    def setup(self, n_points):
+        x = np.linspace(0, 10, n_points)
+        self.lines = [np.column_stack([x, np.sin(x * i)]) for i in range(3)]
+        self.out_dir = tempfile.mkdtemp()
+        self.filenames = [os.path.join(self.out_dir, 'line.{}'.format(ext))
+                          for ext in FORMATS]
+
+    def teardown(self, n_points):
+        shutil.rmtree(self.out_dir)
+
+    def time_separate_calls(self, n_points):
+        for filename in self.filenames:
+            line_plot(*self.lines, filename=filename, showplot=False)
+
+    def time_single_call(self, n_points):
+        line_plot(*self.lines, filename=self.filenames, showplot=False)
+
+
+class ThreadedRender:
+    """
+    Rendering 8 figures to memory from a thread pool, Agg releases the GIL
+    while drawing so renders overlap on multi-core machines
+    """
+    params = [1, 2, 4]
+    param_names = ['n_threads']
+
+    def setup(self, n_threads):
+        x = np.linspace(0, 10, 10 ** 5)
+        self.lines = [np.column_stack([x, np.sin(x * i)]) for i in range(3)]
+
+    def _render(self, i):
+        return line_plot(*self.lines, buffer='png')
+
+    def time_render(self, n_threads):
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            list(executor.map(self._render, range(8)))
+
+
+class LayoutCacheBatch:
+    """
+    Rendering a batch of 10 figures with the same labels and limits, laying
+    out and measuring each figure compared to reusing the layout of the first
+    """
+    params = [[False, True], FORMATS]
+    param_names = ['layout_cache', 'fmt']
+
+    def setup(self, layout_cache, fmt):
+        self.lines = [random_walk(1000, seed=seed) for seed in range(10)]
+        self.layout_cache = LayoutCache() if layout_cache else None
+
+    def time_batch(self, layout_cache, fmt):
+        for line in self.lines:
+            line_plot(line, xlabel='time (s)', ylabel='value',
+                      xlim=(0, 1000), ylim=(-100, 100), title='random walk',
+                      buffer=fmt, layout_cache=self.layout_cache)
+
+
+class VectorRasterize(_RenderBenchmark):
+    """
+    Vector output with every artist written as vector primitives compared to
+    rasterizing the lines, scatter points and meshes with more than
+    plotting.writer.RASTERIZE_THRESHOLD points
+    """
+    params = [[10 ** 4, 10 ** 5, 10 ** 6], ['line', 'scatter', 'heatmap'],
+              [False, True], ['pdf', 'svg']]
+    param_names = ['n_points', 'plot', 'rasterize', 'fmt']
+
+    def make_data(self, n_points, plot, rasterize):
+        if plot == 'line':
+            return random_walk(n_points)
+
+        if plot == 'scatter':
+            return random_points(n_points)
+
+        side = int(np.sqrt(n_points))
+
+        return np.random.default_rng(42).standard_normal((side, side))
+
+    def render(self, n_points, plot, rasterize, fmt):
+        kwargs = {'filename': self.filename, 'showplot': False,
+                  'rasterize': rasterize}
+        if plot == 'line':
+            line_plot(self.data, **kwargs)
+        elif plot == 'scatter':
+            scatter_plot(*self.data, **kwargs)
+        else:
+            heatmap_plot(self.data, xticklabels=False, yticklabels=False,
+                         **kwargs)
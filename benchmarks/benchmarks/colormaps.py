@@ -0,0 +1,29 @@
+"""
+Benchmarks for plotting.colormaps
+"""
+from plotting.colormaps import contour_plot, heatmap_plot
+
+from .common import _RenderBenchmark, FORMATS, grid, N_POINTS
+
+
+class HeatmapPlot(_RenderBenchmark):
+    params = [N_POINTS, FORMATS]
+    param_names = ['n_points', 'fmt']
+
+    def make_data(self, n_points):
+        return grid(n_points)[2]
+
+    def render(self, n_points, fmt):
+        heatmap_plot(self.data, xticklabels=False, yticklabels=False,
+                     filename=self.filename, showplot=False)
+
+
+class ContourPlot(_RenderBenchmark):
+    params = [N_POINTS, FORMATS]
+    param_names = ['n_points', 'fmt']
+
+    def make_data(self, n_points):
+        return grid(n_points)
+
+    def render(self, n_points, fmt):
+        contour_plot(self.data, filename=self.filename, showplot=False)
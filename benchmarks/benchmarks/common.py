@@ -0,0 +1,176 @@
+"""
+Shared synthetic data and render harness for the plotting benchmarks
+"""
+import os
+import shutil
+import tempfile
+import matplotlib
+import numpy as np
+import pandas as pd
+
+matplotlib.use('Agg')
+
+FORMATS = ('png', 'pdf', 'svg')
+N_POINTS = (10 ** 3, 10 ** 5, 10 ** 7)
+N_COLUMNS = (10, 100, 1000, 10 ** 4)
+# Vector output of every point is only benchmarked up to this size
+MAX_VECTOR_POINTS = 10 ** 6
+
+
+def random_walk(n_points, seed=42):
+    """
+    nx2 line of a random walk
+
+    Parameters
+    ----------
+    n_points : int
+        Number of points
+    seed : int, optional
+        Random seed, by default 42
+
+    Returns
+    -------
+    ndarray
+    """
+    rng = np.random.default_rng(seed)
+    x = np.arange(n_points, dtype=np.float64)
+
+    return np.column_stack([x, np.cumsum(rng.standard_normal(n_points))])
+
+
+def random_points(n_points, seed=42):
+    """
+    Correlated x, y point cloud
+
+    Parameters
+    ----------
+    n_points : int
+        Number of points
+    seed : int, optional
+        Random seed, by default 42
+
+    Returns
+    -------
+    x : ndarray
+    y : ndarray
+    """
+    rng = np.random.default_rng(seed)
+    x = rng.standard_normal(n_points)
+
+    return x, x + rng.standard_normal(n_points)
+
+
+def wide_df(n_rows, n_cols, seed=42):
+    """
+    Hourly timeseries DataFrame of random walks
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of timesteps
+    n_cols : int
+        Number of columns
+    seed : int, optional
+        Random seed, by default 42
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2020-01-01', periods=n_rows, freq='h')
+    columns = ['source_{}'.format(i) for i in range(n_cols)]
+    data = np.cumsum(rng.standard_normal((n_rows, n_cols)), axis=0)
+
+    return pd.DataFrame(data, index=index, columns=columns)
+
+
+def long_df(n_rows, n_groups=10, n_hue=4, seed=42):
+    """
+    Seaborn style long DataFrame with x, hue and value columns
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows
+    n_groups : int, optional
+        Number of x categories, by default 10
+    n_hue : int, optional
+        Number of hue categories, by default 4
+    seed : int, optional
+        Random seed, by default 42
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    group = rng.integers(0, n_groups, n_rows)
+
+    return pd.DataFrame({'group': group,
+                         'hue': rng.integers(0, n_hue, n_rows),
+                         'value': rng.standard_normal(n_rows) + group})
+
+
+def grid(n_points):
+    """
+    (x, y, z) grid of about n_points values
+
+    Parameters
+    ----------
+    n_points : int
+        Approximate number of grid values
+
+    Returns
+    -------
+    tuple
+        (x, y, z) 2D arrays
+    """
+    side = int(np.sqrt(n_points))
+    x, y = np.meshgrid(np.linspace(0, 4 * np.pi, side),
+                       np.linspace(0, 4 * np.pi, side))
+
+    return x, y, np.sin(x) * np.cos(y)
+
+
+class _RenderBenchmark:
+    """
+    Wall time, peak memory and output size of a plotting call for each
+    output format. Subclasses define params/param_names, with fmt as the last
+    parameter, a make_data(*params) method and a render(filename, *params)
+    method.
+    """
+    timeout = 600
+    max_vector_points = MAX_VECTOR_POINTS
+
+    def setup(self, *params):
+        fmt = params[-1]
+        if fmt != 'png' and params[0] > self.max_vector_points:
+            raise NotImplementedError('Vector output is too large to '
+                                      'benchmark')
+
+        self.data = self.make_data(*params[:-1])
+        self.out_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.out_dir, 'figure.' + fmt)
+
+    def teardown(self, *params):
+        shutil.rmtree(self.out_dir, ignore_errors=True)
+
+    def make_data(self, *params):
+        raise NotImplementedError
+
+    def render(self, *params):
+        raise NotImplementedError
+
+    def time_render(self, *params):
+        self.render(*params)
+
+    def peakmem_render(self, *params):
+        self.render(*params)
+
+    def track_filesize(self, *params):
+        self.render(*params)
+
+        return os.path.getsize(self.filename)
+
+    track_filesize.unit = 'bytes'
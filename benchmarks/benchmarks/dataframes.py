@@ -0,0 +1,179 @@
+"""
+Benchmarks for plotting.dataframes
+"""
+import numpy as np
+import pandas as pd
+
+from plotting.dataframes import (bar_plot, box_plot, df_bar_plot,
+                                 df_error_plot, df_line_plot, df_pie_plot,
+                                 df_scatter, dist_plot, pivot_df,
+                                 pivot_timeseries, point_plot,
+                                 stackedbar_plot)
+
+from .common import (_RenderBenchmark, FORMATS, long_df, N_COLUMNS, N_POINTS,
+                     random_points, wide_df)
+
+
+class PivotTimeseries:
+    """
+    Time and peak memory of pivot_timeseries and pivot_df against the number
+    of columns
+    """
+    params = [N_COLUMNS]
+    param_names = ['n_cols']
+
+    def setup(self, n_cols):
+        self.df = wide_df(8760, n_cols)
+
+    def time_pivot_timeseries(self, n_cols):
+        pivot_timeseries(self.df, 'value', timezone=-7)
+
+    def peakmem_pivot_timeseries(self, n_cols):
+        pivot_timeseries(self.df, 'value', timezone=-7)
+
+    def time_pivot_df(self, n_cols):
+        pivot_df(self.df, 'value')
+
+    def peakmem_pivot_df(self, n_cols):
+        pivot_df(self.df, 'value')
+
+
+class DfLinePlot(_RenderBenchmark):
+    params = [N_COLUMNS, FORMATS]
+    param_names = ['n_cols', 'fmt']
+    max_vector_points = 1000
+
+    def make_data(self, n_cols):
+        return wide_df(1000, n_cols)
+
+    def render(self, n_cols, fmt):
+        df_line_plot(self.data, plot_legend=False, filename=self.filename,
+                     showplot=False)
+
+
+class DfLinePlotRows(_RenderBenchmark):
+    params = [N_POINTS, [None, 'minmax'], FORMATS]
+    param_names = ['n_points', 'decimate', 'fmt']
+
+    def make_data(self, n_points, decimate):
+        return wide_df(n_points, 3)
+
+    def render(self, n_points, decimate, fmt):
+        df_line_plot(self.data, decimate=decimate, filename=self.filename,
+                     showplot=False)
+
+
+class DfErrorPlot(_RenderBenchmark):
+    params = [[10, 100, 1000], FORMATS]
+    param_names = ['n_cols', 'fmt']
+
+    def make_data(self, n_cols):
+        df = wide_df(100, n_cols)
+
+        return df, df.abs() / 10
+
+    def render(self, n_cols, fmt):
+        df, error = self.data
+        df_error_plot(df, error.copy(), plot_legend=False,
+                      filename=self.filename, showplot=False)
+
+
+class DfBarPlot(_RenderBenchmark):
+    params = [[10, 100, 1000], FORMATS]
+    param_names = ['n_cols', 'fmt']
+
+    def make_data(self, n_cols):
+        return wide_df(10, n_cols)
+
+    def render(self, n_cols, fmt):
+        df_bar_plot(self.data, plot_legend=False, filename=self.filename,
+                    showplot=False)
+
+
+class DfPiePlot(_RenderBenchmark):
+    params = [[10, 100, 1000], FORMATS]
+    param_names = ['n_wedges', 'fmt']
+
+    def make_data(self, n_wedges):
+        return wide_df(n_wedges, 1).abs()
+
+    def render(self, n_wedges, fmt):
+        df_pie_plot(self.data, y='source_0', plot_legend=False,
+                    filename=self.filename, showplot=False)
+
+
+class DfScatter(_RenderBenchmark):
+    params = [N_POINTS, [False, True], FORMATS]
+    param_names = ['n_points', 'density', 'fmt']
+
+    def make_data(self, n_points, density):
+        x, y = random_points(n_points)
+
+        return pd.DataFrame({'x': x, 'y': y})
+
+    def render(self, n_points, density, fmt):
+        df_scatter(self.data, x='x', y='y', density=density,
+                   filename=self.filename, showplot=False)
+
+
+class BoxPlot(_RenderBenchmark):
+    params = [N_POINTS, ['seaborn', 'native'], FORMATS]
+    param_names = ['n_rows', 'engine', 'fmt']
+
+    def make_data(self, n_rows, engine):
+        return long_df(n_rows)
+
+    def render(self, n_rows, engine, fmt):
+        box_plot(self.data, x='group', y='value', engine=engine,
+                 filename=self.filename, showplot=False)
+
+
+class BarPlot(_RenderBenchmark):
+    params = [[10 ** 3, 10 ** 5, 10 ** 6], ['seaborn', 'native'], FORMATS]
+    param_names = ['n_rows', 'engine', 'fmt']
+
+    def make_data(self, n_rows, engine):
+        return long_df(n_rows)
+
+    def render(self, n_rows, engine, fmt):
+        bar_plot(self.data, x='group', y='value', hue='hue', engine=engine,
+                 filename=self.filename, showplot=False)
+
+
+class PointPlot(_RenderBenchmark):
+    params = [[10 ** 3, 10 ** 5, 10 ** 6], ['seaborn', 'native'], FORMATS]
+    param_names = ['n_rows', 'engine', 'fmt']
+
+    def make_data(self, n_rows, engine):
+        return long_df(n_rows)
+
+    def render(self, n_rows, engine, fmt):
+        point_plot(self.data, x='group', y='value', hue='hue', engine=engine,
+                   filename=self.filename, showplot=False)
+
+
+class StackedBarPlot(_RenderBenchmark):
+    params = [[10, 100, 1000], [4, 100], FORMATS]
+    param_names = ['n_bars', 'n_stacks', 'fmt']
+
+    def make_data(self, n_bars, n_stacks):
+        # every (group, hue) pair appears 10 times and is aggregated
+        n_rows = n_bars * n_stacks * 10
+        return long_df(n_rows).assign(
+            group=np.arange(n_rows) % n_bars,
+            hue=np.arange(n_rows) // n_bars % n_stacks)
+
+    def render(self, n_bars, n_stacks, fmt):
+        stackedbar_plot(self.data, 'group', 'value', 'hue',
+                        filename=self.filename, showplot=False)
+
+
+class DistPlot(_RenderBenchmark):
+    params = [N_POINTS, FORMATS]
+    param_names = ['n_rows', 'fmt']
+
+    def make_data(self, n_rows):
+        return wide_df(n_rows, 3)
+
+    def render(self, n_rows, fmt):
+        dist_plot(self.data, filename=self.filename, showplot=False)
@@ -0,0 +1,29 @@
+"""
+Benchmarks for the import time of the plotting package, each run in a fresh
+interpreter
+"""
+
+
+class ImportTime:
+    """
+    Importing the package, only its styles, and importing it up to the end
+    of the first render
+    """
+    timeout = 120
+
+    def timeraw_import_package(self):
+        return "import plotting"
+
+    def timeraw_import_styles(self):
+        return "from plotting import COLORS, riffle_lines"
+
+    def timeraw_import_line_plot(self):
+        return "from plotting import line_plot"
+
+    def timeraw_first_render(self):
+        return """
+        import numpy as np
+        from plotting import line_plot
+        line_plot(np.column_stack([np.arange(10), np.arange(10)]),
+                  buffer='png')
+        """
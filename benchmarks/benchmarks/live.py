@@ -0,0 +1,39 @@
+"""
+Benchmarks for plotting.live
+"""
+import numpy as np
+
+from plotting.live import live_line_plot
+from plotting.points import line_plot
+
+from .common import random_walk
+
+
+class LiveAppend:
+    """
+    Refreshing a plot after 10 new points arrive, by appending to a live
+    plot compared to re-plotting the whole history
+    """
+    timeout = 600
+    params = [10 ** 3, 10 ** 5, 10 ** 6]
+    param_names = ['n_points']
+
+    def setup(self, n_points):
+        self.history = random_walk(n_points)
+        self.live = live_line_plot(self.history, capacity=n_points)
+        self.live.draw()
+        self.x0 = n_points
+        self.y0 = self.history[-1, 1]
+
+    def _new_points(self):
+        x = np.arange(self.x0, self.x0 + 10, dtype=np.float64)
+        self.x0 += 10
+
+        return np.column_stack([x, np.full(10, self.y0)])
+
+    def time_append(self, n_points):
+        self.live.append(self._new_points())
+        self.live.to_rgba()
+
+    def time_replot(self, n_points):
+        line_plot(self.history, buffer='rgba')
@@ -0,0 +1,91 @@
+"""
+Benchmarks for plotting.points
+"""
+import numpy as np
+
+from plotting.points import (error_plot, hist_plot, line_plot, scatter_plot,
+                             sns_hist_plot)
+
+from .common import (_RenderBenchmark, FORMATS, N_POINTS, random_points,
+                     random_walk)
+
+
+class LinePlot(_RenderBenchmark):
+    params = [N_POINTS, [None, 'minmax'], FORMATS]
+    param_names = ['n_points', 'decimate', 'fmt']
+
+    def make_data(self, n_points, decimate):
+        return random_walk(n_points)
+
+    def render(self, n_points, decimate, fmt):
+        line_plot(self.data, decimate=decimate, filename=self.filename,
+                  showplot=False)
+
+
+class LineCollectionPlot(_RenderBenchmark):
+    params = [[10, 100, 1000], [False, True], FORMATS]
+    param_names = ['n_lines', 'collection', 'fmt']
+
+    def make_data(self, n_lines, collection):
+        line = random_walk(1000)
+
+        return [line + i for i in range(n_lines)]
+
+    def render(self, n_lines, collection, fmt):
+        line_plot(*self.data, collection=collection, filename=self.filename,
+                  showplot=False)
+
+
+class ErrorPlot(_RenderBenchmark):
+    params = [[10 ** 3, 10 ** 4, 10 ** 5], FORMATS]
+    param_names = ['n_points', 'fmt']
+
+    def make_data(self, n_points):
+        data = random_walk(n_points)
+        error = np.column_stack([np.full(n_points, np.nan),
+                                 np.abs(data[:, 1]) / 10])
+
+        return [(data, error)]
+
+    def render(self, n_points, fmt):
+        error_plot(self.data, filename=self.filename, showplot=False)
+
+
+class ScatterPlot(_RenderBenchmark):
+    params = [N_POINTS, [False, True], FORMATS]
+    param_names = ['n_points', 'density', 'fmt']
+
+    def make_data(self, n_points, density):
+        return random_points(n_points)
+
+    def render(self, n_points, density, fmt):
+        x, y = self.data
+        scatter_plot(x, y, density=density, filename=self.filename,
+                     showplot=False)
+
+
+class HistPlot(_RenderBenchmark):
+    params = [N_POINTS, FORMATS]
+    param_names = ['n_points', 'fmt']
+
+    def make_data(self, n_points):
+        return random_points(n_points)[0]
+
+    def render(self, n_points, fmt):
+        hist_plot(self.data, bins=50, filename=self.filename,
+                  showplot=False)
+
+
+class SnsHistPlot(_RenderBenchmark):
+    params = [N_POINTS, ['native', 'seaborn'], FORMATS]
+    param_names = ['n_points', 'engine', 'fmt']
+
+    def make_data(self, n_points, engine):
+        if engine == 'seaborn' and n_points > 10 ** 5:
+            raise NotImplementedError('seaborn kde is too slow to benchmark')
+
+        return random_points(n_points)[0]
+
+    def render(self, n_points, engine, fmt):
+        sns_hist_plot(self.data, engine=engine, filename=self.filename,
+                      showplot=False)
@@ -1,43 +1,76 @@
 """
 plotting wrapper on matplotlib and seaborn to provide a single functional
 call a la mathematica
+
+Submodules, and with them matplotlib, seaborn and pandas, are imported on
+first access of their functions (PEP 562), and the package style is applied
+on the first render instead of on import.
 """
-from .base import plotting_base
-from .colormaps import (colorbar, contour_plot, heatmap_plot)
-from .dataframes import (pivot_timeseries, pivot_df, box_plot, point_plot,
-                         dist_plot, bar_plot, df_scatter, df_line_plot,
-                         df_error_plot, stackedbar_plot, df_bar_plot,
-                         df_pie_plot)
-from .points import (COLORS, LINESTYLES, MARKERS, riffle_lines, get_colors,
-                     get_COLORS, get_line_styles, line_plot, error_plot,
-                     dual_plot, sns_hist_plot, hist_plot, scatter_plot)
-
-import matplotlib as mpl
-import seaborn as sns
-
-sns.set_style("white")
-sns.set_style("ticks")
-sns.set_palette('colorblind')
-mpl.rcParams['font.sans-serif'] = 'DejaVu Sans'
-mpl.rcParams['pdf.fonttype'] = 42
-
-
-def change_tick_style(style='classic'):
-    """
-    Change the matplotlib style between classic and new
-
-    Parameters
-    ----------
-    style : str
-        style type to set up
-    """
-    if style == 'classic':
-        mpl.rcParams['xtick.direction'] = 'in'
-        mpl.rcParams['ytick.direction'] = 'in'
-        mpl.rcParams['xtick.top'] = True
-        mpl.rcParams['ytick.right'] = True
+import importlib
+
+from .styles import (COLORS, LINESTYLES, MARKERS, riffle_lines, apply_style,
+                     change_tick_style)
+
+# public name: submodule it is imported from on first access
+_LAZY = {
+    'animate': 'animation',
+    'plotting_base': 'base',
+    'PlotBatch': 'batch',
+    'batch_plot': 'batch',
+    'colorbar': 'colormaps',
+    'contour_plot': 'colormaps',
+    'heatmap_plot': 'colormaps',
+    'pivot_timeseries': 'dataframes',
+    'pivot_df': 'dataframes',
+    'box_plot': 'dataframes',
+    'point_plot': 'dataframes',
+    'dist_plot': 'dataframes',
+    'bar_plot': 'dataframes',
+    'df_scatter': 'dataframes',
+    'df_line_plot': 'dataframes',
+    'df_error_plot': 'dataframes',
+    'stackedbar_plot': 'dataframes',
+    'df_bar_plot': 'dataframes',
+    'df_pie_plot': 'dataframes',
+    'facet_plot': 'facets',
+    'LivePlot': 'live',
+    'live_df_line_plot': 'live',
+    'live_line_plot': 'live',
+    'get_colors': 'points',
+    'get_COLORS': 'points',
+    'get_line_styles': 'points',
+    'line_plot': 'points',
+    'error_plot': 'points',
+    'dual_plot': 'points',
+    'sns_hist_plot': 'points',
+    'hist_plot': 'points',
+    'scatter_plot': 'points',
+    'RENDER_LOCK': 'rc',
+    'rc_render': 'rc',
+}
+_SUBMODULES = ('animation', 'base', 'batch', 'binning', 'cache',
+               'colormaps', 'dataframes', 'decimate', 'facets', 'kde',
+               'layout', 'live', 'points', 'pool', 'rc', 'sources', 'stats',
+               'styles', 'timing', 'version', 'writer')
+
+__all__ = ['COLORS', 'LINESTYLES', 'MARKERS', 'riffle_lines', 'apply_style',
+           'change_tick_style'] + list(_LAZY)
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        module = importlib.import_module('.' + _LAZY[name], __name__)
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module('.' + name, __name__)
     else:
-        mpl.rcParams['xtick.direction'] = 'out'
-        mpl.rcParams['ytick.direction'] = 'out'
-        mpl.rcParams['xtick.top'] = False
-        mpl.rcParams['ytick.right'] = False
+        msg = "module {} has no attribute {}".format(__name__, name)
+        raise AttributeError(msg)
+
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
@@ -0,0 +1,315 @@
+"""
+Frame sequences rendered by updating the artists of a single figure
+"""
+import os
+import time
+import numpy as np
+import numpy.ma as ma
+from matplotlib.collections import LineCollection
+from matplotlib.contour import ContourSet
+from PIL import Image
+from plotting.decimate import axis_pixel_width, decimate_line
+from plotting.points import linestyle_groups
+from plotting.pool import agg_figure
+from plotting.styles import apply_style
+from plotting.timing import PhaseTimer, plot_name
+
+
+def _line_args(frame):
+    """
+    line_plot args of a frame: a single nx2 line or a list of lines
+    """
+    if isinstance(frame, (list, tuple)):
+        return tuple(frame)
+
+    return (frame, )
+
+
+def _xy_args(frame):
+    """
+    scatter_plot args of a frame: (x, y)
+    """
+    x, y = frame
+
+    return (x, y)
+
+
+def _data_args(frame):
+    """
+    heatmap_plot and contour_plot args of a frame: the data
+    """
+    return (frame, )
+
+
+def _lines(axis):
+    """
+    Lines drawn by line_plot, a LineCollection if collection=True
+    """
+    collections = [c for c in axis.collections
+                   if isinstance(c, LineCollection)]
+
+    return collections or list(axis.lines)
+
+
+def _first_collection(axis):
+    """
+    PathCollection of scatter_plot or QuadMesh of heatmap_plot
+    """
+    return axis.collections[:1]
+
+
+def _contour_sets(axis):
+    """
+    Filled and line ContourSets of contour_plot
+    """
+    return [c for c in axis.collections if isinstance(c, ContourSet)]
+
+
+def _update_lines(axis, artists, lines, kwargs):
+    """
+    Replace the data of each line
+    """
+    method = kwargs.get('decimate')
+    if method is not None:
+        n_pixels = axis_pixel_width(axis)
+        lines = [decimate_line(np.asarray(line), n_pixels, method=method)
+                 for line in lines]
+
+    if isinstance(artists[0], LineCollection):
+        # line_plot draws one LineCollection per linestyle
+        groups = linestyle_groups(len(lines),
+                                  kwargs.get('linestyles', 'Automatic'))
+        for artist, idx in zip(artists, groups.values()):
+            artist.set_segments([np.asarray(lines[i]) for i in idx])
+
+        return artists
+
+    for artist, line in zip(artists, lines):
+        line = np.asarray(line)
+        artist.set_data(line[:, 0], line[:, 1])
+
+    return artists
+
+
+def _update_offsets(axis, artists, xy, kwargs):
+    """
+    Move the scatter points
+    """
+    artists[0].set_offsets(np.column_stack(xy))
+
+    return artists
+
+
+def _update_mesh(axis, artists, data, kwargs):
+    """
+    Replace the heat map values, the color limits of the first frame are
+    kept
+    """
+    artists[0].set_array(ma.masked_invalid(np.asarray(data[0])))
+
+    return artists
+
+
+def _update_contours(axis, artists, data, kwargs):
+    """
+    Re-contour the new z values with the levels, colors and line styles of
+    the first frame, ContourSets can not be updated in place
+    """
+    x, y, z = data[0]
+    filled = [c for c in artists if c.filled]
+    lines = [c for c in artists if not c.filled]
+    new = []
+    for cf in filled:
+        new.append(axis.contourf(x, y, ma.masked_invalid(z),
+                                 levels=cf.levels, cmap=cf.cmap,
+                                 norm=cf.norm, alpha=cf.get_alpha(),
+                                 extend=cf.extend, antialiased=True))
+        for cl in lines:
+            new.append(axis.contour(new[-1], levels=cl.levels,
+                                    colors=cl.get_edgecolor(),
+                                    linewidths=cl.get_linewidth()))
+
+    for artist in artists:
+        artist.remove()
+
+    return new
+
+
+# plotting function name: (frame to args, dynamic artists, update artists)
+_ANIMATORS = {
+    'line_plot': (_line_args, _lines, _update_lines),
+    'scatter_plot': (_xy_args, _first_collection, _update_offsets),
+    'heatmap_plot': (_data_args, _first_collection, _update_mesh),
+    'contour_plot': (_data_args, _contour_sets, _update_contours),
+}
+
+
+def iter_frames(plot_func, frames, figsize=(6, 4), dpi=100, blit=True,
+                **kwargs):
+    """
+    Render a sequence of frames by drawing the first frame with plot_func
+    and then only updating the data of its artists. The figure, axes,
+    ticks, labels and layout are built once. With blit the static
+    background is rendered once and restored before the updated artists
+    are drawn on top of it.
+
+    Parameters
+    ----------
+    plot_func : function
+        plotting.line_plot, plotting.scatter_plot, plotting.heatmap_plot or
+        plotting.contour_plot
+    frames : iterable
+        Data of each frame: a line or list of lines for line_plot, (x, y)
+        for scatter_plot, the heat map values for heatmap_plot and (x, y, z)
+        for contour_plot
+    figsize : tuple, optional
+        Width and height of figure, by default (6, 4)
+    dpi : int, optional
+        DPI resolution of figure, by default 100
+    blit : bool, optional
+        Restore a cached background and redraw only the updated artists,
+        by default True
+    kwargs : dict
+        kwargs for plot_func, applied to the first frame. Axis limits and
+        color limits of the first frame are kept for every frame, pass
+        xlim, ylim (vmin, vmax or zlim) to cover the whole sequence
+
+    Yields
+    ------
+    ndarray
+        (height, width, 4) uint8 RGBA pixels of each frame
+    """
+    name = plot_name(plot_func)
+    if name not in _ANIMATORS:
+        msg = ('plot_func must be one of {}, not {}'
+               .format(tuple(_ANIMATORS), name))
+        raise ValueError(msg)
+
+    to_args, dynamic, update = _ANIMATORS[name]
+    frames = iter(frames)
+    try:
+        first = next(frames)
+    except StopIteration:
+        return
+
+    # style the figure before plot_func applies it on its first render
+    apply_style()
+    fig = agg_figure(figsize=figsize, dpi=dpi)
+    axis = fig.add_subplot(111)
+    plot_func(*to_args(first), ax=axis, **kwargs)
+    fig.tight_layout()
+    for ax in fig.axes:
+        ax.set_autoscale_on(False)
+
+    canvas = fig.canvas
+    canvas.draw()
+    yield np.array(canvas.buffer_rgba())
+
+    artists = dynamic(axis)
+    if blit:
+        for artist in artists:
+            artist.set_animated(True)
+
+        canvas.draw()
+        background = canvas.copy_from_bbox(fig.bbox)
+
+    for frame in frames:
+        artists = update(axis, artists, to_args(frame), kwargs)
+        if blit:
+            canvas.restore_region(background)
+            for artist in artists:
+                artist.set_animated(True)
+                fig.draw_artist(artist)
+        else:
+            canvas.draw()
+
+        yield np.array(canvas.buffer_rgba())
+
+
+def animate(plot_func, frames, filename, fps=10, loop=0, figsize=(6, 4),
+            dpi=100, blit=True, **kwargs):
+    """
+    Render a sequence of frames with iter_frames and save them to an
+    animated GIF or a numbered PNG sequence through Pillow. PNG sequences
+    are written one frame at a time, Pillow's GIF writer holds every frame
+    in memory until the GIF is encoded
+
+    Parameters
+    ----------
+    plot_func : function
+        plotting.line_plot, plotting.scatter_plot, plotting.heatmap_plot or
+        plotting.contour_plot
+    frames : iterable
+        Data of each frame, see iter_frames
+    filename : str
+        '.gif' file, or PNG filename pattern with a format field for the
+        frame number, e.g. 'frame_{:04d}.png'
+    fps : float, optional
+        Frames per second of the GIF, by default 10
+    loop : int, optional
+        Number of times the GIF loops, 0 forever, by default 0
+    figsize : tuple, optional
+        Width and height of figure, by default (6, 4)
+    dpi : int, optional
+        DPI resolution of figure, by default 100
+    blit : bool, optional
+        Redraw only the updated artists over a cached background,
+        by default True
+    kwargs : dict
+        kwargs for plot_func and plotting_base, see iter_frames
+
+    Returns
+    -------
+    list
+        Files written
+
+    See Also
+    --------
+    plotting.animation.iter_frames : frame renderer
+    """
+    gif = os.path.splitext(filename)[1].lower() == '.gif'
+    if not gif and filename.format(0) == filename.format(1):
+        msg = ('filename must be a .gif or contain a format field for the '
+               'frame number, e.g. "frame_{{:04d}}.png", not {}'
+               .format(filename))
+        raise ValueError(msg)
+
+    timer = PhaseTimer('animate')
+    start = time.perf_counter()
+    rendered = iter_frames(plot_func, frames, figsize=figsize, dpi=dpi,
+                           blit=blit, **kwargs)
+
+    def images():
+        while True:
+            render_start = time.perf_counter()
+            rgba = next(rendered, None)
+            timer.add('plot', time.perf_counter() - render_start)
+            if rgba is None:
+                return
+
+            image = Image.fromarray(rgba)
+            yield image.convert('RGB') if gif else image
+
+    images = images()
+    if gif:
+        first = next(images, None)
+        if first is None:
+            raise ValueError('frames must contain at least one frame')
+
+        first.save(filename, save_all=True, append_images=images,
+                   duration=1000 / fps, loop=loop)
+        files = [filename]
+    else:
+        files = []
+        for i, image in enumerate(images):
+            files.append(filename.format(i))
+            image.save(files[-1])
+
+        if not files:
+            raise ValueError('frames must contain at least one frame')
+
+    timer.add('save', time.perf_counter() - start
+              - timer.timings.get('plot', 0.))
+    timer.finish()
+
+    return files
@@ -1,10 +1,63 @@
 """
 Plotting base
 """
+from concurrent.futures import Future
+import io
+import time
 import matplotlib.pyplot as plt
+import numpy as np
 import seaborn as sns
+from plotting.cache import get_render_cache
+from plotting.layout import get_layout_cache
+from plotting.pool import agg_figure, FIGURE_POOL
+from plotting.rc import with_rc
+from plotting.timing import PhaseTimer, plot_name
+from plotting.writer import (get_writer, is_vector, rasterize_artists,
+                             RASTERIZE_THRESHOLD, save_figure)
 
+BUFFER_FORMATS = ('png', 'svg', 'pdf', 'rgba')
+# plotting_base arguments that do not change the rendered figure
+OUTPUT_KWARGS = ('filename', 'showplot', 'pooled', 'buffer', 'cache',
+                 'writer', 'layout_cache')
 
+
+def figure_buffer(fig, buffer, dpi=100, **kwargs):
+    """
+    Render figure to memory instead of disk
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Figure to render, must be attached to an Agg based canvas for 'rgba'
+    buffer : str
+        Output format: 'png', 'svg', 'pdf' for encoded bytes or 'rgba' for
+        the raw Agg pixel buffer
+    dpi : int, optional
+        DPI resolution of figure, by default 100
+    kwargs : dict
+        kwargs for matplotlib.figure.Figure.savefig, ignored for 'rgba'
+
+    Returns
+    -------
+    bytes | ndarray
+        Encoded image bytes or a (height, width, 4) uint8 array that is a
+        zero-copy view of the Agg canvas buffer
+    """
+    if buffer not in BUFFER_FORMATS:
+        msg = ('buffer must be one of {}, not {}'
+               .format(BUFFER_FORMATS, buffer))
+        raise ValueError(msg)
+
+    if buffer == 'rgba':
+        fig.canvas.draw()
+        return np.asarray(fig.canvas.buffer_rgba())
+
+    with io.BytesIO() as f:
+        fig.savefig(f, format=buffer, dpi=dpi, **kwargs)
+        return f.getvalue()
+
+
+@with_rc
 def plotting_base(plot_func, *args, despine=True, axes=True,
                   figsize=(6, 4), dpi=100, fontsize=14,
                   xlabel=None, ylabel=None, xlim=None, ylim=None,
@@ -13,7 +66,9 @@ def plotting_base(plot_func, *args, despine=True, axes=True,
                   xtick_labels=None, ytick_labels=None,
                   xscale=None, yscale=None, borderwidth=1,
                   title=None, suptitle=None, plot_legend=True,
-                  legend_loc=None, filename=None, showplot=True, **kwargs):
+                  legend_loc=None, filename=None, showplot=True, pooled=False,
+                  buffer=None, cache=None, writer=None, layout_cache=None,
+                  rasterize=True, ax=None, rc=None, **kwargs):
     """
     Base function to handle formatting the figure and axis
 
@@ -73,97 +128,248 @@ def plotting_base(plot_func, *args, despine=True, axes=True,
         If True, use df labels, or list of legend labels
     legend_loc : dict
         dictionary of legend location kwargs (e.g., loc, bbox_to_anchor, etc.)
-    filename : str, default = None.
-        Name of file/path to save the figure to
+    filename : str | list, default = None.
+        Name of file/path to save the figure to, or list of files/paths to
+        save the same drawn figure to in several formats
     showplot : bool
-        Display plot
+        Display plot with pyplot, ignored for pooled figures. Figures that
+        are not shown are created without pyplot, so renders with
+        showplot=False can run concurrently in several threads
+    pooled : bool | plotting.pool.FigurePool
+        Render on a reusable Agg figure checked out of a FigurePool instead
+        of creating and closing a pyplot figure. If True use the package
+        wide plotting.pool.FIGURE_POOL, by default False
+    buffer : str, optional
+        Return the rendered figure from memory instead of displaying it:
+        'png', 'svg' or 'pdf' bytes, or 'rgba' for a (height, width, 4) view
+        of the Agg pixel buffer. Pooled 'rgba' renders are copied as the
+        buffer is reused by the next render. By default None
+    cache : bool | plotting.cache.RenderCache, optional
+        Look up filename in a render cache keyed by a hash of plot_func, its
+        args and every formatting kwarg, and copy the cached figure instead
+        of rendering on a hit. If True use the package wide cache in
+        ~/.cache/plotting, by default None
+    writer : bool | plotting.writer.AsyncWriter, optional
+        Hand the drawn figure to a background writer to encode and save to
+        filename and return a future immediately. If True use the package
+        wide writer, by default None
+    layout_cache : bool | plotting.layout.LayoutCache, optional
+        Reuse the subplot parameters and tight bounding box of an earlier
+        figure with the same size and the same title, label, tick label and
+        legend text instead of laying out and measuring the figure again.
+        If True use the package wide plotting.layout.LAYOUT_CACHE,
+        by default None
+    rasterize : bool | int, optional
+        Rasterize lines, scatter points, meshes and other collections with
+        more than this many points at the figure dpi when saving to a
+        vector format (pdf, svg), while axes, text and legends stay vector.
+        True for plotting.writer.RASTERIZE_THRESHOLD points, False to keep
+        every artist vector, by default True
+    ax : matplotlib.axes.Axes, optional
+        Draw and format on an existing axis, e.g. a panel of a
+        plotting.facets.facet_plot grid, instead of creating a figure. The
+        figure is left for the caller to lay out, save and show, so ax can
+        not be combined with filename or buffer. By default None
+    rc : dict, optional
+        rcParams to render with, applied with matplotlib.rc_context for
+        the duration of the call. Renders with rc are serialized so their
+        styling does not leak into renders in other threads,
+        by default None
     **kwargs
         kwargs for plot_func
+
+    Returns
+    -------
+    bytes | ndarray | concurrent.futures.Future | None
+        Rendered figure if buffer is not None, future resolving to filename
+        once it is written if writer is used
     """
-    fig = plt.figure(figsize=figsize, dpi=dpi)
-    axis = fig.add_subplot(111)
+    if ax is not None and (filename is not None or buffer is not None):
+        raise ValueError('ax can not be combined with filename or buffer, '
+                         'save the figure ax belongs to instead')
+
+    if writer and filename is None:
+        writer = None
+    elif writer and buffer is not None:
+        raise ValueError('writer can not be combined with buffer')
+
+    timer = PhaseTimer(plot_name(plot_func))
+    if cache and filename is not None and buffer is None:
+        with timer.phase('cache'):
+            inputs = {k: v for k, v in locals().items()
+                      if k not in OUTPUT_KWARGS + ('timer',)}
+            cache = get_render_cache(cache)
+            cache_key = cache.key(plot_func, args, inputs)
+            hit = cache.get(cache_key, filename)
+
+        if hit:
+            timer.finish()
+            if writer:
+                future = Future()
+                future.set_result(filename)
+                return future
+
+            return None
+    else:
+        cache = None
+
+    with timer.phase('figure'):
+        if ax is not None:
+            fig = ax.figure
+        elif pooled:
+            pool = FIGURE_POOL if pooled is True else pooled
+            fig = pool.acquire(figsize=figsize, dpi=dpi)
+        elif buffer is not None or writer or not showplot:
+            fig = agg_figure(figsize=figsize, dpi=dpi)
+        else:
+            fig = plt.figure(figsize=figsize, dpi=dpi)
+
+        axis = ax if ax is not None else fig.add_subplot(111)
 
     if plot_legend is False:
         kwargs['legend'] = False
 
-    plot_func(axis, *args, **kwargs)
+    with timer.phase('plot'):
+        plot_func(axis, *args, **kwargs)
 
     if despine:
-        sns.despine(offset=10, trim=False)
+        with timer.phase('despine'):
+            sns.despine(ax=axis, offset=10, trim=False)
 
-    if suptitle is not None:
-        fig.suptitle(suptitle, fontsize=fontsize + 2)
+    with timer.phase('format'):
+        if suptitle is not None:
+            fig.suptitle(suptitle, fontsize=fontsize + 2)
 
-    if title is not None:
-        axis.set_title(title, fontsize=fontsize + 2)
+        if title is not None:
+            axis.set_title(title, fontsize=fontsize + 2)
 
-    if xlabel is not None:
-        axis.set_xlabel(xlabel, fontsize=fontsize)
-    else:
-        axis.xaxis.label.set_size(fontsize)
+        if xlabel is not None:
+            axis.set_xlabel(xlabel, fontsize=fontsize)
+        else:
+            axis.xaxis.label.set_size(fontsize)
 
-    if ylabel is not None:
-        axis.set_ylabel(ylabel, fontsize=fontsize)
-    else:
-        axis.yaxis.label.set_size(fontsize)
+        if ylabel is not None:
+            axis.set_ylabel(ylabel, fontsize=fontsize)
+        else:
+            axis.yaxis.label.set_size(fontsize)
 
-    if xlim is not None:
-        axis.set_xlim(xlim)
+        if xlim is not None:
+            axis.set_xlim(xlim)
 
-    if ylim is not None:
-        axis.set_ylim(ylim)
+        if ylim is not None:
+            axis.set_ylim(ylim)
 
-    axis.tick_params(axis='both', labelsize=fontsize - 2,
-                     width=ticksize[1], length=ticksize[0])
+        axis.tick_params(axis='both', labelsize=fontsize - 2,
+                         width=ticksize[1], length=ticksize[0])
 
-    if xticks is not None:
-        axis.set_xticks(xticks)
-        if xtick_labels is not None:
-            axis.set_xticklabels(xtick_labels)
+        if xticks is not None:
+            axis.set_xticks(xticks)
+            if xtick_labels is not None:
+                axis.set_xticklabels(xtick_labels)
 
-    if xtick_rotation is not None:
-        for tick in axis.get_xticklabels():
-            tick.set_rotation(xtick_rotation)
+        if xtick_rotation is not None:
+            for tick in axis.get_xticklabels():
+                tick.set_rotation(xtick_rotation)
 
-    if yticks is not None:
-        axis.set_yticks(yticks)
-        if ytick_labels is not None:
-            axis.set_yticklabels(ytick_labels)
+        if yticks is not None:
+            axis.set_yticks(yticks)
+            if ytick_labels is not None:
+                axis.set_yticklabels(ytick_labels)
 
-    if ytick_rotation is not None:
-        for tick in axis.get_yticklabels():
-            tick.set_rotation(ytick_rotation)
+        if ytick_rotation is not None:
+            for tick in axis.get_yticklabels():
+                tick.set_rotation(ytick_rotation)
 
-    if xscale is not None:
-        axis.set_xscale(xscale)
+        if xscale is not None:
+            axis.set_xscale(xscale)
 
-    if yscale is not None:
-        axis.set_yscale(yscale)
+        if yscale is not None:
+            axis.set_yscale(yscale)
 
-    for ax in ['top', 'bottom', 'left', 'right']:
-        axis.spines[ax].set_linewidth(borderwidth)
+        for spine in ['top', 'bottom', 'left', 'right']:
+            axis.spines[spine].set_linewidth(borderwidth)
 
     if plot_legend:
-        if legend_loc is None:
-            legend_loc = {'bbox_to_anchor': (1.05, 1), 'loc': 2,
-                          "borderaxespad": 0.}
-        elif isinstance(legend_loc, (str, int)):
-            legend_loc = {'loc': legend_loc}
-
-        if isinstance(plot_legend, list):
-            plt.legend(plot_legend, prop={'size': fontsize - 2}, **legend_loc)
-        else:
-            plt.legend(prop={'size': fontsize - 2}, **legend_loc)
+        with timer.phase('legend'):
+            if legend_loc is None:
+                legend_loc = {'bbox_to_anchor': (1.05, 1), 'loc': 2,
+                              "borderaxespad": 0.}
+            elif isinstance(legend_loc, (str, int)):
+                legend_loc = {'loc': legend_loc}
+
+            if isinstance(plot_legend, list):
+                axis.legend(plot_legend, prop={'size': fontsize - 2},
+                            **legend_loc)
+            else:
+                axis.legend(prop={'size': fontsize - 2}, **legend_loc)
 
     if not axes:
-        plt.axis('off')
+        axis.axis('off')
+
+    if ax is not None:
+        timer.finish()
+        return None
+
+    if rasterize is True:
+        rasterize = RASTERIZE_THRESHOLD
+
+    if rasterize is not False and rasterize is not None \
+            and is_vector(filename, buffer):
+        with timer.phase('format'):
+            rasterize_artists(fig, threshold=rasterize)
+
+    with timer.phase('layout'):
+        if layout_cache:
+            bbox_inches = get_layout_cache(layout_cache).layout(fig)
+        else:
+            fig.tight_layout()
+            bbox_inches = 'tight'
+
+    if writer:
+        start = time.perf_counter()
+        written = None
+        if cache is not None:
+            def written():
+                cache.put(cache_key, filename)
+
+        future = get_writer(writer).submit(fig, filename, dpi=dpi,
+                                           bbox_inches=bbox_inches,
+                                           transparent=True, rc=rc,
+                                           written=written)
+
+        if pooled:
+            future.add_done_callback(lambda future: pool.release(fig))
+
+        if timer.enabled:
+            def finish_timer(future):
+                timer.add('save', time.perf_counter() - start)
+                timer.finish()
+
+            future.add_done_callback(finish_timer)
+
+        return future
+
+    with timer.phase('save'):
+        if filename is not None:
+            save_figure(fig, filename, dpi=dpi, bbox_inches=bbox_inches,
+                        transparent=True)
+            if cache is not None:
+                cache.put(cache_key, filename)
+
+        out = None
+        if buffer is not None:
+            out = figure_buffer(fig, buffer, dpi=dpi, transparent=True,
+                                bbox_inches=bbox_inches)
+            if pooled and buffer == 'rgba':
+                out = out.copy()
 
-    fig.tight_layout()
-    if filename is not None:
-        plt.savefig(filename, dpi=dpi, transparent=True,
-                    bbox_inches='tight')
+    with timer.phase('show'):
+        if pooled:
+            pool.release(fig)
+        elif buffer is None and showplot:
+            plt.show()
+            plt.close(fig)
 
-    if showplot:
-        plt.show()
+    timer.finish()
 
-    plt.close()
+    return out
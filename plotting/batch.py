@@ -0,0 +1,245 @@
+"""
+Batch rendering of plotting functions across a process pool
+"""
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
+import os
+import time
+import traceback
+import warnings
+
+BatchResult = namedtuple('BatchResult', ['index', 'result', 'error', 'pid',
+                                         'runtime'])
+# public plotting functions that can be queued as attributes of a PlotBatch
+BATCH_FUNCTIONS = ('animate', 'colorbar', 'contour_plot', 'heatmap_plot',
+                   'box_plot', 'point_plot', 'dist_plot', 'bar_plot',
+                   'df_scatter', 'df_line_plot', 'df_error_plot',
+                   'stackedbar_plot', 'df_bar_plot', 'df_pie_plot',
+                   'facet_plot', 'line_plot', 'error_plot', 'dual_plot',
+                   'sns_hist_plot', 'hist_plot', 'scatter_plot')
+
+
+def _init_worker():
+    """
+    Initialize a batch worker process to render off-screen with Agg
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    warnings.filterwarnings('ignore', message='.*non-interactive.*')
+
+
+def _run_job(index, plot_func, args, kwargs):
+    """
+    Run a single plotting job and capture its result or error
+
+    Parameters
+    ----------
+    index : int
+        Position of job in the batch
+    plot_func : function
+        Public plotting function to call, must be picklable
+    args : tuple
+        Args for plot_func
+    kwargs : dict
+        kwargs for plot_func
+
+    Returns
+    -------
+    BatchResult
+        Job index, return value (the resolved value if plot_func returns a
+        concurrent.futures.Future), formatted traceback (None on success),
+        worker pid and runtime in seconds
+    """
+    start = time.perf_counter()
+    result = None
+    error = None
+    try:
+        result = plot_func(*args, **kwargs)
+        # futures of background writes can not be pickled, wait for them
+        # so the write is done and errors are reported with the job
+        if isinstance(result, Future):
+            result = result.result()
+    except Exception:
+        error = traceback.format_exc()
+
+    return BatchResult(index, result, error, os.getpid(),
+                       time.perf_counter() - start)
+
+
+class PlotBatch:
+    """
+    Queue of plotting jobs rendered across a process pool
+
+    Any public plotting function can be queued with ``add``, or by calling
+    it as an attribute of the batch, e.g. ``batch.line_plot(*lines,
+    filename='line.png')`` for those in BATCH_FUNCTIONS. Jobs are rendered
+    with the Agg backend, results are returned in the order the jobs were
+    queued and errors are reported per job instead of aborting the batch.
+    """
+    def __init__(self, max_workers=None, chunksize=1):
+        """
+        Parameters
+        ----------
+        max_workers : int, optional
+            Number of worker processes, by default None (os.cpu_count())
+        chunksize : int, optional
+            Number of jobs sent to a worker at a time, by default 1
+        """
+        self._max_workers = max_workers
+        self._chunksize = chunksize
+        self._jobs = []
+        self._results = []
+        self._runtime = 0.
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __getattr__(self, name):
+        if name not in BATCH_FUNCTIONS:
+            msg = ("{} is not a plotting function that can be queued"
+                   .format(name))
+            raise AttributeError(msg)
+
+        import plotting
+        plot_func = getattr(plotting, name)
+
+        def queue(*args, **kwargs):
+            return self.add(plot_func, *args, **kwargs)
+
+        return queue
+
+    @property
+    def results(self):
+        """
+        Results of the last run
+
+        Returns
+        -------
+        list
+            List of BatchResult in job order
+        """
+        return self._results
+
+    @property
+    def errors(self):
+        """
+        Failed jobs from the last run
+
+        Returns
+        -------
+        dict
+            {job index: traceback} for every job that raised
+        """
+        return {r.index: r.error for r in self._results
+                if r.error is not None}
+
+    def add(self, plot_func, *args, **kwargs):
+        """
+        Queue a plotting job
+
+        Parameters
+        ----------
+        plot_func : function
+            Public plotting function, e.g. plotting.line_plot. Must be
+            importable at module level so it can be sent to the workers
+        * args
+            Args for plot_func
+        **kwargs
+            kwargs for plot_func, typically including filename
+
+        Returns
+        -------
+        int
+            Index of the job in the batch
+        """
+        self._jobs.append((plot_func, args, kwargs))
+
+        return len(self._jobs) - 1
+
+    def run(self):
+        """
+        Render all queued jobs
+
+        Returns
+        -------
+        list
+            List of BatchResult in job order
+        """
+        self._results = [None] * len(self._jobs)
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=self._max_workers,
+                                 initializer=_init_worker) as exe:
+            indices = range(len(self._jobs))
+            plot_funcs = [job[0] for job in self._jobs]
+            args = [job[1] for job in self._jobs]
+            kwargs = [job[2] for job in self._jobs]
+            for result in exe.map(_run_job, indices, plot_funcs, args,
+                                  kwargs, chunksize=self._chunksize):
+                self._results[result.index] = result
+
+        self._runtime = time.perf_counter() - start
+        self._jobs = []
+
+        return self._results
+
+    def throughput(self):
+        """
+        Figures rendered per second by each worker and for the whole batch
+
+        Returns
+        -------
+        dict
+            {pid: {'figures', 'seconds', 'figures/sec'}} for each worker plus
+            a 'total' entry using the batch wall time
+        """
+        stats = {}
+        for result in self._results:
+            stat = stats.setdefault(result.pid, {'figures': 0,
+                                                 'seconds': 0.})
+            stat['figures'] += 1
+            stat['seconds'] += result.runtime
+
+        stats['total'] = {'figures': len(self._results),
+                          'seconds': self._runtime}
+        for stat in stats.values():
+            if stat['seconds'] > 0:
+                stat['figures/sec'] = stat['figures'] / stat['seconds']
+            else:
+                stat['figures/sec'] = 0.
+
+        return stats
+
+
+def batch_plot(jobs, max_workers=None, chunksize=1):
+    """
+    Render many plotting jobs across a process pool
+
+    Parameters
+    ----------
+    jobs : list
+        List of (plot_func, args, kwargs) tuples, e.g.
+        (plotting.line_plot, (line, ), {'filename': 'line.png'})
+    max_workers : int, optional
+        Number of worker processes, by default None (os.cpu_count())
+    chunksize : int, optional
+        Number of jobs sent to a worker at a time, by default 1
+
+    Returns
+    -------
+    results : list
+        List of BatchResult in job order, failed jobs have their traceback
+        in BatchResult.error
+    throughput : dict
+        Figures per second for each worker and for the whole batch
+
+    See Also
+    --------
+    plotting.batch.PlotBatch : batch queue
+    """
+    batch = PlotBatch(max_workers=max_workers, chunksize=chunksize)
+    for plot_func, args, kwargs in jobs:
+        batch.add(plot_func, *args, **kwargs)
+
+    results = batch.run()
+
+    return results, batch.throughput()
@@ -0,0 +1,596 @@
+"""
+Vectorized binning kernels to draw large data sets at a fixed resolution
+"""
+import numpy as np
+from plotting.sources import (CHUNKSIZE, is_chunked, is_reiterable,
+                              iter_chunks)
+
+BIN_AGGREGATIONS = ('count', 'sum', 'mean', 'min', 'max')
+# marker kwargs of scatter plots that have no meaning for a density image
+SCATTER_KWARGS = ('s', 'marker', 'color', 'edgecolor', 'edgecolors',
+                  'facecolor', 'facecolors', 'linewidth', 'linewidths',
+                  'plotnonfinite')
+
+
+def _bin_index(values, vmin, vmax, n_bins):
+    """
+    Bin index of each value in n_bins equal width bins between vmin and vmax
+
+    Parameters
+    ----------
+    values : ndarray
+        Values to bin
+    vmin : float
+        Lower edge of first bin
+    vmax : float
+        Upper edge of last bin
+    n_bins : int
+        Number of bins
+
+    Returns
+    -------
+    idx : ndarray
+        Bin index of each value, clipped to [0, n_bins - 1]
+    inside : ndarray
+        Boolean mask of values that are finite and within [vmin, vmax]
+    """
+    values = np.asarray(values, dtype=np.float64)
+    inside = (values >= vmin) & (values <= vmax)
+    idx = (values - vmin) * (n_bins / (vmax - vmin))
+    idx = np.clip(np.nan_to_num(idx), 0, n_bins - 1).astype(np.intp)
+
+    return idx, inside
+
+
+def _extent(values):
+    """
+    Finite min and max of values, padded if they are equal
+
+    Parameters
+    ----------
+    values : ndarray
+        Values to get range of
+
+    Returns
+    -------
+    tuple
+        (min, max)
+    """
+    vmin, vmax = np.nanmin(values), np.nanmax(values)
+    if vmin == vmax:
+        vmin -= 0.5
+        vmax += 0.5
+
+    return float(vmin), float(vmax)
+
+
+def _check_agg(agg, values):
+    """
+    Validate a bin aggregation
+
+    Parameters
+    ----------
+    agg : str
+        Aggregation to apply in each bin
+    values : ndarray | None
+        Values to aggregate
+    """
+    if agg not in BIN_AGGREGATIONS:
+        msg = ('agg must be one of {}, not {}'
+               .format(BIN_AGGREGATIONS, agg))
+        raise ValueError(msg)
+
+    if agg != 'count' and values is None:
+        raise ValueError('values are required to compute the bin {}'
+                         .format(agg))
+
+
+def _flat_bins(x, y, values, bins, extent):
+    """
+    Flat grid index of each point inside extent
+
+    Parameters
+    ----------
+    x : ndarray
+        vector of x values
+    y : ndarray
+        vector of y values
+    values : ndarray | None
+        vector of values to aggregate, points with non-finite values are
+        dropped
+    bins : tuple
+        Number of (x, y) bins
+    extent : tuple
+        (xmin, xmax, ymin, ymax) of the grid
+
+    Returns
+    -------
+    flat : ndarray
+        Flat (row major) grid index of each point inside extent
+    values : ndarray | None
+        Values of the points inside extent
+    """
+    nx, ny = bins
+    ix, inside = _bin_index(x, extent[0], extent[1], nx)
+    iy, y_inside = _bin_index(y, extent[2], extent[3], ny)
+    inside &= y_inside
+    flat = iy * nx + ix
+    if values is not None:
+        values = np.asarray(values, dtype=np.float64)
+        inside &= np.isfinite(values)
+        values = values[inside]
+
+    return flat[inside], values
+
+
+def _accumulate(grids, flat, values, size, agg):
+    """
+    Add binned points to the running count and aggregate grids
+
+    Parameters
+    ----------
+    grids : dict
+        'count' and agg grids, updated in place
+    flat : ndarray
+        Flat grid index of each point
+    values : ndarray | None
+        Value of each point
+    size : int
+        Number of bins
+    agg : str
+        Aggregation to apply in each bin
+    """
+    grids['count'] += np.bincount(flat, minlength=size)
+    if agg in ('sum', 'mean'):
+        grids['sum'] += np.bincount(flat, weights=values, minlength=size)
+    elif agg in ('min', 'max'):
+        ufunc = np.minimum if agg == 'min' else np.maximum
+        ufunc.at(grids[agg], flat, values)
+
+
+def _init_grids(size, agg):
+    """
+    Empty running grids for _accumulate
+
+    Parameters
+    ----------
+    size : int
+        Number of bins
+    agg : str
+        Aggregation to apply in each bin
+
+    Returns
+    -------
+    dict
+    """
+    grids = {'count': np.zeros(size, dtype=np.int64)}
+    if agg in ('sum', 'mean'):
+        grids['sum'] = np.zeros(size)
+    elif agg in ('min', 'max'):
+        grids[agg] = np.full(size, np.inf if agg == 'min' else -np.inf)
+
+    return grids
+
+
+def _finalize_grids(grids, agg, bins):
+    """
+    Aggregated (ny, nx) grid from the running grids, NaN for empty bins
+
+    Parameters
+    ----------
+    grids : dict
+        Running grids
+    agg : str
+        Aggregation to apply in each bin
+    bins : tuple
+        Number of (x, y) bins
+
+    Returns
+    -------
+    ndarray
+    """
+    count = grids['count']
+    if agg == 'count':
+        grid = count.astype(np.float64)
+    elif agg == 'sum':
+        grid = grids['sum']
+    elif agg == 'mean':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            grid = grids['sum'] / count
+    else:
+        grid = grids[agg]
+
+    grid[count == 0] = np.nan
+
+    return grid.reshape(bins[1], bins[0])
+
+
+def bin_2d(x, y, values=None, bins=(600, 400), extent=None, agg='count'):
+    """
+    Aggregate points onto a regular 2D grid in O(n)
+
+    Parameters
+    ----------
+    x : ndarray
+        vector of x values
+    y : ndarray
+        vector of y values
+    values : ndarray, optional
+        vector of values to aggregate, required unless agg is 'count',
+        by default None
+    bins : tuple, optional
+        Number of (x, y) bins, typically the axis size in pixels,
+        by default (600, 400)
+    extent : tuple, optional
+        (xmin, xmax, ymin, ymax) of the grid, by default None
+        (range of the data)
+    agg : str, optional
+        Aggregation to apply in each bin: 'count', 'sum', 'mean', 'min' or
+        'max', by default 'count'
+
+    Returns
+    -------
+    grid : ndarray
+        (ny, nx) array of aggregated values, NaN for empty bins
+    extent : tuple
+        (xmin, xmax, ymin, ymax) of the grid
+    """
+    _check_agg(agg, values)
+    if extent is None:
+        extent = _extent(x) + _extent(y)
+
+    size = bins[0] * bins[1]
+    grids = _init_grids(size, agg)
+    flat, values = _flat_bins(x, y, values, bins, extent)
+    _accumulate(grids, flat, values, size, agg)
+
+    return _finalize_grids(grids, agg, bins), tuple(extent)
+
+
+def stream_bin_2d(x, y, values=None, bins=(600, 400), extent=None,
+                  agg='count', chunksize=CHUNKSIZE):
+    """
+    Aggregate points onto a regular 2D grid one chunk at a time, memory use
+    is bounded by the chunk size and the grid size
+
+    Parameters
+    ----------
+    x : str | ndarray | h5py.Dataset | iterable
+        Source of x values: .npy/.npz path, array like or iterable of chunks
+    y : str | ndarray | h5py.Dataset | iterable
+        Source of y values chunked in step with x
+    values : str | ndarray | h5py.Dataset | iterable, optional
+        Source of values to aggregate chunked in step with x, required unless
+        agg is 'count', by default None
+    bins : tuple, optional
+        Number of (x, y) bins, by default (600, 400)
+    extent : tuple, optional
+        (xmin, xmax, ymin, ymax) of the grid, if None it is found with a
+        first pass over x and y, which must then be re-iterable,
+        by default None
+    agg : str, optional
+        Aggregation to apply in each bin: 'count', 'sum', 'mean', 'min' or
+        'max', by default 'count'
+    chunksize : int, optional
+        Number of values per chunk for array like sources,
+        by default 2**20
+
+    Returns
+    -------
+    grid : ndarray
+        (ny, nx) array of aggregated values, NaN for empty bins
+    extent : tuple
+        (xmin, xmax, ymin, ymax) of the grid
+    """
+    _check_agg(agg, values)
+    if extent is None:
+        if not (is_reiterable(x) and is_reiterable(y)):
+            msg = ('extent must be given to bin one-shot iterators, the '
+                   'range of x and y can not be found in a first pass')
+            raise ValueError(msg)
+
+        extent = (chunked_range(x, chunksize=chunksize)
+                  + chunked_range(y, chunksize=chunksize))
+
+    size = bins[0] * bins[1]
+    grids = _init_grids(size, agg)
+    sources = [iter_chunks(x, chunksize=chunksize),
+               iter_chunks(y, chunksize=chunksize)]
+    if values is not None:
+        sources.append(iter_chunks(values, chunksize=chunksize))
+
+    for chunks in zip(*sources):
+        chunk_values = chunks[2] if values is not None else None
+        flat, chunk_values = _flat_bins(chunks[0], chunks[1], chunk_values,
+                                        bins, extent)
+        _accumulate(grids, flat, chunk_values, size, agg)
+
+    return _finalize_grids(grids, agg, bins), tuple(extent)
+
+
+def density_plot(axis, x, y, values=None, agg=None, extent=None,
+                 colorbar=False, cmap=None, chunksize=CHUNKSIZE, **kwargs):
+    """
+    Draw points as a single rasterized density image sized to the axis.
+    Chunked sources (np.memmap, .npy/.npz paths, h5py datasets or iterators
+    of chunks) are binned one chunk at a time.
+
+    Parameters
+    ----------
+    axis : matplotlib.axes.Axes
+        Axis to draw on
+    x : ndarray | str | h5py.Dataset | iterable
+        vector or source of x values
+    y : ndarray | str | h5py.Dataset | iterable
+        vector or source of y values
+    values : ndarray | str | h5py.Dataset | iterable, optional
+        vector or source of values to aggregate, by default None
+    agg : str, optional
+        Aggregation to apply in each pixel, by default None ('count' if
+        values is None else 'mean')
+    extent : tuple, optional
+        (xmin, xmax, ymin, ymax) of the grid, by default None
+    colorbar : bool, optional
+        Flag to add colorbar, by default False
+    cmap : str, optional
+        Colormap, by default None
+    chunksize : int, optional
+        Number of values per chunk for chunked sources, by default 2**20
+    kwargs : dict
+        kwargs for matplotlib.axes.Axes.imshow, marker kwargs of scatter
+        plots (SCATTER_KWARGS, e.g. s and marker) are ignored
+
+    Returns
+    -------
+    matplotlib.image.AxesImage
+        Density image
+    """
+    for kwarg in SCATTER_KWARGS:
+        kwargs.pop(kwarg, None)
+
+    if agg is None:
+        agg = 'count' if values is None else 'mean'
+
+    bbox = axis.get_window_extent()
+    bins = (max(int(bbox.width), 1), max(int(bbox.height), 1))
+    if is_chunked(x):
+        grid, extent = stream_bin_2d(x, y, values=values, bins=bins,
+                                     extent=extent, agg=agg,
+                                     chunksize=chunksize)
+    else:
+        grid, extent = bin_2d(x, y, values=values, bins=bins, extent=extent,
+                              agg=agg)
+
+    kwargs.setdefault('interpolation', 'nearest')
+    image = axis.imshow(grid, origin='lower', extent=extent, aspect='auto',
+                        cmap=cmap, **kwargs)
+    if colorbar:
+        axis.figure.colorbar(image, ax=axis)
+
+    return image
+
+
+class StreamingHistogram:
+    """
+    Histogram accumulated one chunk at a time with fixed bin edges, so
+    memory use is bounded by the chunk size regardless of the input size.
+    Counts can be reused across several plots or merged with other
+    histograms sharing the same edges.
+    """
+    def __init__(self, bins=10, range=None):
+        """
+        Parameters
+        ----------
+        bins : int | ndarray, optional
+            Number of equal width bins or array of bin edges, by default 10
+        range : tuple, optional
+            (min, max) of the bins, required if bins is an int,
+            by default None
+        """
+        if np.ndim(bins) == 0:
+            if range is None:
+                msg = ('range is required to fix the edges of {} bins'
+                       .format(bins))
+                raise ValueError(msg)
+
+            self._n_bins = int(bins)
+            self._range = (float(range[0]), float(range[1]))
+            self._edges = np.linspace(*self._range, self._n_bins + 1)
+        else:
+            self._edges = np.asarray(bins, dtype=np.float64)
+            self._n_bins = None
+            self._range = None
+
+        self._counts = np.zeros(len(self._edges) - 1, dtype=np.int64)
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    @property
+    def edges(self):
+        """
+        Bin edges
+
+        Returns
+        -------
+        ndarray
+        """
+        return self._edges
+
+    @property
+    def counts(self):
+        """
+        Number of values in each bin
+
+        Returns
+        -------
+        ndarray
+        """
+        return self._counts
+
+    @property
+    def total(self):
+        """
+        Number of values binned
+
+        Returns
+        -------
+        int
+        """
+        return int(self._counts.sum())
+
+    @classmethod
+    def from_source(cls, source, bins=10, range=None, chunksize=CHUNKSIZE):
+        """
+        Accumulate a histogram from an array, np.memmap, .npy/.npz path,
+        h5py.Dataset or iterator of chunks
+
+        Parameters
+        ----------
+        source : ndarray | str | h5py.Dataset | iterable
+            Values to bin
+        bins : int | ndarray, optional
+            Number of equal width bins or array of bin edges, by default 10
+        range : tuple, optional
+            (min, max) of the bins, if None and bins is an int it is found
+            with a first pass over source, which must then be re-iterable,
+            by default None
+        chunksize : int, optional
+            Number of values per chunk for array like sources,
+            by default 2**20
+
+        Returns
+        -------
+        StreamingHistogram
+        """
+        if np.ndim(bins) == 0 and range is None:
+            if not is_reiterable(source):
+                msg = ('range must be given to bin a one-shot iterator, '
+                       'its min and max can not be found in a first pass')
+                raise ValueError(msg)
+
+            range = chunked_range(source, chunksize=chunksize)
+
+        hist = cls(bins=bins, range=range)
+        for chunk in iter_chunks(source, chunksize=chunksize):
+            hist.update(chunk)
+
+        return hist
+
+    def copy(self):
+        """
+        Copy of the histogram
+
+        Returns
+        -------
+        StreamingHistogram
+        """
+        hist = self.__class__(bins=self._edges)
+        hist._n_bins = self._n_bins
+        hist._range = self._range
+        hist._counts = self._counts.copy()
+
+        return hist
+
+    def update(self, values):
+        """
+        Add values to the histogram, values outside the edges are ignored
+
+        Parameters
+        ----------
+        values : ndarray
+            Chunk of values to bin
+
+        Returns
+        -------
+        StreamingHistogram
+            self
+        """
+        values = np.asarray(values).ravel()
+        if self._n_bins is not None:
+            counts, _ = np.histogram(values, bins=self._n_bins,
+                                     range=self._range)
+        else:
+            counts, _ = np.histogram(values, bins=self._edges)
+
+        self._counts += counts
+
+        return self
+
+    def merge(self, other):
+        """
+        Add the counts of another histogram with the same edges
+
+        Parameters
+        ----------
+        other : StreamingHistogram
+            Histogram to merge
+
+        Returns
+        -------
+        StreamingHistogram
+            self
+        """
+        if not np.array_equal(self._edges, other.edges):
+            raise ValueError('Can only merge histograms with the same edges')
+
+        self._counts += other.counts
+
+        return self
+
+    def plot(self, axis, density=False, histtype='bar', **kwargs):
+        """
+        Draw the histogram
+
+        Parameters
+        ----------
+        axis : matplotlib.axes.Axes
+            Axis to draw on
+        density : bool, optional
+            Normalize counts to a probability density, by default False
+        histtype : str, optional
+            'bar' or 'stepfilled' for filled bins, 'step' for the outline,
+            by default 'bar'
+        kwargs : dict
+            kwargs for matplotlib.axes.Axes.stairs
+
+        Returns
+        -------
+        matplotlib.patches.StepPatch
+        """
+        values = self._counts
+        if density:
+            values = values / (self.total * np.diff(self._edges))
+
+        kwargs.setdefault('fill', histtype != 'step')
+
+        return axis.stairs(values, self._edges, **kwargs)
+
+
+def chunked_range(source, chunksize=CHUNKSIZE):
+    """
+    Finite min and max of a source found one chunk at a time
+
+    Parameters
+    ----------
+    source : ndarray | str | h5py.Dataset | iterable
+        Re-iterable source of values
+    chunksize : int, optional
+        Number of values per chunk for array like sources, by default 2**20
+
+    Returns
+    -------
+    tuple
+        (min, max)
+    """
+    vmin, vmax = np.inf, -np.inf
+    for chunk in iter_chunks(source, chunksize=chunksize):
+        if chunk.size:
+            vmin = min(vmin, np.nanmin(chunk))
+            vmax = max(vmax, np.nanmax(chunk))
+
+    if vmin == vmax:
+        vmin -= 0.5
+        vmax += 0.5
+
+    return float(vmin), float(vmax)
@@ -0,0 +1,405 @@
+"""
+Content addressed on-disk cache of rendered figures
+"""
+import functools
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import types
+import matplotlib as mpl
+import numpy as np
+import pandas as pd
+
+from plotting.version import __version__
+from plotting.writer import output_files
+
+
+# rcParams that do not change the rendered figure, 'backend' is resolved on
+# first access which would select a backend just to hash it
+_RC_EXCLUDE = ('backend', 'interactive', 'keymap.', 'savefig.directory',
+               'toolbar', 'webagg.')
+
+
+def _render_rc():
+    """
+    rcParams in effect for the render, the package style and the rc of the
+    plotting call included
+
+    Returns
+    -------
+    dict
+    """
+    return {k: mpl.rcParams[k] for k in mpl.rcParams
+            if not k.startswith(_RC_EXCLUDE)}
+
+
+@functools.lru_cache(maxsize=None)
+def _package_hash():
+    """
+    Hash of the source of the plotting package, so editing a helper called
+    by a plotting function invalidates its cached figures
+
+    Returns
+    -------
+    str
+        Hex digest of every module of the package
+    """
+    h = hashlib.blake2b(digest_size=20)
+    package = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(package)):
+        if name.endswith('.py'):
+            h.update(name.encode())
+            with open(os.path.join(package, name), 'rb') as f:
+                h.update(f.read())
+
+    return h.hexdigest()
+
+
+def _update_hash(h, obj, _seen=None):
+    """
+    Recursively feed obj into hash h, hashing array and DataFrame buffers
+    directly rather than their repr. Functions are hashed by their code,
+    constants, names, defaults and closure contents, and paths to .npy and
+    .npz files and read only memory maps by their size and modification
+    time
+
+    Parameters
+    ----------
+    h : hashlib._Hash
+        Hash to update
+    obj : obj
+        Object to hash
+    """
+    if _seen is None:
+        _seen = set()
+
+    h.update(type(obj).__name__.encode())
+    if isinstance(obj, np.memmap) and obj.filename is not None \
+            and obj.mode == 'r':
+        # read only maps are hashed by their file instead of being read,
+        # views of the same map by their position in it
+        root = obj
+        while isinstance(root.base, np.ndarray):
+            root = root.base
+
+        start = (obj.__array_interface__['data'][0]
+                 - root.__array_interface__['data'][0])
+        stat = os.stat(obj.filename)
+        h.update('{}{}{}{}{}{}{}{}'.format(
+            obj.filename, stat.st_size, stat.st_mtime_ns, obj.offset, start,
+            obj.dtype.str, obj.shape, obj.strides).encode())
+    elif isinstance(obj, np.ndarray) and obj.dtype != object:
+        h.update('{}{}'.format(obj.dtype.str, obj.shape).encode())
+        h.update(np.ascontiguousarray(obj).data)
+    elif isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        if not isinstance(obj, pd.Index):
+            _update_hash(h, obj.index.names, _seen)
+        if isinstance(obj, pd.DataFrame):
+            _update_hash(h, list(obj.columns), _seen)
+            _update_hash(h, [str(dtype) for dtype in obj.dtypes], _seen)
+        else:
+            _update_hash(h, [obj.name, str(obj.dtype)], _seen)
+
+        _update_hash(h, pd.util.hash_pandas_object(obj).values, _seen)
+    elif isinstance(obj, dict):
+        for k in sorted(obj, key=repr):
+            _update_hash(h, k, _seen)
+            _update_hash(h, obj[k], _seen)
+    elif isinstance(obj, (list, tuple)):
+        h.update(str(len(obj)).encode())
+        for item in obj:
+            _update_hash(h, item, _seen)
+    elif isinstance(obj, functools.partial):
+        _update_hash(h, [obj.func, obj.args, obj.keywords], _seen)
+    elif isinstance(obj, types.CodeType):
+        _update_hash(h, [obj.co_code, obj.co_consts, obj.co_names], _seen)
+    elif callable(obj) and hasattr(obj, '__code__'):
+        h.update('{}.{}'.format(obj.__module__, obj.__qualname__).encode())
+        # recursive functions reference themselves through their closure
+        if id(obj) in _seen:
+            return
+
+        _seen.add(id(obj))
+        closure = [cell.cell_contents for cell in obj.__closure__ or ()
+                   if cell.cell_contents is not obj]
+        _update_hash(h, [obj.__code__, obj.__defaults__,
+                         obj.__kwdefaults__, closure], _seen)
+    elif isinstance(obj, (str, os.PathLike)) \
+            and os.fspath(obj).endswith(('.npy', '.npz')) \
+            and os.path.isfile(obj):
+        stat = os.stat(obj)
+        h.update('{}{}{}'.format(os.fspath(obj), stat.st_size,
+                                 stat.st_mtime_ns).encode())
+    elif isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        h.update(obj if isinstance(obj, bytes) else repr(obj).encode())
+    else:
+        try:
+            h.update(pickle.dumps(obj, protocol=4))
+        except Exception:
+            h.update(repr(obj).encode())
+
+
+class RenderCache:
+    """
+    On-disk cache of rendered figures keyed by a hash of the plotting
+    function, its data and every formatting kwarg. Entries are evicted least
+    recently used first once the cache exceeds max_size bytes, and once they
+    have not been used for max_age seconds.
+    """
+    def __init__(self, cache_dir=None, max_size=2 ** 30, max_age=None,
+                 link=False):
+        """
+        Parameters
+        ----------
+        cache_dir : str, optional
+            Directory to store rendered figures in,
+            by default None (~/.cache/plotting)
+        max_size : int, optional
+            Maximum total size of the cache in bytes, by default 2**30
+        max_age : float, optional
+            Maximum time in seconds since an entry was last used,
+            by default None (no limit)
+        link : bool, optional
+            Hard link cached figures to the output filename instead of
+            copying them, falls back to a copy when linking is not possible.
+            Linked outputs are unlinked before a miss renders over them,
+            by default False
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.expanduser('~'), '.cache',
+                                     'plotting')
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+        self._max_age = max_age
+        self._link = link
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """
+        Cache hit and miss counters
+
+        Returns
+        -------
+        dict
+            hits, misses, hit rate, number of entries and size in bytes
+        """
+        entries = self._entries()
+        lookups = self.hits + self.misses
+
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.,
+                'entries': len(entries),
+                'size': sum(e[2] for e in entries)}
+
+    def _path(self, key, filename):
+        """
+        Path of the cache entry for key with the extension of filename
+
+        Parameters
+        ----------
+        key : str
+            Cache key
+        filename : str
+            Output filename
+
+        Returns
+        -------
+        str
+        """
+        ext = os.path.splitext(filename)[1]
+
+        return os.path.join(self._cache_dir, key + ext)
+
+    def _entries(self):
+        """
+        Cache entries
+
+        Returns
+        -------
+        list
+            (path, last used, size) of each entry
+        """
+        entries = []
+        with os.scandir(self._cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.startswith('.'):
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_mtime, stat.st_size))
+
+        return entries
+
+    @staticmethod
+    def key(plot_func, args, kwargs):
+        """
+        Hash a plotting call, the rcParams it is rendered with and the
+        source of the plotting package. Helpers outside of the package that
+        plot_func calls through its globals are not hashed
+
+        Parameters
+        ----------
+        plot_func : function
+            Plotting function
+        args : tuple
+            Args for plot_func
+        kwargs : dict
+            kwargs for plot_func and plotting_base
+
+        Returns
+        -------
+        str
+            Hex digest identifying the rendered figure
+        """
+        h = hashlib.blake2b(digest_size=20)
+        _update_hash(h, [__version__, _package_hash(), mpl.__version__,
+                         _render_rc()])
+        _update_hash(h, plot_func)
+        _update_hash(h, args)
+        _update_hash(h, kwargs)
+
+        return h.hexdigest()
+
+    def get(self, key, filename):
+        """
+        Copy or link the cached figure for key to filename
+
+        Parameters
+        ----------
+        key : str
+            Cache key
+        filename : str | list
+            Output filename or list of filenames, all of which must be cached
+            for a hit
+
+        Returns
+        -------
+        bool
+            True if the figure was cached
+        """
+        filenames = output_files(filename)
+        paths = [self._path(key, f) for f in filenames]
+        for path in paths:
+            if (not os.path.exists(path)
+                    or self._expired(os.path.getmtime(path))):
+                self.misses += 1
+                # outputs linked to an earlier entry would be rendered into
+                # that entry, unlink them so the miss writes a new file
+                for f in filenames:
+                    if os.path.isfile(f) and os.stat(f).st_nlink > 1:
+                        os.remove(f)
+
+                return False
+
+        for path, f in zip(paths, filenames):
+            if os.path.exists(f):
+                os.remove(f)
+
+            if self._link:
+                try:
+                    os.link(path, f)
+                except OSError:
+                    shutil.copyfile(path, f)
+            else:
+                shutil.copyfile(path, f)
+
+            os.utime(path)
+
+        self.hits += 1
+
+        return True
+
+    def put(self, key, filename):
+        """
+        Add a rendered figure to the cache
+
+        Parameters
+        ----------
+        key : str
+            Cache key
+        filename : str | list
+            Rendered figure or list of rendered figures
+        """
+        for f in output_files(filename):
+            path = self._path(key, f)
+            fd, tmp = tempfile.mkstemp(dir=self._cache_dir, prefix='.')
+            os.close(fd)
+            shutil.copyfile(f, tmp)
+            os.replace(tmp, path)
+
+        self.evict()
+
+    def _expired(self, last_used):
+        """
+        Check if an entry last used at last_used is older than max_age
+
+        Parameters
+        ----------
+        last_used : float
+            Time the entry was last used
+
+        Returns
+        -------
+        bool
+        """
+        return (self._max_age is not None
+                and time.time() - last_used > self._max_age)
+
+    def evict(self):
+        """
+        Remove expired entries, then least recently used entries until the
+        cache is smaller than max_size
+        """
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        size = sum(e[2] for e in entries)
+        for path, last_used, entry_size in entries:
+            if not self._expired(last_used) and size <= self._max_size:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+            size -= entry_size
+
+    def clear(self):
+        """
+        Remove all entries and reset the counters
+        """
+        for path, _, _ in self._entries():
+            os.remove(path)
+
+        self.hits = 0
+        self.misses = 0
+
+
+_RENDER_CACHE = None
+
+
+def get_render_cache(cache=True):
+    """
+    Resolve the render cache to use
+
+    Parameters
+    ----------
+    cache : bool | RenderCache
+        True for the package wide default cache or a RenderCache
+
+    Returns
+    -------
+    RenderCache
+    """
+    global _RENDER_CACHE
+    if isinstance(cache, RenderCache):
+        return cache
+
+    if _RENDER_CACHE is None:
+        _RENDER_CACHE = RenderCache()
+
+    return _RENDER_CACHE
@@ -7,7 +7,11 @@ from mpl_toolkits.axes_grid1 import make_axes_locatable
 import numpy as np
 import numpy.ma as ma
 import seaborn as sns
-from plotting.base import plotting_base
+from plotting.base import figure_buffer, plotting_base
+from plotting.pool import agg_figure
+from plotting.rc import with_rc
+from plotting.timing import PhaseTimer
+from plotting.writer import save_figure
 
 
 def heatmap_plot(data, **kwargs):
@@ -32,7 +36,7 @@ def heatmap_plot(data, **kwargs):
     def plot_func(axis, data, **kwargs):
         sns.heatmap(data, ax=axis, **kwargs)
 
-    plotting_base(plot_func, data, **kwargs)
+    return plotting_base(plot_func, data, **kwargs)
 
 
 def add_colorbar(axis, cf, ticks, size, padding,
@@ -73,9 +77,9 @@ def add_colorbar(axis, cf, ticks, size, padding,
     else:
         orientation = 'vertical'
 
-    cbar = plt.colorbar(cf, ticks=ticks, cax=caxis,
-                        orientation=orientation,
-                        ticklocation=location)
+    cbar = axis.figure.colorbar(cf, ticks=ticks, cax=caxis,
+                                orientation=orientation,
+                                ticklocation=location)
 
     cbar.ax.tick_params(labelsize=fontsize - 2)
 
@@ -175,12 +179,12 @@ def contour_plot(data, **kwargs):
         if colorbar_location in ['top', 'bottom']:
             orientation = 'horizontal'
 
-        cf = plt.contourf(x, y, z_m, alpha=opacity, levels=cf_levels,
-                          extend='both', antialiased=True)
+        cf = axis.contourf(x, y, z_m, alpha=opacity, levels=cf_levels,
+                           extend='both', antialiased=True)
 
         if contour_color is not None:
-            cl = plt.contour(cf, levels=cl_levels, colors=(contour_color,),
-                             linewidths=(contour_width,))
+            cl = axis.contour(cf, levels=cl_levels, colors=(contour_color,),
+                              linewidths=(contour_width,))
 
         if colormap is not None:
             cf.set_cmap(colormap)
@@ -199,9 +203,9 @@ def contour_plot(data, **kwargs):
             caxis = divider.append_axes(colorbar_location, size=cbar_size,
                                         pad=cbar_padding)
 
-            cbar = plt.colorbar(cf, ticks=l_levels, cax=caxis,
-                                orientation=orientation,
-                                ticklocation=colorbar_location)
+            cbar = axis.figure.colorbar(cf, ticks=l_levels, cax=caxis,
+                                        orientation=orientation,
+                                        ticklocation=colorbar_location)
 
             cbar.ax.tick_params(labelsize=fontsize - 2)
 
@@ -212,13 +216,14 @@ def contour_plot(data, **kwargs):
                 if contour_color is not None:
                     cbar.add_lines(cl)
 
-    plotting_base(plot_func, data, **kwargs)
+    return plotting_base(plot_func, data, **kwargs)
 
 
+@with_rc
 def colorbar(zlim, ticks=None, lines=None, line_color='k', linewidth=1,
              colormap='jet', extend='neither', ticklocation='right',
              fontsize_other=18, label=None, fontsize_label=21, figsize=6,
-             dpi=100, showfig=True, filename=None):
+             dpi=100, showfig=True, filename=None, buffer=None, rc=None):
 
     """
     Create colorbar
@@ -252,9 +257,26 @@ def colorbar(zlim, ticks=None, lines=None, line_color='k', linewidth=1,
     dpi : int
         DPI resolution of figure.
     showfig : bool
-        Whether to show figure.
-    filename : str
-        Name of file/path to save the figure to.
+        Whether to show figure, figures that are not shown are created
+        without pyplot
+    filename : str | list
+        Name of file/path to save the figure to, or list of files/paths to
+        save the same drawn figure to in several formats.
+    buffer : str, optional
+        Return the rendered figure from memory instead of displaying it,
+        'png', 'svg', 'pdf' or 'rgba', by default None
+    rc : dict, optional
+        rcParams to render with, applied with matplotlib.rc_context for
+        the duration of the call, by default None
+
+    Returns
+    -------
+    bytes | ndarray | None
+        Rendered figure if buffer is not None
+
+    See Also
+    --------
+    plotting.base.figure_buffer : in memory rendering
     """
 
     a_ratio = 20
@@ -273,30 +295,49 @@ def colorbar(zlim, ticks=None, lines=None, line_color='k', linewidth=1,
         ticks = (zlim[1] - zlim[0]) / ticks
         ticks = np.arange(zlim[0], zlim[1] + ticks, ticks)
 
-    fig = plt.figure(figsize=figsize, dpi=dpi)
-    axis = fig.add_axes([0.0, 0.0, 1.0, 1.0])
+    timer = PhaseTimer('colorbar')
+    with timer.phase('figure'):
+        if buffer is not None or not showfig:
+            fig = agg_figure(figsize=figsize, dpi=dpi)
+        else:
+            fig = plt.figure(figsize=figsize, dpi=dpi)
+
+        axis = fig.add_axes([0.0, 0.0, 1.0, 1.0])
 
-    norm = mpl.colors.Normalize(vmin=zlim[0], vmax=zlim[1])
+    with timer.phase('plot'):
+        norm = mpl.colors.Normalize(vmin=zlim[0], vmax=zlim[1])
 
-    cb = mpl.colorbar.ColorbarBase(axis, cmap=colormap, norm=norm,
-                                   orientation=orientation, extend=extend,
-                                   ticks=ticks, ticklocation=ticklocation)
-    cb.ax.tick_params(labelsize=fontsize_other)
+        cb = mpl.colorbar.ColorbarBase(axis, cmap=colormap, norm=norm,
+                                       orientation=orientation,
+                                       extend=extend, ticks=ticks,
+                                       ticklocation=ticklocation)
 
-    if label is not None:
-        cb.set_label(label, size=fontsize_label)
+    with timer.phase('format'):
+        cb.ax.tick_params(labelsize=fontsize_other)
 
-    if lines is not None:
-        lines = (zlim[1] - zlim[0]) / lines
-        lines = np.arange(zlim[0], zlim[1] + lines, lines)
-        cb.add_lines(lines, colors=(line_color,) * len(lines),
-                     linewidths=(linewidth,) * len(lines))
+        if label is not None:
+            cb.set_label(label, size=fontsize_label)
+
+        if lines is not None:
+            lines = (zlim[1] - zlim[0]) / lines
+            lines = np.arange(zlim[0], zlim[1] + lines, lines)
+            cb.add_lines(lines, colors=(line_color,) * len(lines),
+                         linewidths=(linewidth,) * len(lines))
+
+    with timer.phase('save'):
+        if filename is not None:
+            save_figure(fig, filename, dpi=dpi, transparent=True)
+
+        out = None
+        if buffer is not None:
+            out = figure_buffer(fig, buffer, dpi=dpi, transparent=True,
+                                bbox_inches='tight')
 
-    if filename is not None:
-        plt.savefig(filename, dpi=dpi, transparent=True,
-                    bbox_inches='tight')
+    if buffer is None and showfig:
+        with timer.phase('show'):
+            plt.show()
+            plt.close(fig)
 
-    if showfig:
-        plt.show()
+    timer.finish()
 
-    plt.close()
+    return out
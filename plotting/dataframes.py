@@ -2,9 +2,45 @@
 Plotting dataframe data with seaborn and pandas
 """
 import itertools
+import numpy as np
 import pandas as pd
 import seaborn as sns
 from plotting.base import plotting_base
+from plotting.binning import density_plot
+from plotting.decimate import axis_pixel_width, decimate_df
+from plotting.kde import distribution_plot
+from plotting.stats import box_stats_plot, estimates_plot, stacked_bar_plot
+
+
+def _stack_columns(df, var_name):
+    """
+    Stack the columns of df into a single var_name column with a categorical
+    source column
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Source DataFrame
+    var_name : str
+        Column name to use for data in final DataFrame
+
+    Returns
+    -------
+    pandas.DataFrame
+        Long style DataFrame with var_name and source columns, rows are
+        ordered by column then by index, the index of df is tiled
+    """
+    n_rows, n_cols = df.shape
+    if df.columns.is_unique:
+        codes = np.repeat(np.arange(n_cols, dtype=np.int32), n_rows)
+        source = pd.Categorical.from_codes(codes, categories=df.columns)
+    else:
+        source = pd.Categorical(np.repeat(df.columns.values, n_rows))
+
+    index = df.index.take(np.tile(np.arange(n_rows), n_cols))
+
+    return pd.DataFrame({var_name: df.to_numpy().ravel(order='F'),
+                         'source': source}, index=index)
 
 
 def pivot_timeseries(df, var_name, timezone=None):
@@ -25,21 +61,16 @@ def pivot_timeseries(df, var_name, timezone=None):
     pandas.DataFrame
         Seaborn style long table with source, year, month, hour columns
     """
-    sns_df = []
-    for name, col in df.iteritems():
-        col = col.to_frame()
-        col.columns = [var_name]
-        col['source'] = name
-        col['year'] = col.index.year
-        col['month'] = col.index.month
-        col['hour'] = col.index.hour
-        if timezone is not None:
-            td = pd.to_timedelta('{:}h'.format(timezone))
-            col['local_hour'] = (col.index + td).hour
-
-        sns_df.append(col)
+    sns_df = _stack_columns(df, var_name)
+    n_cols = df.shape[1]
+    sns_df['year'] = np.tile(df.index.year, n_cols)
+    sns_df['month'] = np.tile(df.index.month, n_cols)
+    sns_df['hour'] = np.tile(df.index.hour, n_cols)
+    if timezone is not None:
+        td = pd.to_timedelta('{:}h'.format(timezone))
+        sns_df['local_hour'] = np.tile((df.index + td).hour, n_cols)
 
-    return pd.concat(sns_df)
+    return sns_df
 
 
 def pivot_df(df, var_name):
@@ -58,44 +89,52 @@ def pivot_df(df, var_name):
     pandas.DataFrame
         Seaborn long style DataFrame
     """
-    sns_df = []
-    for name, col in df.iteritems():
-        col = col.to_frame()
-        col.columns = [var_name]
-        col['source'] = name
-        sns_df.append(col)
+    return _stack_columns(df, var_name)
 
-    return pd.concat(sns_df)
 
-
-def box_plot(df, **kwargs):
+def box_plot(df, engine='seaborn', **kwargs):
     """
     Box plot based on seaborns boxplot
 
     Parameters
     ----------
-    df : pandas.DataFrame
-        Seaborn compliant (long style) DataFrame
+    df : pandas.DataFrame | iterable | dict
+        Seaborn compliant (long style) DataFrame. With engine='native' also
+        an iterable of DataFrame chunks or a dict of quantile sketches from
+        plotting.stats.sketch_groups
+    engine : str, optional
+        'seaborn' to use seaborn.boxplot or 'native' to compute the box
+        statistics with a vectorized groupby (or mergeable quantile
+        sketches for chunked input) and draw them with
+        matplotlib.axes.Axes.bxp, by default 'seaborn'
     kwargs : dict
-        kwargs for seaborn.boxplot and plotting_base
+        kwargs for seaborn.boxplot (plotting.stats.box_stats_plot) and
+        plotting_base
 
     See Also
     --------
     seaborn.boxplot : plotting function
+    plotting.stats.box_stats_plot : plotting function
 
     plotting.base.plotting_base : plotting base
     """
-    def plot_func(axis, df, **kwargs):
+    def plot_func(axis, df, engine='seaborn', **kwargs):
         meanprops = dict(marker='o', markeredgecolor='black',
                          markerfacecolor="None", markersize=5)
-        sns.boxplot(data=df, ax=axis, meanprops=meanprops, **kwargs)
+        if engine == 'seaborn':
+            sns.boxplot(data=df, ax=axis, meanprops=meanprops, **kwargs)
+        elif engine == 'native':
+            box_stats_plot(axis, df, meanprops=meanprops, **kwargs)
+        else:
+            raise ValueError('engine must be "seaborn" or "native"')
 
-    plotting_base(plot_func, df, **kwargs)
+    return plotting_base(plot_func, df, engine=engine, **kwargs)
 
 
-def dist_plot(df, fit=False, **kwargs):
+def dist_plot(df, fit=False, engine='native', **kwargs):
     """
-    Distribution plot based on seaborn distplot
+    Distribution plot of each column (or of a series) as a histogram and
+    kernel density estimate
 
     Parameters
     ----------
@@ -103,39 +142,52 @@ def dist_plot(df, fit=False, **kwargs):
         Seaborn compliant (long style) DataFrame
     fit : bool
         Fit the distribution
+    engine : str, optional
+        'native' to use the binned FFT kernel density estimate, whose cost
+        depends on the grid size rather than the number of samples, or
+        'seaborn' to use seaborn.distplot, by default 'native'
     kwargs : dict
-        kwargs for seaborn.distplot and plotting_base
+        kwargs for plotting.kde.distribution_plot (seaborn.distplot) and
+        plotting_base
 
     See Also
     --------
+    plotting.kde.distribution_plot : plotting function
     seaborn.distplot : plotting function
 
     plotting.base.plotting_base : plotting base
     """
-    def plot_func(axis, df, fit=None, **kwargs):
+    def plot_func(axis, df, fit=None, engine='native', **kwargs):
         palette = itertools.cycle(sns.color_palette())
         if isinstance(df, pd.DataFrame):
-            for label, series in df. iteritems():
+            series = list(df.items())
+        else:
+            series = [(None, df)]
+
+        for label, data in series:
+            if label is not None:
+                kwargs['label'] = label
+
+            if engine == 'native':
                 if fit:
-                    sns.distplot(series, kde=False,
+                    distribution_plot(axis, data, kde=False,
+                                      color=next(palette), **kwargs)
+                else:
+                    distribution_plot(axis, data, **kwargs)
+            elif engine == 'seaborn':
+                if fit:
+                    sns.distplot(data, kde=False,
                                  fit_kws={"color": next(palette)},
-                                 label=label, ax=axis,
-                                 **kwargs)
+                                 ax=axis, **kwargs)
                 else:
-                    sns.distplot(series, label=label, ax=axis,
-                                 **kwargs)
-        else:
-            if fit:
-                sns.distplot(df, kde=False,
-                             fit_kws={"color": next(palette)},
-                             ax=axis, **kwargs)
+                    sns.distplot(data, ax=axis, **kwargs)
             else:
-                sns.distplot(df, ax=axis, **kwargs)
+                raise ValueError('engine must be "native" or "seaborn"')
 
-    plotting_base(plot_func, df, fit=fit, **kwargs)
+    return plotting_base(plot_func, df, fit=fit, engine=engine, **kwargs)
 
 
-def point_plot(df, **kwargs):
+def point_plot(df, engine='seaborn', **kwargs):
     """
     Point / line plot based on seaborn pointplot
 
@@ -143,22 +195,34 @@ def point_plot(df, **kwargs):
     ----------
     df : pandas.DataFrame
         Seaborn compliant (long style) DataFrame
+    engine : str, optional
+        'seaborn' to use seaborn.pointplot or 'native' to compute the
+        estimate and confidence interval of every group at once, with a
+        batched seeded bootstrap (ci_method='bootstrap') or normal intervals
+        (ci_method='normal'), by default 'seaborn'
     kwargs : dict
-        kwargs for seaborn.pointplot and plotting_base
+        kwargs for seaborn.pointplot (plotting.stats.estimates_plot) and
+        plotting_base
 
     See Also
     --------
     seaborn.pointplot : plotting function
+    plotting.stats.estimates_plot : plotting function
 
     plotting.base.plotting_base : plotting base
     """
-    def plot_func(axis, df, **kwargs):
-        sns.pointplot(data=df, ax=axis, **kwargs)
+    def plot_func(axis, df, engine='seaborn', **kwargs):
+        if engine == 'seaborn':
+            sns.pointplot(data=df, ax=axis, **kwargs)
+        elif engine == 'native':
+            estimates_plot(axis, df, kind='point', **kwargs)
+        else:
+            raise ValueError('engine must be "seaborn" or "native"')
 
-    plotting_base(plot_func, df, **kwargs)
+    return plotting_base(plot_func, df, engine=engine, **kwargs)
 
 
-def bar_plot(df, kind='bar', **kwargs):
+def bar_plot(df, kind='bar', engine='seaborn', **kwargs):
     """
     Bar plot based on seaborn's catplot
 
@@ -168,26 +232,39 @@ def bar_plot(df, kind='bar', **kwargs):
         Seaborn compliant (long style) DataFrame
     kind : str
         kind of plot to use "count" or "bar"
+    engine : str, optional
+        'seaborn' to use seaborn.barplot / countplot or 'native' to compute
+        the estimate and confidence interval of every group at once, with a
+        batched seeded bootstrap (ci_method='bootstrap') or normal intervals
+        (ci_method='normal'), and draw one bar call per hue level,
+        by default 'seaborn'
     kwargs : dict
-        kwargs for seaborn.barplot and plotting_base
+        kwargs for seaborn.barplot (plotting.stats.estimates_plot) and
+        plotting_base
 
     See Also
     --------
     seaborn.catplot : plotting function
     seaborn.barplot : plotting function
     seaborn.countplot : plotting function
+    plotting.stats.estimates_plot : plotting function
 
     plotting.base.plotting_base : plotting base
     """
-    def plot_func(axis, df, kind='bar', **kwargs):
-        if kind == 'bar':
+    def plot_func(axis, df, kind='bar', engine='seaborn', **kwargs):
+        if kind not in ('bar', 'count'):
+            raise ValueError('kind must be "count" or "bar"')
+
+        if engine == 'native':
+            estimates_plot(axis, df, kind=kind, **kwargs)
+        elif engine != 'seaborn':
+            raise ValueError('engine must be "seaborn" or "native"')
+        elif kind == 'bar':
             sns.barplot(data=df, ax=axis, **kwargs)
-        elif kind == 'count':
-            sns.countplot(data=df, ax=axis, **kwargs)
         else:
-            raise ValueError('kind must be "count" or "bar"')
+            sns.countplot(data=df, ax=axis, **kwargs)
 
-    plotting_base(plot_func, df, kind=kind, **kwargs)
+    return plotting_base(plot_func, df, kind=kind, engine=engine, **kwargs)
 
 
 def df_bar_plot(df, **kwargs):
@@ -210,12 +287,13 @@ def df_bar_plot(df, **kwargs):
     def plot_func(axis, df, **kwargs):
         df.plot(kind='bar', ax=axis, **kwargs)
 
-    plotting_base(plot_func, df, **kwargs)
+    return plotting_base(plot_func, df, **kwargs)
 
 
 def stackedbar_plot(df, x, y, stack, **kwargs):
     """
-    Bar plot based on seaborn's catplot
+    Stacked bar plot of a long style DataFrame, the values of duplicate
+    (x, stack) pairs are aggregated
 
     Parameters
     ----------
@@ -229,23 +307,23 @@ def stackedbar_plot(df, x, y, stack, **kwargs):
         Column to stack
     order : list
         Stacking order
+    aggfunc : str, optional
+        Aggregation of the values of each (x, stack) pair, 'sum', 'mean',
+        'median', 'min', 'max', 'count', 'first' or 'last',
+        by default 'sum'
     kwargs : dict
-        kwargs for pandas.DataFrame.plot and plotting_base
+        kwargs for plotting.stats.stacked_bar_plot and plotting_base
 
     See Also
     --------
-    pandas.DataFrame.plot : plotting function
+    plotting.stats.stacked_bar_plot : plotting function
 
     plotting.base.plotting_base : plotting base
     """
-    def plot_func(axis, df, x, y, stack, order=None, **kwargs):
-        df = df.pivot(index=x, values=y, columns=stack)
-        if order is not None:
-            df = df[order]
+    def plot_func(axis, df, x, y, stack, **kwargs):
+        stacked_bar_plot(axis, df, x, y, stack, **kwargs)
 
-        df.plot(kind='bar', stacked=True, ax=axis, **kwargs)
-
-    plotting_base(plot_func, df, x, y, stack, **kwargs)
+    return plotting_base(plot_func, df, x, y, stack, **kwargs)
 
 
 def df_scatter(df, **kwargs):
@@ -256,19 +334,38 @@ def df_scatter(df, **kwargs):
     ----------
     df : pandas.DataFrame
         Seaborn compliant (long style) DataFrame
+    density : bool | str, optional
+        Bin the points into a pixel grid and draw it as a single image
+        instead of one marker per point. Either True or the aggregation to
+        apply to the points in each pixel: 'count', or 'sum', 'mean', 'min',
+        'max' of column c, by default False
     kwargs : dict
-        kwargs for pandas.DataFrame.plot.scatter and plotting_base
+        kwargs for pandas.DataFrame.plot.scatter (matplotlib.pyplot.imshow if
+        density, marker kwargs such as s and marker are then ignored) and
+        plotting_base
 
     See Also
     --------
     pandas.DataFrame.plot.scatter : plotting function
 
+    plotting.binning.density_plot : density plotting function
     plotting.base.plotting_base : plotting base
     """
-    def plot_func(axis, df, **kwargs):
-        df.plot.scatter(ax=axis, **kwargs)
+    def plot_func(axis, df, density=False, **kwargs):
+        if density:
+            agg = None if density is True else density
+            x = kwargs.pop('x')
+            y = kwargs.pop('y')
+            c = kwargs.pop('c', None)
+            values = df[c].values if c is not None else None
+            density_plot(axis, df[x].values, df[y].values, values=values,
+                         agg=agg, **kwargs)
+            axis.set_xlabel(x)
+            axis.set_ylabel(y)
+        else:
+            df.plot.scatter(ax=axis, **kwargs)
 
-    plotting_base(plot_func, df, **kwargs)
+    return plotting_base(plot_func, df, **kwargs)
 
 
 def df_line_plot(df, **kwargs):
@@ -279,6 +376,11 @@ def df_line_plot(df, **kwargs):
     ----------
     df : pandas.DataFrame
         DataFrame of data to plot
+    decimate : str, optional
+        Reduce the rows to those visible at the axis pixel width before
+        plotting, 'minmax' to keep the min and max of each column in each
+        pixel column or 'lttb' for Largest-Triangle-Three-Buckets,
+        by default None
     kwargs : dict
         kwargs for pandas.DataFrame.plot and plotting_base
 
@@ -286,12 +388,17 @@ def df_line_plot(df, **kwargs):
     --------
     pandas.DataFrame.plot : plotting function
 
+    plotting.decimate.decimate_df : decimation
     plotting.base.plotting_base : plotting base
     """
-    def plot_func(axis, df, **kwargs):
+    def plot_func(axis, df, decimate=None, **kwargs):
+        if decimate is not None:
+            df = decimate_df(df, axis_pixel_width(axis), method=decimate,
+                             x=kwargs.get('x'), y=kwargs.get('y'))
+
         df.plot(ax=axis, **kwargs)
 
-    plotting_base(plot_func, df, **kwargs)
+    return plotting_base(plot_func, df, **kwargs)
 
 
 def df_error_plot(df, error, **kwargs):
@@ -318,7 +425,7 @@ def df_error_plot(df, error, **kwargs):
         error.index = df.index
         df.plot(yerr=error, ax=axis, **kwargs)
 
-    plotting_base(plot_func, df, error, **kwargs)
+    return plotting_base(plot_func, df, error, **kwargs)
 
 
 def df_pie_plot(df, **kwargs):
@@ -341,4 +448,4 @@ def df_pie_plot(df, **kwargs):
     def plot_func(axis, df, **kwargs):
         df.plot.pie(ax=axis, **kwargs)
 
-    plotting_base(plot_func, df, **kwargs)
+    return plotting_base(plot_func, df, **kwargs)
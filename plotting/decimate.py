@@ -0,0 +1,367 @@
+"""
+Decimation of long series down to the resolution of the figure
+"""
+import numpy as np
+from plotting.sources import CHUNKSIZE, is_array_like, iter_chunks, load_source
+
+DECIMATE_METHODS = ('minmax', 'lttb')
+
+
+def _as_numeric(x):
+    """
+    Convert x values to a float compatible array, datetimes to int64
+
+    Parameters
+    ----------
+    x : ndarray | pandas.Index
+        x values
+
+    Returns
+    -------
+    ndarray
+        Numeric x values
+    """
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64) \
+            or np.issubdtype(x.dtype, np.timedelta64):
+        x = x.view('i8')
+
+    return x
+
+
+def _bucket_starts(n, n_bins, x=None, x_range=None):
+    """
+    Start index of each non-empty bucket
+
+    Parameters
+    ----------
+    n : int
+        Number of samples
+    n_bins : int
+        Number of buckets
+    x : ndarray, optional
+        Ascending x values to bucket by value, if None bucket by position,
+        by default None
+    x_range : tuple, optional
+        (min, max) x value spanned by the buckets, by default None (first
+        and last x value)
+
+    Returns
+    -------
+    ndarray
+        Sorted, unique start index of each non-empty bucket
+    """
+    if x_range is None and x is not None:
+        x_range = (x[0], x[-1])
+
+    if x is None or x_range[1] <= x_range[0]:
+        starts = (np.arange(n_bins) * n) // n_bins
+    else:
+        edges = np.linspace(x_range[0], x_range[1], n_bins + 1)[:-1]
+        starts = np.searchsorted(x, edges, side='left')
+        starts[0] = 0
+
+    starts = np.unique(starts)
+
+    return starts[starts < n]
+
+
+def minmax_indices(y, n_bins, x=None, x_range=None):
+    """
+    Indices of the min and max sample in each pixel column
+
+    Parameters
+    ----------
+    y : ndarray
+        y values
+    n_bins : int
+        Number of buckets, typically the width of the axis in pixels
+    x : ndarray, optional
+        Ascending x values, if given buckets span equal x ranges, otherwise
+        equal numbers of samples, by default None
+    x_range : tuple, optional
+        (min, max) x value spanned by the buckets, fixing the bucket edges
+        when y is one chunk of a longer series, by default None (first and
+        last x value)
+
+    Returns
+    -------
+    ndarray
+        Sorted indices of the first, last, and per bucket min and max samples
+    """
+    n = len(y)
+    if n <= 2 * n_bins + 2:
+        return np.arange(n)
+
+    if x is not None:
+        x = _as_numeric(x)
+
+    starts = _bucket_starts(n, n_bins, x=x, x_range=x_range)
+    stops = np.append(starts[1:], n)
+    idx = np.empty(2 * len(starts) + 2, dtype=np.int64)
+    idx[0] = 0
+    idx[-1] = n - 1
+    for i, (start, stop) in enumerate(zip(starts, stops)):
+        bucket = y[start:stop]
+        if np.isnan(bucket).all():
+            # keep the gap
+            idx[2 * i + 1] = idx[2 * i + 2] = start
+        else:
+            idx[2 * i + 1] = start + np.nanargmin(bucket)
+            idx[2 * i + 2] = start + np.nanargmax(bucket)
+
+    return np.unique(idx)
+
+
+def lttb_indices(y, n_out, x=None):
+    """
+    Indices selected by Largest-Triangle-Three-Buckets downsampling
+
+    Parameters
+    ----------
+    y : ndarray
+        y values
+    n_out : int
+        Number of samples to keep
+    x : ndarray, optional
+        x values, if None use the sample position, by default None
+
+    Returns
+    -------
+    ndarray
+        Sorted indices of the selected samples
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    if x is None:
+        x = np.arange(n, dtype=np.float64)
+    else:
+        x = _as_numeric(x).astype(np.float64, copy=False)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    edges = np.append(edges, n)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        avg_x = np.nanmean(x[stop:edges[i + 2]])
+        avg_y = np.nanmean(y[stop:edges[i + 2]])
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + np.argmax(np.nan_to_num(area, nan=-1))
+        idx[i + 1] = a
+
+    return idx
+
+
+def decimate_indices(y, n_pixels, method='minmax', x=None):
+    """
+    Indices of the samples needed to draw y at a width of n_pixels
+
+    Parameters
+    ----------
+    y : ndarray
+        y values
+    n_pixels : int
+        Width of the output in pixels
+    method : str, optional
+        'minmax' to keep the min and max of each pixel column or 'lttb' to
+        keep 2 * n_pixels samples with Largest-Triangle-Three-Buckets,
+        by default 'minmax'
+    x : ndarray, optional
+        Ascending x values, by default None
+
+    Returns
+    -------
+    ndarray
+        Sorted indices of the samples to draw
+    """
+    n_pixels = max(int(n_pixels), 1)
+    if method == 'minmax':
+        return minmax_indices(y, n_pixels, x=x)
+    elif method == 'lttb':
+        return lttb_indices(y, 2 * n_pixels, x=x)
+    else:
+        msg = ('decimate method must be one of {}, not {}'
+               .format(DECIMATE_METHODS, method))
+        raise ValueError(msg)
+
+
+def axis_pixel_width(axis):
+    """
+    Width of the axis in pixels
+
+    Parameters
+    ----------
+    axis : matplotlib.axes.Axes
+        Axis to be drawn on
+
+    Returns
+    -------
+    int
+        Axis width in pixels
+    """
+    return int(np.ceil(axis.get_window_extent().width))
+
+
+def decimate_line(line, n_pixels, method='minmax'):
+    """
+    Decimate a nx2 line, x values are assumed to be ascending
+
+    Parameters
+    ----------
+    line : ndarray
+        nx2 array of (x, y) values
+    n_pixels : int
+        Width of the output in pixels
+    method : str, optional
+        'minmax' or 'lttb', by default 'minmax'
+
+    Returns
+    -------
+    ndarray
+        Decimated mx2 line
+    """
+    idx = decimate_indices(line[:, 1], n_pixels, method=method,
+                           x=line[:, 0])
+
+    return line[idx]
+
+
+def decimate_df(df, n_pixels, method='minmax', x=None, y=None):
+    """
+    Decimate the rows of a DataFrame keeping the samples needed by any column
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame to decimate
+    n_pixels : int
+        Width of the output in pixels
+    method : str, optional
+        'minmax' or 'lttb', by default 'minmax'
+    x : str, optional
+        Column to use as x values, if None use the index when it is
+        ascending, by default None
+    y : str | list, optional
+        Column(s) to decimate, by default None (all numeric columns)
+
+    Returns
+    -------
+    pandas.DataFrame
+        Rows of df needed to draw every column at n_pixels width
+    """
+    if x is not None:
+        x_values = df[x].values
+    elif df.index.is_monotonic_increasing:
+        x_values = df.index.values
+    else:
+        x_values = None
+
+    if y is None:
+        y = [c for c in df.select_dtypes('number').columns if c != x]
+    elif isinstance(y, str):
+        y = [y]
+
+    idx = [decimate_indices(df[c].values, n_pixels, method=method,
+                            x=x_values) for c in y]
+    if not idx:
+        return df
+
+    return df.iloc[np.unique(np.concatenate(idx))]
+
+
+def source_x_range(source, key=None):
+    """
+    First and last x value of an array like source of rows with x values in
+    the first column, read without loading the source
+
+    Parameters
+    ----------
+    source : str | os.PathLike | ndarray | h5py.Dataset | iterable
+        Source of nxm rows
+    key : str, optional
+        Array to load from a .npz file, by default None
+
+    Returns
+    -------
+    tuple | None
+        (first, last) x value, None if source is an iterator
+    """
+    source = load_source(source, key=key)
+    if not is_array_like(source) or not source.shape[0]:
+        return None
+
+    first = _as_numeric(np.asarray(source[:1])[:, 0])
+    last = _as_numeric(np.asarray(source[-1:])[:, 0])
+
+    return float(first[0]), float(last[0])
+
+
+def stream_decimate(source, n_pixels, x_range=None, chunksize=CHUNKSIZE,
+                    key=None):
+    """
+    Min/max decimate a series of rows streamed one chunk at a time, so a
+    series of any length is reduced with memory bounded by the chunk size
+    and the number of pixels. Each chunk is reduced to the min and max rows
+    of the pixel columns it spans, and the kept rows are compacted whenever
+    they exceed 16 * n_pixels. Rows are (x, y, ...) with ascending x, extra
+    columns (e.g. errors) are carried along with the rows kept.
+
+    Parameters
+    ----------
+    source : str | os.PathLike | ndarray | h5py.Dataset | iterable
+        Path to a .npy (memory mapped) or .npz file, np.memmap, h5py.Dataset
+        or iterable of nxm chunks
+    n_pixels : int
+        Width of the output in pixels
+    x_range : tuple, optional
+        (first, last) x value of the series. If None it is read from array
+        like sources, which makes the pixel columns exact. For iterators
+        the rows are reduced at 4x the output resolution over the x range
+        seen so far, which keeps the envelope to within a quarter of a
+        pixel, by default None
+    chunksize : int, optional
+        Number of rows per chunk for array like sources, by default 2**20
+    key : str, optional
+        Array to load from a .npz file, by default None
+
+    Returns
+    -------
+    ndarray
+        Decimated rows
+    """
+    n_pixels = max(int(n_pixels), 1)
+    if x_range is None:
+        x_range = source_x_range(source, key=key)
+
+    n_bins = n_pixels if x_range is not None else 4 * n_pixels
+
+    def reduce(rows, n_bins):
+        idx = minmax_indices(rows[:, 1], n_bins, x=rows[:, 0],
+                             x_range=x_range)
+
+        return rows[idx]
+
+    kept = []
+    n_kept = 0
+    for chunk in iter_chunks(source, chunksize=chunksize, key=key):
+        if not len(chunk):
+            continue
+
+        chunk = reduce(chunk, n_bins)
+        kept.append(chunk)
+        n_kept += len(chunk)
+        if n_kept > 16 * n_pixels:
+            kept = [reduce(np.concatenate(kept), n_bins)]
+            n_kept = len(kept[0])
+
+    if not kept:
+        msg = 'Can not decimate an empty source'
+        raise ValueError(msg)
+
+    return reduce(np.concatenate(kept), n_bins)
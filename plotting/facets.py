@@ -0,0 +1,180 @@
+"""
+Grids of plotting function panels drawn on a single figure
+"""
+import time
+import matplotlib.pyplot as plt
+import numpy as np
+from plotting.base import figure_buffer
+from plotting.layout import get_layout_cache
+from plotting.pool import agg_figure
+from plotting.rc import with_rc
+from plotting.timing import PhaseTimer
+from plotting.writer import (get_writer, is_vector, rasterize_artists,
+                             RASTERIZE_THRESHOLD, save_figure)
+
+
+@with_rc
+def facet_plot(panels, ncols=None, sharex=False, sharey=False,
+               panel_size=(4, 3), figsize=None, dpi=100, fontsize=14,
+               suptitle=None, filename=None, showplot=True, buffer=None,
+               writer=None, layout_cache=None, rasterize=True, rc=None):
+    """
+    Draw several plotting functions as panels of one figure. Every panel is
+    drawn and formatted by its plotting function on its own axis, then the
+    whole grid is laid out and saved once, instead of rendering, laying out
+    and saving a figure per panel.
+
+    Parameters
+    ----------
+    panels : list
+        List of (plot_func, args, kwargs) tuples, e.g.
+        (plotting.line_plot, (line, ), {'title': 'line'}), with any public
+        plotting function built on plotting_base. None leaves a panel empty.
+        Panel legends are drawn inside the panel unless legend_loc is given
+    ncols : int, optional
+        Number of columns, by default None (ceil(sqrt(len(panels))))
+    sharex : bool | str, optional
+        Share the x-axis between panels: True or 'all', 'row', 'col',
+        by default False
+    sharey : bool | str, optional
+        Share the y-axis between panels: True or 'all', 'row', 'col',
+        by default False
+    panel_size : tuple, optional
+        Width and height of each panel, by default (4, 3)
+    figsize : tuple, optional
+        Width and height of figure, by default None (panel_size times the
+        number of columns and rows)
+    dpi : int, optional
+        DPI resolution of figure, by default 100
+    fontsize : int, optional
+        Default font size of each panel and size of the suptitle - 2,
+        by default 14
+    suptitle : str, optional
+        Centered figure title, by default None
+    filename : str | list, optional
+        Name of file/path to save the figure to, or list of files/paths to
+        save the same drawn figure to in several formats, by default None
+    showplot : bool, optional
+        Display plot with pyplot, figures that are not shown are created
+        without pyplot, by default True
+    buffer : str, optional
+        Return the rendered figure from memory instead of displaying it,
+        'png', 'svg', 'pdf' or 'rgba', by default None
+    writer : bool | plotting.writer.AsyncWriter, optional
+        Hand the drawn figure to a background writer to encode and save to
+        filename and return a future immediately, by default None
+    layout_cache : bool | plotting.layout.LayoutCache, optional
+        Reuse the layout of an earlier grid with the same size and text,
+        see plotting.base.plotting_base, by default None
+    rasterize : bool | int, optional
+        Rasterize the lines and collections of every panel with more than
+        this many points when saving to a vector format, True for
+        plotting.writer.RASTERIZE_THRESHOLD points, False to keep every
+        artist vector, by default True
+    rc : dict, optional
+        rcParams to render with, applied with matplotlib.rc_context for
+        the duration of the call, by default None
+
+    Returns
+    -------
+    bytes | ndarray | concurrent.futures.Future | None
+        Rendered figure if buffer is not None, future resolving to filename
+        once it is written if writer is used
+
+    See Also
+    --------
+    plotting.base.plotting_base : plotting base used to draw each panel
+    """
+    if writer and filename is None:
+        writer = None
+    elif writer and buffer is not None:
+        raise ValueError('writer can not be combined with buffer')
+
+    n_panels = len(panels)
+    if n_panels == 0:
+        raise ValueError('panels must contain at least one panel')
+
+    if ncols is None:
+        ncols = int(np.ceil(np.sqrt(n_panels)))
+
+    ncols = min(ncols, n_panels)
+    nrows = -(-n_panels // ncols)
+    if figsize is None:
+        figsize = (panel_size[0] * ncols, panel_size[1] * nrows)
+
+    timer = PhaseTimer('facet_plot')
+    with timer.phase('figure'):
+        if buffer is not None or writer or not showplot:
+            fig = agg_figure(figsize=figsize, dpi=dpi)
+        else:
+            fig = plt.figure(figsize=figsize, dpi=dpi)
+
+        axes = fig.subplots(nrows, ncols, sharex=sharex, sharey=sharey,
+                            squeeze=False).ravel()
+
+    with timer.phase('plot'):
+        for axis, panel in zip(axes, panels):
+            if panel is None:
+                axis.axis('off')
+                continue
+
+            plot_func, args, kwargs = panel
+            kwargs = dict(kwargs)
+            kwargs.setdefault('fontsize', fontsize)
+            kwargs.setdefault('legend_loc', 'best')
+            plot_func(*args, ax=axis, **kwargs)
+
+        for axis in axes[n_panels:]:
+            axis.axis('off')
+
+    if suptitle is not None:
+        with timer.phase('format'):
+            fig.suptitle(suptitle, fontsize=fontsize + 2)
+
+    if rasterize is True:
+        rasterize = RASTERIZE_THRESHOLD
+
+    if rasterize is not False and rasterize is not None \
+            and is_vector(filename, buffer):
+        with timer.phase('format'):
+            rasterize_artists(fig, threshold=rasterize)
+
+    with timer.phase('layout'):
+        if layout_cache:
+            bbox_inches = get_layout_cache(layout_cache).layout(fig)
+        else:
+            fig.tight_layout()
+            bbox_inches = 'tight'
+
+    if writer:
+        start = time.perf_counter()
+        future = get_writer(writer).submit(fig, filename, dpi=dpi,
+                                           bbox_inches=bbox_inches,
+                                           transparent=True, rc=rc)
+        if timer.enabled:
+            def finish_timer(future):
+                timer.add('save', time.perf_counter() - start)
+                timer.finish()
+
+            future.add_done_callback(finish_timer)
+
+        return future
+
+    with timer.phase('save'):
+        if filename is not None:
+            save_figure(fig, filename, dpi=dpi, bbox_inches=bbox_inches,
+                        transparent=True)
+
+        out = None
+        if buffer is not None:
+            out = figure_buffer(fig, buffer, dpi=dpi, transparent=True,
+                                bbox_inches=bbox_inches)
+
+    if buffer is None and showplot:
+        with timer.phase('show'):
+            plt.show()
+            plt.close(fig)
+
+    timer.finish()
+
+    return out
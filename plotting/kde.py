@@ -0,0 +1,261 @@
+"""
+Binned kernel density estimation evaluated with an FFT convolution
+"""
+import numpy as np
+
+BANDWIDTH_METHODS = ('scott', 'silverman')
+
+
+def _weighted_std(x, weights=None):
+    """
+    Standard deviation and effective sample size of x
+
+    Parameters
+    ----------
+    x : ndarray
+        Values
+    weights : ndarray, optional
+        Weight of each value, by default None
+
+    Returns
+    -------
+    std : float
+        (Weighted) standard deviation
+    n_eff : float
+        Effective number of samples
+    """
+    if weights is None:
+        return float(np.std(x, ddof=1)), float(len(x))
+
+    mean = np.average(x, weights=weights)
+    var = np.average((x - mean) ** 2, weights=weights)
+    n_eff = weights.sum() ** 2 / (weights ** 2).sum()
+
+    return float(np.sqrt(var * n_eff / (n_eff - 1))), float(n_eff)
+
+
+def bandwidth(x, method='scott', weights=None):
+    """
+    Gaussian kernel bandwidth using Scott's or Silverman's rule
+
+    Parameters
+    ----------
+    x : ndarray
+        Values
+    method : str | float, optional
+        'scott', 'silverman' or a scalar factor to scale the standard
+        deviation by, by default 'scott'
+    weights : ndarray, optional
+        Weight of each value, by default None
+
+    Returns
+    -------
+    float
+        Bandwidth in the units of x
+    """
+    std, n = _weighted_std(x, weights=weights)
+    if method == 'scott':
+        factor = n ** (-1 / 5)
+    elif method == 'silverman':
+        factor = (n * 3 / 4) ** (-1 / 5)
+    elif np.isscalar(method):
+        factor = float(method)
+    else:
+        msg = ('bandwidth method must be one of {} or a scalar, not {}'
+               .format(BANDWIDTH_METHODS, method))
+        raise ValueError(msg)
+
+    bw = std * factor
+    if bw <= 0 or not np.isfinite(bw):
+        bw = 1.0
+
+    return bw
+
+
+def linear_bin(x, grid_min, delta, gridsize, weights=None):
+    """
+    Linear binning: split the weight of each value between its two
+    neighbouring grid points in proportion to their distance
+
+    Parameters
+    ----------
+    x : ndarray
+        Values
+    grid_min : float
+        First grid point
+    delta : float
+        Grid spacing
+    gridsize : int
+        Number of grid points
+    weights : ndarray, optional
+        Weight of each value, by default None
+
+    Returns
+    -------
+    ndarray
+        Weight at each grid point
+    """
+    pos = (x - grid_min) / delta
+    idx = np.clip(np.floor(pos).astype(np.intp), 0, gridsize - 2)
+    frac = np.clip(pos - idx, 0, 1)
+    if weights is None:
+        weights = np.ones_like(frac)
+
+    counts = np.bincount(idx, weights=weights * (1 - frac),
+                         minlength=gridsize)
+    counts += np.bincount(idx + 1, weights=weights * frac,
+                          minlength=gridsize)
+
+    return counts
+
+
+def binned_kde(x, weights=None, bw='scott', gridsize=512, cut=3, clip=None):
+    """
+    Gaussian kernel density estimate on a regular grid. Values are linear
+    binned onto the grid and convolved with the kernel using an FFT, so the
+    cost depends on the number of values only through the O(n) binning.
+
+    Parameters
+    ----------
+    x : ndarray | pandas.Series
+        Values
+    weights : ndarray, optional
+        Weight of each value, by default None
+    bw : str | float, optional
+        Bandwidth method passed to bandwidth(), by default 'scott'
+    gridsize : int, optional
+        Number of grid points, by default 512
+    cut : float, optional
+        Number of bandwidths to extend the grid past the data,
+        by default 3
+    clip : tuple, optional
+        (min, max) limits of the grid, by default None
+
+    Returns
+    -------
+    grid : ndarray
+        Grid points
+    density : ndarray
+        Density at each grid point
+    """
+    x = np.asarray(x, dtype=np.float64).ravel()
+    mask = np.isfinite(x)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64).ravel()
+        mask &= np.isfinite(weights)
+        weights = weights[mask]
+
+    x = x[mask]
+    h = bandwidth(x, method=bw, weights=weights)
+    grid_min = x.min() - cut * h
+    grid_max = x.max() + cut * h
+    if clip is not None:
+        grid_min = max(grid_min, clip[0])
+        grid_max = min(grid_max, clip[1])
+
+    grid, delta = np.linspace(grid_min, grid_max, gridsize, retstep=True)
+    counts = linear_bin(x, grid_min, delta, gridsize, weights=weights)
+    counts /= counts.sum()
+
+    n_kernel = min(int(np.ceil(4 * h / delta)), gridsize - 1)
+    offsets = np.arange(-n_kernel, n_kernel + 1) * delta
+    kernel = np.exp(-0.5 * (offsets / h) ** 2) / (h * np.sqrt(2 * np.pi))
+
+    n_fft = 1 << int(np.ceil(np.log2(gridsize + 2 * n_kernel + 1)))
+    density = np.fft.irfft(np.fft.rfft(counts, n_fft)
+                           * np.fft.rfft(kernel, n_fft), n_fft)
+    density = np.clip(density[n_kernel:n_kernel + gridsize], 0, None)
+
+    return grid, density
+
+
+def _fd_bins(x):
+    """
+    Number of histogram bins from the Freedman-Diaconis rule, sqrt(n) if the
+    interquartile range is 0
+
+    Parameters
+    ----------
+    x : ndarray
+        Finite values
+
+    Returns
+    -------
+    int
+        Number of bins
+    """
+    iqr = np.subtract(*np.percentile(x, [75, 25]))
+    width = 2 * iqr / len(x) ** (1 / 3)
+    if width == 0:
+        return max(int(np.sqrt(len(x))), 1)
+
+    return max(int(np.ceil(np.ptp(x) / width)), 1)
+
+
+def distribution_plot(axis, a, hist=True, kde=True, bins=None,
+                      norm_hist=True, color=None, label=None, bw='scott',
+                      weights=None, gridsize=512, cut=3, hist_kws=None,
+                      kde_kws=None):
+    """
+    Histogram with a binned FFT kernel density estimate, a drop in for the
+    deprecated seaborn.distplot
+
+    Parameters
+    ----------
+    axis : matplotlib.axes.Axes
+        Axis to draw on
+    a : ndarray | pandas.Series
+        Values
+    hist : bool, optional
+        Draw the histogram, by default True
+    kde : bool, optional
+        Draw the kernel density estimate, by default True
+    bins : int | str, optional
+        Histogram bins, by default None (Freedman-Diaconis, at most 50)
+    norm_hist : bool, optional
+        Normalize the histogram to a density, forced if kde,
+        by default True
+    color : str | tuple, optional
+        Color of histogram and kde line, by default None
+    label : str, optional
+        Legend label, by default None
+    bw : str | float, optional
+        Bandwidth method passed to bandwidth(), by default 'scott'
+    weights : ndarray, optional
+        Weight of each value, by default None
+    gridsize : int, optional
+        Number of kde grid points, by default 512
+    cut : float, optional
+        Number of bandwidths to extend the kde past the data, by default 3
+    hist_kws : dict, optional
+        kwargs for matplotlib.axes.Axes.hist, by default None
+    kde_kws : dict, optional
+        kwargs for matplotlib.axes.Axes.plot, by default None
+    """
+    if label is None and hasattr(a, 'name'):
+        label = a.name
+
+    values = np.asarray(a, dtype=np.float64).ravel()
+    finite = np.isfinite(values)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64).ravel()[finite]
+
+    values = values[finite]
+    if color is None:
+        color = axis._get_lines.get_next_color()
+
+    if hist:
+        hist_kws = dict(hist_kws or {})
+        if bins is None:
+            bins = min(_fd_bins(values), 50)
+
+        hist_kws.setdefault('alpha', 0.4)
+        hist_kws.setdefault('density', norm_hist or kde)
+        axis.hist(values, bins=bins, weights=weights, color=color,
+                  label=None if kde else label, **hist_kws)
+
+    if kde:
+        kde_kws = dict(kde_kws or {})
+        grid, density = binned_kde(values, weights=weights, bw=bw,
+                                   gridsize=gridsize, cut=cut)
+        axis.plot(grid, density, color=color, label=label, **kde_kws)
@@ -0,0 +1,312 @@
+"""
+Cache of figure layouts so figures with the same size and text are only
+laid out once
+"""
+from collections import OrderedDict
+import threading
+import matplotlib as mpl
+from plotting.pool import SUBPLOT_PARAMS
+from plotting.writer import tight_bbox
+
+
+def _text_signature(text, string=None):
+    """
+    What the extent of a Text depends on
+
+    Parameters
+    ----------
+    text : matplotlib.text.Text
+        Text artist
+    string : str, optional
+        Text it is drawn with, by default None (its current text)
+
+    Returns
+    -------
+    tuple
+    """
+    if string is None:
+        string = text.get_text()
+
+    if not text.get_visible() or not string:
+        return None
+
+    return (string, hash(text.get_fontproperties()), text.get_rotation(),
+            text.get_ha(), text.get_va())
+
+
+def _ticks_signature(axis, locs, formatter, ticks):
+    """
+    Locations and labels of the major or minor ticks drawn for the current
+    view limits of an axis
+
+    Parameters
+    ----------
+    axis : matplotlib.axis.Axis
+        x or y axis
+    locs : ndarray
+        Tick locations, from get_majorticklocs or get_minorticklocs
+    formatter : matplotlib.ticker.Formatter
+        Formatter of the ticks
+    ticks : list
+        Ticks of the locations, from get_major_ticks or get_minor_ticks
+
+    Returns
+    -------
+    tuple
+    """
+    labels = formatter.format_ticks(locs)
+    transform = axis.get_transform()
+    low, high = sorted(transform.transform(axis.get_view_interval()))
+    tol = 1e-5 * (high - low)
+    signature = []
+    for loc, label, tick in zip(locs, labels, ticks):
+        loc_t = transform.transform([loc])[0]
+        if low - tol <= loc_t <= high + tol:
+            signature.append((loc, _text_signature(tick.label1, label),
+                              _text_signature(tick.label2, label)))
+
+    return tuple(signature)
+
+
+def _axis_signature(axis):
+    """
+    What the space taken by an x or y axis depends on: its label, view
+    limits, tick labels and their locations, tick styling and position
+
+    Parameters
+    ----------
+    axis : matplotlib.axis.Axis
+        x or y axis
+
+    Returns
+    -------
+    tuple
+    """
+    if not axis.get_visible():
+        return None
+
+    # ticks drawn for the current view limits, labels near the ends of the
+    # axis overhang it so their locations matter as well as their text
+    locs = axis.get_majorticklocs()
+    major = _ticks_signature(axis, locs, axis.get_major_formatter(),
+                             axis.get_major_ticks(len(locs)))
+    locs = axis.get_minorticklocs()
+    minor = _ticks_signature(axis, locs, axis.get_minor_formatter(),
+                             axis.get_minor_ticks(len(locs)))
+    formatter = axis.get_major_formatter()
+    offset = formatter.get_offset() if hasattr(formatter, 'get_offset') \
+        else ''
+
+    return (axis.get_scale(), tuple(axis.get_view_interval()),
+            axis.get_label_position(), axis.get_ticks_position(),
+            repr(sorted(axis.get_tick_params().items())),
+            _text_signature(axis.label), offset, major, minor)
+
+
+def _legend_signature(legend):
+    """
+    What the extent of a legend depends on
+
+    Parameters
+    ----------
+    legend : matplotlib.legend.Legend | None
+        Legend artist
+
+    Returns
+    -------
+    tuple
+    """
+    if legend is None or not legend.get_visible():
+        return None
+
+    # the location is private, layout_signature raises if it is missing
+    return (legend._loc, legend.get_bbox_to_anchor().bounds,
+            len(legend.legend_handles), _text_signature(legend.get_title()),
+            tuple(_text_signature(text) for text in legend.get_texts()))
+
+
+def _axes_signature(ax):
+    """
+    What the space taken by an Axes depends on
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes of the figure
+
+    Returns
+    -------
+    tuple
+    """
+    if not ax.get_visible():
+        return None
+
+    spines = []
+    for name, spine in ax.spines.items():
+        try:
+            position = spine.get_position()
+        except ValueError:
+            # colorbar spines are fixed to their axes and have no position
+            position = spine.spine_type
+        spines.append((name, spine.get_visible(), repr(position)))
+
+    return (ax.get_position(original=True).bounds, ax.axison,
+            ax.get_axes_locator() is not None, tuple(spines),
+            _text_signature(ax.title), _axis_signature(ax.xaxis),
+            _axis_signature(ax.yaxis), _legend_signature(ax.get_legend()))
+
+
+def layout_signature(fig):
+    """
+    Hashable signature of everything tight_layout and the tight bounding
+    box of a figure depend on: its size, resolution, axes positions and view
+    limits, the tick locations, and the text, font and rotation of every
+    title, label, tick label and legend entry. Figures with the same
+    signature have the same layout, figures only share a layout if their
+    limits are fixed, e.g. with xlim and ylim. Artists other than text that
+    are drawn outside of the axes are not part of the signature.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Drawn, not yet laid out figure
+
+    Returns
+    -------
+    tuple
+
+    Raises
+    ------
+    AttributeError
+        If the figure's suptitle or a legend location is not available, they
+        are private in matplotlib and may change between versions
+    """
+    # get_suptitle only returns the string, not the font and rotation
+    texts = list(fig.texts)
+    if fig._suptitle is not None:
+        texts.append(fig._suptitle)
+
+    return (tuple(fig.get_size_inches()), fig.dpi,
+            mpl.rcParams['savefig.pad_inches'],
+            tuple(_text_signature(text) for text in texts),
+            tuple(_legend_signature(legend) for legend in fig.legends),
+            tuple(_axes_signature(ax) for ax in fig.axes))
+
+
+class LayoutCache:
+    """
+    Subplot parameters found by tight_layout and the tight bounding box of
+    figures, keyed by their layout_signature. A figure whose signature is
+    cached is laid out by setting the cached subplot parameters instead of
+    measuring its text with tight_layout, and saved with the cached bounding
+    box instead of savefig(bbox_inches='tight') measuring it again. Least
+    recently used layouts are dropped once max_size layouts are cached.
+    """
+    def __init__(self, max_size=1024):
+        """
+        Parameters
+        ----------
+        max_size : int, optional
+            Maximum number of layouts kept, by default 1024
+        """
+        self._max_size = max_size
+        self._layouts = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """
+        Cache hit and miss counters
+
+        Returns
+        -------
+        dict
+            hits, misses, hit rate and number of layouts
+        """
+        lookups = self.hits + self.misses
+
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.,
+                'entries': len(self._layouts)}
+
+    def layout(self, fig):
+        """
+        Lay out figure with the cached layout of its signature, or with
+        tight_layout and cache its layout
+
+        Parameters
+        ----------
+        fig : matplotlib.figure.Figure
+            Drawn figure to lay out
+
+        Returns
+        -------
+        matplotlib.transforms.Bbox | str
+            Tight bounding box in inches to save the figure with, or 'tight'
+            if the layout of figure can not be cached
+        """
+        try:
+            key = layout_signature(fig)
+        except AttributeError:
+            # private attributes not available in this matplotlib version,
+            # lay out without the cache
+            fig.tight_layout()
+
+            return 'tight'
+
+        with self._lock:
+            cached = self._layouts.get(key)
+            if cached is not None:
+                self._layouts.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if cached is not None:
+            params, bbox = cached
+            fig.subplots_adjust(**params)
+
+            return bbox.frozen()
+
+        fig.tight_layout()
+        params = {p: getattr(fig.subplotpars, p) for p in SUBPLOT_PARAMS}
+        bbox = tight_bbox(fig).frozen()
+        with self._lock:
+            self._layouts[key] = (params, bbox)
+            while len(self._layouts) > self._max_size:
+                self._layouts.popitem(last=False)
+
+        return bbox.frozen()
+
+    def clear(self):
+        """
+        Drop all cached layouts and reset the hit and miss counters
+        """
+        with self._lock:
+            self._layouts.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+LAYOUT_CACHE = LayoutCache()
+
+
+def get_layout_cache(layout_cache=True):
+    """
+    Resolve the layout cache to use
+
+    Parameters
+    ----------
+    layout_cache : bool | LayoutCache
+        True for the package wide LAYOUT_CACHE or a LayoutCache
+
+    Returns
+    -------
+    LayoutCache
+    """
+    if isinstance(layout_cache, LayoutCache):
+        return layout_cache
+
+    return LAYOUT_CACHE
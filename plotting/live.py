@@ -0,0 +1,455 @@
+"""
+Live line plots that append new points to the lines of a drawn figure
+"""
+import os
+import numpy as np
+from matplotlib.lines import Line2D
+from PIL import Image
+from plotting.dataframes import df_line_plot
+from plotting.points import line_plot
+from plotting.pool import agg_figure
+from plotting.styles import apply_style
+from plotting.writer import save_figure
+
+
+class RingBuffer:
+    """
+    Fixed capacity buffer of rows that keeps the most recent rows. Rows are
+    written twice, at i and i + capacity of a buffer of twice the capacity,
+    so the contents are always available as a contiguous view without
+    copying and appending costs O(rows appended).
+    """
+    def __init__(self, capacity, width=2, dtype=np.float64):
+        """
+        Parameters
+        ----------
+        capacity : int
+            Maximum number of rows kept
+        width : int, optional
+            Number of columns of each row, by default 2
+        dtype : numpy.dtype, optional
+            Data type of the rows, by default np.float64
+        """
+        if capacity < 1:
+            msg = 'capacity must be at least 1, not {}'.format(capacity)
+            raise ValueError(msg)
+
+        self._capacity = int(capacity)
+        self._data = np.empty((2 * self._capacity, width), dtype=dtype)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        """
+        Maximum number of rows kept
+
+        Returns
+        -------
+        int
+        """
+        return self._capacity
+
+    @property
+    def view(self):
+        """
+        Rows in the buffer, oldest first, as a view that is only valid
+        until the next extend
+
+        Returns
+        -------
+        ndarray
+            (len(self), width) array
+        """
+        return self._data[self._start:self._start + self._size]
+
+    def extend(self, rows):
+        """
+        Append rows, dropping the oldest rows past the capacity
+
+        Parameters
+        ----------
+        rows : ndarray
+            (n, width) rows to append
+        """
+        capacity = self._capacity
+        rows = np.asarray(rows, dtype=self._data.dtype)
+        rows = rows.reshape(-1, self._data.shape[1])[-capacity:]
+        n = len(rows)
+        idx = (self._start + self._size + np.arange(n)) % capacity
+        self._data[idx] = rows
+        self._data[idx + capacity] = rows
+        self._size += n
+        if self._size > capacity:
+            self._start = (self._start + self._size - capacity) % capacity
+            self._size = capacity
+
+
+class LivePlot:
+    """
+    Handle on a drawn line plot whose lines new points are appended to.
+    Each line keeps its most recent points in a RingBuffer. Appended points
+    are drawn on top of the rendered canvas as new segments, so a refresh
+    costs O(points appended). The figure is only fully redrawn when new
+    points fall outside the axis limits, which are then extended with some
+    headroom and moved up to the oldest point kept. Points dropped from the
+    buffers stay visible until the next full redraw.
+    """
+    def __init__(self, axis, capacity=10 ** 5, headroom=0.1):
+        """
+        Parameters
+        ----------
+        axis : matplotlib.axes.Axes
+            Drawn axis whose lines are extended, on an Agg canvas
+        capacity : int, optional
+            Number of points kept for each line, by default 10**5
+        headroom : float, optional
+            Fraction of the data range added past the new data when the
+            limits are extended, by default 0.1
+        """
+        self._axis = axis
+        self._fig = axis.figure
+        self._lines = list(axis.lines)
+        self._headroom = headroom
+        self._buffers = []
+        for line in self._lines:
+            buffer = RingBuffer(capacity)
+            buffer.extend(np.column_stack(
+                [self._convert(line.get_xdata(), 'x'),
+                 self._convert(line.get_ydata(), 'y')]))
+            self._buffers.append(buffer)
+
+        self._pending = [0] * len(self._lines)
+        self._stale = True
+        self.full_draws = 0
+        self.incremental_draws = 0
+
+    @property
+    def figure(self):
+        """
+        Figure of the live plot
+
+        Returns
+        -------
+        matplotlib.figure.Figure
+        """
+        return self._fig
+
+    @property
+    def axis(self):
+        """
+        Axis of the live plot
+
+        Returns
+        -------
+        matplotlib.axes.Axes
+        """
+        return self._axis
+
+    @property
+    def data(self):
+        """
+        Points kept for each line
+
+        Returns
+        -------
+        list
+            (n, 2) array of each line, oldest first
+        """
+        return [buffer.view.copy() for buffer in self._buffers]
+
+    def _convert(self, values, which):
+        """
+        Convert values to the float units the axis is drawn in, e.g.
+        datetimes to matplotlib dates
+
+        Parameters
+        ----------
+        values : array_like
+            x or y values
+        which : str
+            'x' or 'y'
+
+        Returns
+        -------
+        ndarray
+        """
+        axis = self._axis.xaxis if which == 'x' else self._axis.yaxis
+        values = axis.convert_units(np.asarray(values))
+
+        return np.asarray(values, dtype=np.float64)
+
+    def _extend_limits(self, lo, hi, limits, oldest=None):
+        """
+        New axis limits covering [lo, hi] with headroom on the side(s) that
+        were exceeded, or None if [lo, hi] is within limits
+
+        Parameters
+        ----------
+        lo : float
+            Minimum of the new values
+        hi : float
+            Maximum of the new values
+        limits : tuple
+            Current (min, max) limits
+        oldest : float, optional
+            Lower limit to move up to, the oldest x value kept,
+            by default None
+
+        Returns
+        -------
+        tuple | None
+        """
+        low, high = min(limits), max(limits)
+        if low <= lo and hi <= high:
+            return None
+
+        if oldest is not None:
+            low = min(oldest, lo)
+
+        span = max(hi, high) - min(lo, low)
+        pad = self._headroom * span
+        if lo < low:
+            low = lo - pad
+
+        if hi > high:
+            high = hi + pad
+
+        return (low, high)
+
+    def append(self, points, line=0):
+        """
+        Append points to a line
+
+        Parameters
+        ----------
+        points : ndarray
+            (n, 2) array of (x, y) points
+        line : int, optional
+            Index of the line to append to, by default 0
+        """
+        points = np.asarray(points)
+        if points.size == 0:
+            return
+
+        if points.ndim != 2 or points.shape[1] != 2:
+            msg = ('points must be an (n, 2) array, not shape {}'
+                   .format(points.shape))
+            raise ValueError(msg)
+
+        x = self._convert(points[:, 0], 'x')
+        y = self._convert(points[:, 1], 'y')
+        buffer = self._buffers[line]
+        buffer.extend(np.column_stack([x, y]))
+        self._pending[line] = min(self._pending[line] + len(x), len(buffer))
+
+        oldest = min(b.view[0, 0] for b in self._buffers if len(b))
+        xlim = self._extend_limits(x.min(), x.max(), self._axis.get_xlim(),
+                                   oldest=oldest)
+        ylim = self._extend_limits(y.min(), y.max(), self._axis.get_ylim())
+        if xlim is not None:
+            self._axis.set_xlim(xlim)
+            self._stale = True
+
+        if ylim is not None:
+            self._axis.set_ylim(ylim)
+            self._stale = True
+
+    def append_df(self, df):
+        """
+        Append the rows of a DataFrame, the index is x and each column is
+        appended to the line it was drawn as
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            New rows with the columns of the plotted DataFrame
+        """
+        for i, column in enumerate(df.columns):
+            self.append(np.column_stack([self._convert(df.index, 'x'),
+                                         df[column].to_numpy()]), line=i)
+
+    def _sync(self):
+        """
+        Set the data of each line to the points kept in its buffer
+        """
+        for line, buffer in zip(self._lines, self._buffers):
+            view = buffer.view
+            line.set_data(view[:, 0], view[:, 1])
+
+    def draw(self):
+        """
+        Render the appended points, as new segments on top of the canvas
+        or with a full redraw if the limits changed
+
+        Returns
+        -------
+        bool
+            True if the figure was fully redrawn
+        """
+        if self._stale:
+            self._sync()
+            self._fig.canvas.draw()
+            self._pending = [0] * len(self._lines)
+            self._stale = False
+            self.full_draws += 1
+
+            return True
+
+        renderer = self._fig.canvas.get_renderer()
+        for i, (line, buffer) in enumerate(zip(self._lines, self._buffers)):
+            if not self._pending[i]:
+                continue
+
+            # connect the new points to the last point already drawn
+            view = buffer.view[-(self._pending[i] + 1):]
+            segment = Line2D(view[:, 0], view[:, 1])
+            segment.update_from(line)
+            segment.set_figure(self._fig)
+            segment.set_transform(self._axis.transData)
+            segment.set_clip_path(self._axis.patch)
+            segment.draw(renderer)
+            self._pending[i] = 0
+
+        self.incremental_draws += 1
+
+        return False
+
+    def to_rgba(self):
+        """
+        Draw and return the rendered pixels
+
+        Returns
+        -------
+        ndarray
+            (height, width, 4) uint8 view of the Agg canvas buffer, only
+            valid until the next draw
+        """
+        self.draw()
+
+        return np.asarray(self._fig.canvas.buffer_rgba())
+
+    def save(self, filename, **kwargs):
+        """
+        Draw and save the figure. PNG files are written straight from the
+        rendered canvas without redrawing the figure, other formats are
+        saved with plotting.writer.save_figure
+
+        Parameters
+        ----------
+        filename : str | os.PathLike
+            Name of file/path to save the figure to
+        kwargs : dict
+            kwargs for plotting.writer.save_figure, ignored for PNG
+        """
+        if os.path.splitext(filename)[1].lower() == '.png':
+            Image.fromarray(self.to_rgba()).save(filename)
+        else:
+            self._sync()
+            save_figure(self._fig, filename, **kwargs)
+
+
+def _live_plot(plot_func, *args, capacity=10 ** 5, headroom=0.1,
+               figsize=(6, 4), dpi=100, **kwargs):
+    """
+    Draw plot_func on a new Agg figure and return a LivePlot of it
+
+    Parameters
+    ----------
+    plot_func : function
+        plotting.line_plot or plotting.df_line_plot
+    * args
+        Args for plot_func
+    capacity : int, optional
+        Number of points kept for each line, by default 10**5
+    headroom : float, optional
+        Fraction of the data range added past the new data when the limits
+        are extended, by default 0.1
+    figsize : tuple, optional
+        Width and height of figure, by default (6, 4)
+    dpi : int, optional
+        DPI resolution of figure, by default 100
+    kwargs : dict
+        kwargs for plot_func and plotting_base
+
+    Returns
+    -------
+    LivePlot
+    """
+    apply_style()
+    fig = agg_figure(figsize=figsize, dpi=dpi)
+    axis = fig.add_subplot(111)
+    plot_func(*args, ax=axis, **kwargs)
+    fig.tight_layout()
+    axis.set_autoscale_on(False)
+
+    return LivePlot(axis, capacity=capacity, headroom=headroom)
+
+
+def live_line_plot(*lines, **kwargs):
+    """
+    line_plot returning a LivePlot handle to append new points with
+
+    Parameters
+    ----------
+    lines : ndarray
+        One or more nx2 arrays of (x, y) points
+    capacity : int, optional
+        Number of points kept for each line, by default 10**5
+    headroom : float, optional
+        Fraction of the data range added past the new data when the limits
+        are extended, by default 0.1
+    figsize : tuple, optional
+        Width and height of figure, by default (6, 4)
+    dpi : int, optional
+        DPI resolution of figure, by default 100
+    kwargs : dict
+        kwargs for plotting.line_plot and plotting_base
+
+    Returns
+    -------
+    LivePlot
+
+    See Also
+    --------
+    plotting.points.line_plot : plotting function
+    """
+    return _live_plot(line_plot, *lines, **kwargs)
+
+
+def live_df_line_plot(df, **kwargs):
+    """
+    df_line_plot returning a LivePlot handle to append new rows with
+    LivePlot.append_df, the index is drawn with matplotlib's units
+    (x_compat=True) so appended datetimes line up with the drawn ones
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame of data to plot, one line per column
+    capacity : int, optional
+        Number of rows kept for each column, by default 10**5
+    headroom : float, optional
+        Fraction of the data range added past the new data when the limits
+        are extended, by default 0.1
+    figsize : tuple, optional
+        Width and height of figure, by default (6, 4)
+    dpi : int, optional
+        DPI resolution of figure, by default 100
+    kwargs : dict
+        kwargs for plotting.df_line_plot and plotting_base
+
+    Returns
+    -------
+    LivePlot
+
+    See Also
+    --------
+    plotting.dataframes.df_line_plot : plotting function
+    """
+    kwargs.setdefault('x_compat', True)
+
+    return _live_plot(df_line_plot, df, **kwargs)
@@ -2,28 +2,26 @@
 Line plots in matplotlib
 """
 import itertools
+import matplotlib as mpl
+from matplotlib.collections import LineCollection
+import matplotlib.colors as mcolors
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
-from plotting.base import plotting_base
-
-COLORS = {
-    "red": (0.7176, 0.1098, 0.1098),
-    "green": (0.65 * 0.298, 0.65 * 0.6863, 0.65 * 0.3137),
-    "blue": (0.9 * 0.0824, 0.9 * 0.3961, 0.9 * 0.7529),
-    "orange": (0.85 * 1.0, 0.85 * 0.5961, 0.0),
-    "purple": (0.49412, 0.3412, 0.7608),
-    "grey": (0.45, 0.45, 0.45),
-    "cyan": (0.0, 0.7373, 0.8314),
-    "teal": (0.0, 0.5882, 0.5333),
-    "lime": (0.8039, 0.8627, 0.2235),
-    "brown": (0.4745, 0.3333, 0.2824),
-    "black": (0.0, 0.0, 0.0),
-    "white": (1.0, 1.0, 1.0)
-}
-LINESTYLES = ('-', '--', '-.', ':')
-MARKERS = (u'o', u'v', u'^', u'<', u'>', u'8', u's', u'p', u'*', u'h', u'H',
-           u'D', u'd')
+from plotting.base import figure_buffer, plotting_base
+from plotting.binning import density_plot, StreamingHistogram
+from plotting.decimate import (axis_pixel_width, decimate_line,
+                               source_x_range, stream_decimate)
+from plotting.kde import distribution_plot
+from plotting.pool import agg_figure
+from plotting.rc import with_rc
+from plotting.writer import save_figure
+from plotting.sources import CHUNKSIZE, is_chunked, iter_chunks
+from plotting.styles import COLORS, LINESTYLES, MARKERS, riffle_lines
+from plotting.timing import PhaseTimer
+
+# linestyles that draw no line
+NO_LINESTYLES = ('', ' ', 'None', 'none', None)
 
 
 def get_colors(color_palette=None):
@@ -74,23 +72,6 @@ def get_COLORS(colors, n=None):
     return [COLORS[color] for color in colors]
 
 
-def riffle_lines(*lines):
-    """
-    Riffle lines together to plot in alternating order
-
-    Parameters
-    ----------
-    *lines : Tuple
-        set of lists to be riffled together
-
-    Returns
-    -------
-    list
-        Flattened list of lists such that entries are riffled
-    """
-    return [item for sublist in zip(*lines) for item in sublist]
-
-
 def get_line_styles(colors=None, linestyles=None, markers=None):
     """
     Extract line styles (color, linestyle, markers)
@@ -132,6 +113,88 @@ def get_line_styles(colors=None, linestyles=None, markers=None):
     return colors, linestyles, markers
 
 
+def linestyle_groups(n, linestyles='Automatic'):
+    """
+    Group lines by linestyle the way line_collections draws them, lines
+    without a linestyle ('', ' ', 'None' or None) are not drawn, as with
+    matplotlib.pyplot.plot
+
+    Parameters
+    ----------
+    n : int
+        Number of lines
+    linestyles : str | list, optional
+        Linestyle or list of linestyles to use, by default 'Automatic'
+
+    Returns
+    -------
+    dict
+        Index of the lines drawn with each linestyle, in drawing order
+    """
+    _, linestyles, _ = get_line_styles(linestyles=linestyles)
+    groups = {}
+    for i, style in enumerate(itertools.islice(linestyles, n)):
+        if style in NO_LINESTYLES:
+            continue
+
+        groups.setdefault(style, []).append(i)
+
+    return groups
+
+
+def line_collections(axis, lines, colors=None, linestyles='Automatic',
+                     linewidth=2, alpha=1.0, cmap=None):
+    """
+    Draw lines as one LineCollection per linestyle instead of one Line2D per
+    line, lines without a linestyle are not drawn, see linestyle_groups
+
+    Parameters
+    ----------
+    axis : matplotlib.axes.Axes
+        Axis to draw on
+    lines : list
+        List of nx2 arrays
+    colors : str | list, optional
+        color or list of colors to use for lines, by default None
+    linestyles : str | list, optional
+        Linestyle or list of linestyles to use, by default 'Automatic'
+    linewidth : int, optional
+        width of lines, by default 2
+    alpha : float | list, optional
+        Opacity of list of opacities for lines, by default 1.0
+    cmap : str | matplotlib.colors.Colormap, optional
+        Colormap to sample a color for each line from, overrides colors,
+        by default None
+
+    Returns
+    -------
+    list
+        LineCollection for each linestyle
+    """
+    n = len(lines)
+    colors, _, _ = get_line_styles(colors=colors)
+    if cmap is not None:
+        rgba = mpl.colormaps.get_cmap(cmap)(np.linspace(0, 1, n))
+    else:
+        rgba = mcolors.to_rgba_array(list(itertools.islice(colors, n)))
+
+    if not isinstance(alpha, (list, tuple)):
+        alpha = (alpha,)
+
+    rgba[:, 3] = np.resize(alpha, n)
+
+    collections = []
+    for style, idx in linestyle_groups(n, linestyles=linestyles).items():
+        lc = LineCollection([lines[i] for i in idx], colors=rgba[idx],
+                            linestyles=style, linewidths=linewidth)
+        axis.add_collection(lc)
+        collections.append(lc)
+
+    axis.autoscale_view()
+
+    return collections
+
+
 def line_plot(*lines, **kwargs):
     """
     Point / line plot
@@ -139,7 +202,11 @@ def line_plot(*lines, **kwargs):
     Parameters
     ----------
     lines : ndarray, shape(line) = (n,2)
-        each line in lines must be a nx2 array or nx2 list
+        each line in lines must be a nx2 array or nx2 list, or a chunked
+        source of nx2 rows with ascending x: np.memmap, .npy/.npz path,
+        h5py.Dataset or iterator of chunks. Chunked sources are streamed
+        through min/max decimation at the axis pixel width and never loaded
+        whole
     colors : str | list, optional
         color or list of colors to use for lines, by default None
     linestyles : str | list, optional
@@ -154,6 +221,20 @@ def line_plot(*lines, **kwargs):
         Marker edge style, by default ['k', 0.5]
     alpha : float | list, optional
         Opacity of list of opacities for lines, by default 1.0
+    decimate : str, optional
+        Reduce each line to the samples visible at the axis pixel width
+        before plotting, 'minmax' to keep the min and max of each pixel
+        column or 'lttb' for Largest-Triangle-Three-Buckets. x values must be
+        ascending, by default None
+    collection : bool, optional
+        Draw all lines as one LineCollection per linestyle rather than one
+        artist per line, markers are not drawn, by default False
+    cmap : str, optional
+        Colormap to sample line colors from in collection mode,
+        by default None
+    chunksize : int, optional
+        Number of rows read at a time from chunked sources,
+        by default 2**20
     kwargs : dict
         kwargs for plotting_base
 
@@ -161,12 +242,37 @@ def line_plot(*lines, **kwargs):
     --------
     matplotlib.pyplot.plot : plotting function
 
+    plotting.points.line_collections : collection plotting function
+    plotting.decimate.decimate_line : decimation
+    plotting.decimate.stream_decimate : chunked decimation
+
     plotting.base.plotting_base : plotting base
     """
     def plot_func(axis, *lines,
                   colors=None, linestyles='Automatic', linewidth=2,
                   markers=None, markersize=5, markeredge=['k', 0.5],
-                  alpha=1.0):
+                  alpha=1.0, decimate=None, collection=False, cmap=None,
+                  chunksize=CHUNKSIZE):
+        n_pixels = axis_pixel_width(axis)
+        arrays = []
+        for line in lines:
+            if is_chunked(line):
+                line = stream_decimate(line, n_pixels, chunksize=chunksize)
+            else:
+                if not isinstance(line, np.ndarray):
+                    line = np.array(line)
+
+                if decimate is not None:
+                    line = decimate_line(line, n_pixels, method=decimate)
+
+            arrays.append(line)
+
+        if collection:
+            line_collections(axis, arrays, colors=colors,
+                             linestyles=linestyles, linewidth=linewidth,
+                             alpha=alpha, cmap=cmap)
+            return
+
         colors, linestyles, markers = get_line_styles(colors=colors,
                                                       linestyles=linestyles,
                                                       markers=markers)
@@ -187,16 +293,13 @@ def line_plot(*lines, **kwargs):
 
         alpha = itertools.cycle(alpha)
 
-        for line in lines:
-            if not isinstance(line, np.ndarray):
-                line = np.array(line)
-
+        for line in arrays:
             axis.plot(line[:, 0], line[:, 1],
                       markersize=next(markersize), marker=next(markers),
                       mec=mec, mew=mew, color=next(colors), alpha=next(alpha),
                       linestyle=next(linestyles), linewidth=linewidth)
 
-    plotting_base(plot_func, *lines, **kwargs)
+    return plotting_base(plot_func, *lines, **kwargs)
 
 
 def error_plot(data_error, **kwargs):
@@ -205,8 +308,11 @@ def error_plot(data_error, **kwargs):
 
     Parameters
     ----------
-    data_error : ndarray, shape(data[i]) = (n,2)
-        Either a tuple or list of nx2 arrays or a single nx2 array.
+    data_error : list
+        List of (data, error) pairs of nx2 arrays, or of chunked sources
+        (np.memmap, .npy/.npz path, h5py.Dataset or iterator of chunks)
+        which are streamed through min/max decimation of the data at the
+        axis pixel width, carrying the errors of the rows kept
     colors : str | list, optional
         color or list of colors to use for lines, by default None
     linestyles : str | list, optional
@@ -221,6 +327,12 @@ def error_plot(data_error, **kwargs):
         Marker size, by default 5
     markeredge : list, optional
         Marker edge style, by default ['k', 0.5]
+    decimate : str, optional
+        Reduce each in memory series to the samples visible at the axis
+        pixel width, 'minmax' or 'lttb', by default None
+    chunksize : int, optional
+        Number of rows read at a time from chunked sources,
+        by default 2**20
     kwargs : dict
         kwargs for plotting_base
 
@@ -228,14 +340,18 @@ def error_plot(data_error, **kwargs):
     --------
     matplotlib.pyplot.errorbar : plotting function
 
+    plotting.decimate.stream_decimate : chunked decimation
+
     plotting.base.plotting_base : plotting base
     """
     def plot_func(axis, data_error, colors=None, linestyles='Automatic',
                   linewidth=2, capsize=6, markers=None, markersize=5,
-                  markeredge=['k', 0.5]):
+                  markeredge=['k', 0.5], decimate=None, chunksize=CHUNKSIZE):
         msg = 'Input data needs to be in (data, error) pairs'
         assert isinstance(data_error, (list, tuple)), msg
 
+        n_pixels = axis_pixel_width(axis)
+
         colors, linestyles, markers = get_line_styles(colors=colors,
                                                       linestyles=linestyles,
                                                       markers=markers)
@@ -247,6 +363,18 @@ def error_plot(data_error, **kwargs):
             mew = None
 
         for data, error in data_error:
+            if is_chunked(data) or is_chunked(error):
+                chunks = (np.column_stack(pair) for pair in
+                          zip(iter_chunks(data, chunksize=chunksize),
+                              iter_chunks(error, chunksize=chunksize)))
+                rows = stream_decimate(chunks, n_pixels,
+                                       x_range=source_x_range(data))
+                data, error = rows[:, :2], rows[:, 2:]
+            elif decimate is not None:
+                rows = decimate_line(np.column_stack([data, error]),
+                                     n_pixels, method=decimate)
+                data, error = rows[:, :2], rows[:, 2:]
+
             x = data[:, 0]
             x_error = error[:, 0]
             if np.isnan(x_error).all():
@@ -263,9 +391,10 @@ def error_plot(data_error, **kwargs):
                           linestyle=next(linestyles), mec=mec, mew=mew,
                           capsize=capsize, capthick=linewidth)
 
-    plotting_base(plot_func, data_error, **kwargs)
+    return plotting_base(plot_func, data_error, **kwargs)
 
 
+@with_rc
 def dual_plot(data1, data2,
               xlabel=None, ylabel=None, xlim=None, ylim=None,
               xticks=None, yticks=None, ticksize=(6, 1),
@@ -273,7 +402,8 @@ def dual_plot(data1, data2,
               colors=None, linestyles='Automatic', linewidth=1,
               markers=None, markersize=5, markeredge=['k', 0.5],
               fontsize=16, borderwidth=1, title=None,
-              legend=None, figsize=(6, 5), dpi=100, filename=None):
+              legend=None, figsize=(6, 5), dpi=100, filename=None,
+              buffer=None, rc=None):
     """
     Dual axis plot
 
@@ -335,8 +465,24 @@ def dual_plot(data1, data2,
         Width and height of figure
     dpi : int
         DPI resolution of figure.
-    filename : str
-        Name of file/path to save the figure to.
+    filename : str | list
+        Name of file/path to save the figure to, or list of files/paths to
+        save the same drawn figure to in several formats.
+    buffer : str, optional
+        Return the rendered figure from memory instead of displaying it,
+        'png', 'svg', 'pdf' or 'rgba', by default None
+    rc : dict, optional
+        rcParams to render with, applied with matplotlib.rc_context for
+        the duration of the call, by default None
+
+    Returns
+    -------
+    bytes | ndarray | None
+        Rendered figure if buffer is not None
+
+    See Also
+    --------
+    plotting.base.figure_buffer : in memory rendering
     """
     if not isinstance(data1, (list, tuple)):
         lines1 = (data1,)
@@ -409,104 +555,127 @@ def dual_plot(data1, data2,
         mec = None
         mew = None
 
-    fig = plt.figure(figsize=figsize, dpi=dpi)
-    axis1 = fig.add_subplot(111)
-
-    if title is not None:
-        axis1.set_title(title, fontsize=fontsize + 2)
-
-    for line in lines1:
-        axis1.plot(line[:, 0], line[:, 1], linewidth=linewidth,
-                   markersize=markersize, marker=next(markers1),
-                   color=next(colors1), linestyle=next(linestyles1),
-                   mec=mec, mew=mew)
-
-    axis2 = axis1.twinx()
+    timer = PhaseTimer('dual_plot')
+    with timer.phase('figure'):
+        if buffer is not None or filename is not None:
+            fig = agg_figure(figsize=figsize, dpi=dpi)
+        else:
+            fig = plt.figure(figsize=figsize, dpi=dpi)
+
+        axis1 = fig.add_subplot(111)
+
+    with timer.phase('plot'):
+        for line in lines1:
+            axis1.plot(line[:, 0], line[:, 1], linewidth=linewidth,
+                       markersize=markersize, marker=next(markers1),
+                       color=next(colors1), linestyle=next(linestyles1),
+                       mec=mec, mew=mew)
+
+        axis2 = axis1.twinx()
+
+        for line in lines2:
+            axis2.plot(line[:, 0], line[:, 1], linewidth=linewidth,
+                       markersize=markersize, marker=next(markers2),
+                       color=next(colors2), linestyle=next(linestyles2),
+                       mec=mec, mew=mew)
+
+    with timer.phase('format'):
+        # update plot labels and format based on user input
+        if title is not None:
+            axis1.set_title(title, fontsize=fontsize + 2)
+
+        for ax in ['top', 'bottom', 'left', 'right']:
+            axis1.spines[ax].set_linewidth(borderwidth)
+            axis2.spines[ax].set_linewidth(borderwidth)
+
+        if xlabel is not None:
+            axis1.set_xlabel(xlabel, fontsize=fontsize)
+
+        if ylabel is not None:
+            if len(ylabel) == 1:
+                axis1.set_ylabel(ylabel, fontsize=fontsize,
+                                 color=axis_color1)
+                axis2.set_ylabel(ylabel, fontsize=fontsize,
+                                 color=axis_color2)
+            else:
+                axis1.set_ylabel(ylabel[0], fontsize=fontsize,
+                                 color=axis_color1)
+                axis2.set_ylabel(ylabel[1], fontsize=fontsize,
+                                 color=axis_color2)
+
+        if xlim is not None:
+            axis1.set_xlim(xlim)
+
+        if ylim is not None:
+            if len(np.asarray(ylim).shape) == 1:
+                axis1.set_ylim(ylim)
+                axis2.set_ylim(ylim)
+            else:
+                axis1.set_ylim(ylim[0])
+                axis2.set_ylim(ylim[1])
+
+        if xticks is not None:
+            axis1.set_xticks(xticks)
+            if xtick_labels is not None:
+                axis1.set_xticklabels(xtick_labels)
+
+        if yticks is not None:
+            if len(np.asarray(yticks).shape) == 1:
+                axis1.set_set_yticks(yticks)
+                axis2.set_set_yticks(yticks)
+            else:
+                axis1.set_set_yticks(yticks[0])
+                axis2.set_set_yticks(yticks[1])
+            if ytick_labels is not None:
+                if len(np.asarray(ytick_labels).shape) == 1:
+                    axis1.set_set_yticklabels(ytick_labels)
+                    axis2.set_set_yticklabels(ytick_labels)
+                else:
+                    axis1.set_set_yticklabels(ytick_labels[0])
+                    axis2.set_set_yticklabels(ytick_labels[1])
+
+        axis1.tick_params(axis='x', labelsize=fontsize - 2, width=ticksize[1],
+                          length=ticksize[0], color='k')
+        axis1.tick_params(axis='y', labelsize=fontsize - 2, width=ticksize[1],
+                          length=ticksize[0], color=axis_color1)
+        axis2.tick_params(axis='y', labelsize=fontsize - 2, width=ticksize[1],
+                          length=ticksize[0], color=axis_color2)
+
+        if len(axis_colors) == 2:
+            for tl in axis1.get_yticklabels():
+                tl.set_color(axis_colors[0])
+            for t2 in axis2.get_yticklabels():
+                t2.set_color(axis_colors[1])
 
-    for line in lines2:
-        axis2.plot(line[:, 0], line[:, 1], linewidth=linewidth,
-                   markersize=markersize, marker=next(markers2),
-                   color=next(colors2), linestyle=next(linestyles2),
-                   mec=mec, mew=mew)
+    if legend:
+        with timer.phase('legend'):
+            if isinstance(legend, list):
+                axis2.legend(legend, bbox_to_anchor=(1.05, 1), loc=2,
+                             borderaxespad=0., prop={'size': fontsize - 2})
+            else:
+                axis2.legend(bbox_to_anchor=(1.05, 1), loc=2,
+                             borderaxespad=0., prop={'size': fontsize - 2})
 
-    # update plot labels and format based on user input
-    for ax in ['top', 'bottom', 'left', 'right']:
-        axis1.spines[ax].set_linewidth(borderwidth)
-        axis2.spines[ax].set_linewidth(borderwidth)
+    with timer.phase('layout'):
+        fig.tight_layout()
 
-    if xlabel is not None:
-        axis1.set_xlabel(xlabel, fontsize=fontsize)
+    with timer.phase('save'):
+        if filename is not None:
+            save_figure(fig, filename, dpi=dpi, transparent=True)
 
-    if ylabel is not None:
-        if len(ylabel) == 1:
-            axis1.set_ylabel(ylabel, fontsize=fontsize, color=axis_color1)
-            axis2.set_ylabel(ylabel, fontsize=fontsize, color=axis_color2)
-        else:
-            axis1.set_ylabel(ylabel[0], fontsize=fontsize,
-                             color=axis_color1)
-            axis2.set_ylabel(ylabel[1], fontsize=fontsize,
-                             color=axis_color2)
-
-    if xlim is not None:
-        axis1.set_xlim(xlim)
-
-    if ylim is not None:
-        if len(np.asarray(ylim).shape) == 1:
-            axis1.set_ylim(ylim)
-            axis2.set_ylim(ylim)
-        else:
-            axis1.set_ylim(ylim[0])
-            axis2.set_ylim(ylim[1])
-
-    if xticks is not None:
-        axis1.set_xticks(xticks)
-        if xtick_labels is not None:
-            axis1.set_xticklabels(xtick_labels)
-
-    if yticks is not None:
-        if len(np.asarray(yticks).shape) == 1:
-            axis1.set_set_yticks(yticks)
-            axis2.set_set_yticks(yticks)
-        else:
-            axis1.set_set_yticks(yticks[0])
-            axis2.set_set_yticks(yticks[1])
-        if ytick_labels is not None:
-            if len(np.asarray(ytick_labels).shape) == 1:
-                axis1.set_set_yticklabels(ytick_labels)
-                axis2.set_set_yticklabels(ytick_labels)
-            else:
-                axis1.set_set_yticklabels(ytick_labels[0])
-                axis2.set_set_yticklabels(ytick_labels[1])
-
-    axis1.tick_params(axis='x', labelsize=fontsize - 2, width=ticksize[1],
-                      length=ticksize[0], color='k')
-    axis1.tick_params(axis='y', labelsize=fontsize - 2, width=ticksize[1],
-                      length=ticksize[0], color=axis_color1)
-    axis2.tick_params(axis='y', labelsize=fontsize - 2, width=ticksize[1],
-                      length=ticksize[0], color=axis_color2)
-
-    if len(axis_colors) == 2:
-        for tl in axis1.get_yticklabels():
-            tl.set_color(axis_colors[0])
-        for t2 in axis2.get_yticklabels():
-            t2.set_color(axis_colors[1])
+        out = None
+        if buffer is not None:
+            out = figure_buffer(fig, buffer, dpi=dpi, transparent=True,
+                                bbox_inches='tight')
 
-    if legend:
-        if isinstance(legend, list):
-            plt.legend(legend, bbox_to_anchor=(1.05, 1), loc=2,
-                       borderaxespad=0., prop={'size': fontsize - 2})
-        else:
-            plt.legend(bbox_to_anchor=(1.05, 1), loc=2,
-                       borderaxespad=0., prop={'size': fontsize - 2})
+    if buffer is None and filename is None:
+        with timer.phase('show'):
+            plt.show()
+            plt.close(fig)
 
-    fig.tight_layout()
-    if filename is not None:
-        plt.savefig(filename, dpi=dpi, transparent=True,
-                    bbox_inches='tight')
-    else:
-        plt.show()
+    timer.finish()
 
-    plt.close()
+    return out
 
 
 def hist_plot(*arrays, colors=None, **kwargs):
@@ -515,8 +684,12 @@ def hist_plot(*arrays, colors=None, **kwargs):
 
     Parameters
     ----------
-    arrays : ndarray
-        nx1 array (or arrays) of data to create histogram from
+    arrays : ndarray | np.memmap | str | iterable | StreamingHistogram
+        nx1 array (or arrays) of data to create histogram from. np.memmaps,
+        .npy/.npz paths, h5py.Datasets and iterators of chunks are binned one
+        chunk at a time with fixed edges (from bins and range, or a first
+        pass over the min and max) and pre-computed StreamingHistograms are
+        drawn as is
     colors : list | str
         Color palette or list of colors to use
     kwargs : dict
@@ -525,21 +698,34 @@ def hist_plot(*arrays, colors=None, **kwargs):
     See Also
     --------
     matplotlib.pyplot.hist : plotting function
+    matplotlib.pyplot.stairs : plotting function
 
+    plotting.binning.StreamingHistogram : streaming histogram
     plotting.base.plotting_base : plotting base
     """
-    def plot_func(axis, *arrays, colors=None, **kwargs):
+    def plot_func(axis, *arrays, colors=None, legend=None, **kwargs):
         colors = get_colors(color_palette=colors)
 
         for arr in arrays:
-            axis.hist(arr, color=next(colors), **kwargs)
+            if isinstance(arr, StreamingHistogram) or is_chunked(arr):
+                hist_kwargs = kwargs.copy()
+                bins = hist_kwargs.pop('bins', 10)
+                hist_range = hist_kwargs.pop('range', None)
+                if not isinstance(arr, StreamingHistogram):
+                    arr = StreamingHistogram.from_source(arr, bins=bins,
+                                                         range=hist_range)
+
+                arr.plot(axis, color=next(colors), **hist_kwargs)
+            else:
+                axis.hist(arr, color=next(colors), **kwargs)
 
-    plotting_base(plot_func, *arrays, colors=colors, legend=None, **kwargs)
+    return plotting_base(plot_func, *arrays, colors=colors, legend=None,
+                         **kwargs)
 
 
-def sns_hist_plot(*arrays, colors=None, **kwargs):
+def sns_hist_plot(*arrays, colors=None, engine='native', **kwargs):
     """
-    Histogram plot using seaborn's distplot
+    Histogram plot with a kernel density estimate, a la seaborn's distplot
 
     Parameters
     ----------
@@ -547,48 +733,80 @@ def sns_hist_plot(*arrays, colors=None, **kwargs):
         nx1 array (or arrays) of data to create histogram from
     colors : list | str
         Color palette or list of colors to use
+    engine : str, optional
+        'native' to use the binned FFT kernel density estimate, whose cost
+        depends on the grid size rather than the number of samples, or
+        'seaborn' to use seaborn.distplot, by default 'native'
     kwargs : dict
-        kwargs for seaborn.distplot or plotting_base
+        kwargs for plotting.kde.distribution_plot (seaborn.distplot) or
+        plotting_base
 
     See Also
     --------
+    plotting.kde.distribution_plot : plotting function
     seaborn.distplot : plotting function
 
     plotting.base.plotting_base : plotting base
     """
-    def plot_func(axis, *arrays, colors=None, **kwargs):
+    def plot_func(axis, *arrays, colors=None, engine='native', legend=None,
+                  **kwargs):
         colors = get_colors(color_palette=colors)
 
         for arr in arrays:
-            sns.distplot(arr, color=next(colors), ax=axis, **kwargs)
+            if engine == 'native':
+                distribution_plot(axis, arr, color=next(colors), **kwargs)
+            elif engine == 'seaborn':
+                sns.distplot(arr, color=next(colors), ax=axis, **kwargs)
+            else:
+                raise ValueError('engine must be "native" or "seaborn"')
 
-    plotting_base(plot_func, *arrays, colors=colors, legend=None, **kwargs)
+    return plotting_base(plot_func, *arrays, colors=colors, engine=engine,
+                         legend=None, **kwargs)
 
 
-def scatter_plot(x, y, colorbar=False, **kwargs):
+def scatter_plot(x, y, colorbar=False, density=False, **kwargs):
     """
     scatter plot based on matplotlib.pyplot.scatter
 
     Parameters
     ----------
-    x : ndarray
-        vector of x values
-    y : ndarray
-        vector of y values
+    x : ndarray | str | h5py.Dataset | iterable
+        vector of x values, or a chunked source (np.memmap, .npy/.npz path,
+        h5py.Dataset or iterator of chunks) which is always drawn as a
+        density binned one chunk at a time
+    y : ndarray | str | h5py.Dataset | iterable
+        vector or chunked source of y values in step with x
     colorbar : bool, optional
         Flag to add colorbar, by default False
+    density : bool | str, optional
+        Bin the points into a pixel grid and draw it as a single image
+        instead of one marker per point. Either True or the aggregation to
+        apply to the points in each pixel: 'count', or 'sum', 'mean', 'min',
+        'max' of the values in c, by default False
     kwargs : dict
-        kwargs for matplotlib.pyplot.scatter and plotting_base
+        kwargs for matplotlib.pyplot.scatter (matplotlib.pyplot.imshow if
+        density, marker kwargs such as s and marker are then ignored) and
+        plotting_base
 
     See Also
     --------
     matplotlib.pyplot.scatter : plotting function
 
+    plotting.binning.density_plot : density plotting function
     plotting.base.plotting_base : plotting base
     """
-    def plot_func(axis, x, y, colorbar=False, **kwargs):
-        cbar = axis.scatter(x, y, **kwargs)
-        if colorbar:
-            plt.colorbar(cbar)
+    def plot_func(axis, x, y, colorbar=False, density=False, **kwargs):
+        if is_chunked(x) and not density:
+            density = True
+
+        if density:
+            agg = None if density is True else density
+            density_plot(axis, x, y, values=kwargs.pop('c', None), agg=agg,
+                         colorbar=colorbar, **kwargs)
+        else:
+            cbar = axis.scatter(x, y, **kwargs)
+            if colorbar:
+                axis.figure.colorbar(cbar, ax=axis)
 
-    plotting_base(plot_func, x, y, colorbar=colorbar, **kwargs)
+    return plotting_base(plot_func, x, y, colorbar=colorbar, density=density,
+                         **kwargs)
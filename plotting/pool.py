@@ -0,0 +1,158 @@
+"""
+Pool of reusable Agg figures to avoid pyplot figure setup and teardown
+"""
+from collections import defaultdict
+import threading
+import matplotlib as mpl
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+SUBPLOT_PARAMS = ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+
+
+def agg_figure(figsize=(6, 4), dpi=100):
+    """
+    Create a Figure attached to a FigureCanvasAgg without going through pyplot
+
+    Parameters
+    ----------
+    figsize : tuple, optional
+        Width and height of figure, by default (6, 4)
+    dpi : int, optional
+        DPI resolution of figure, by default 100
+
+    Returns
+    -------
+    matplotlib.figure.Figure
+        Empty figure attached to a FigureCanvasAgg
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+
+    return fig
+
+
+class FigurePool:
+    """
+    Warm set of Agg Figure/FigureCanvasAgg pairs keyed by (figsize, dpi)
+
+    Figures are created without pyplot, so they are never registered with
+    pyplot's figure manager and can not be displayed with plt.show().
+    """
+    def __init__(self, max_idle=4):
+        """
+        Parameters
+        ----------
+        max_idle : int, optional
+            Maximum number of idle figures kept for each (figsize, dpi),
+            by default 4
+        """
+        self._max_idle = max_idle
+        self._idle = defaultdict(list)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    @property
+    def idle(self):
+        """
+        Number of idle figures in the pool
+
+        Returns
+        -------
+        int
+        """
+        with self._lock:
+            return sum(len(figs) for figs in self._idle.values())
+
+    @staticmethod
+    def _key(figsize, dpi):
+        """
+        Pool key for given figure size and resolution
+
+        Parameters
+        ----------
+        figsize : tuple
+            Width and height of figure
+        dpi : int
+            DPI resolution of figure
+
+        Returns
+        -------
+        tuple
+            ((width, height), dpi)
+        """
+        return (tuple(float(s) for s in figsize), float(dpi))
+
+    @staticmethod
+    def _reset(fig):
+        """
+        Clear figure and restore the default subplot parameters
+
+        Parameters
+        ----------
+        fig : matplotlib.figure.Figure
+            Figure to reset
+        """
+        fig.clear()
+        fig.subplots_adjust(**{p: mpl.rcParams['figure.subplot.' + p]
+                               for p in SUBPLOT_PARAMS})
+
+    def acquire(self, figsize=(6, 4), dpi=100):
+        """
+        Check out a clean figure from the pool, creating one if needed
+
+        Parameters
+        ----------
+        figsize : tuple, optional
+            Width and height of figure, by default (6, 4)
+        dpi : int, optional
+            DPI resolution of figure, by default 100
+
+        Returns
+        -------
+        matplotlib.figure.Figure
+            Empty figure attached to a FigureCanvasAgg
+        """
+        key = self._key(figsize, dpi)
+        with self._lock:
+            idle = self._idle[key]
+            if idle:
+                self.reused += 1
+                return idle.pop()
+
+            self.created += 1
+
+        fig = agg_figure(figsize=figsize, dpi=dpi)
+        fig._pool_key = key
+
+        return fig
+
+    def release(self, fig):
+        """
+        Clear figure and return it to the pool
+
+        Parameters
+        ----------
+        fig : matplotlib.figure.Figure
+            Figure previously returned by acquire
+        """
+        self._reset(fig)
+        key = getattr(fig, '_pool_key', None)
+        if key is None:
+            return
+
+        with self._lock:
+            idle = self._idle[key]
+            if len(idle) < self._max_idle:
+                idle.append(fig)
+
+    def clear(self):
+        """
+        Drop all idle figures
+        """
+        with self._lock:
+            self._idle.clear()
+
+
+FIGURE_POOL = FigurePool()
@@ -0,0 +1,159 @@
+"""
+Per-call rcParams styling that is safe to use from several threads
+"""
+from contextlib import contextmanager
+import functools
+import threading
+import matplotlib as mpl
+from plotting.styles import apply_style
+
+
+class RenderLock:
+    """
+    Readers-writer lock around matplotlib's global rcParams. Renders with
+    the default styling hold it shared and run concurrently, renders that
+    temporarily change rcParams hold it exclusively so no other render sees
+    their styling. Waiting exclusive holders block new shared holders so
+    they are not starved. The lock is reentrant per thread, an exclusive
+    request from a thread holding it shared releases the shared hold while
+    it waits and re-acquires it afterwards.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    @property
+    def _mode(self):
+        """
+        How the current thread holds the lock
+
+        Returns
+        -------
+        str | None
+            'shared', 'exclusive' or None if it is not held
+        """
+        return getattr(self._local, 'mode', None)
+
+    @property
+    def held(self):
+        """
+        Whether the current thread holds the lock, shared or exclusively
+
+        Returns
+        -------
+        bool
+        """
+        return self._mode is not None
+
+    def _acquire_shared(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+
+            self._readers += 1
+
+    def _release_shared(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    @contextmanager
+    def shared(self):
+        """
+        Hold the lock shared for the duration of a with block
+        """
+        if self._mode is not None:
+            yield
+            return
+
+        self._acquire_shared()
+        self._local.mode = 'shared'
+        try:
+            yield
+        finally:
+            self._local.mode = None
+            self._release_shared()
+
+    @contextmanager
+    def exclusive(self):
+        """
+        Hold the lock exclusively for the duration of a with block
+        """
+        mode = self._mode
+        if mode == 'exclusive':
+            yield
+            return
+
+        if mode == 'shared':
+            self._release_shared()
+
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+
+            self._writers_waiting -= 1
+            self._writer = True
+
+        self._local.mode = 'exclusive'
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+            self._local.mode = mode
+            if mode == 'shared':
+                self._acquire_shared()
+
+
+RENDER_LOCK = RenderLock()
+
+
+@contextmanager
+def rc_render(rc=None):
+    """
+    Render with the rcParams in rc on top of the current ones. Renders
+    without rc run concurrently, renders with rc run one at a time inside
+    matplotlib.rc_context. The package style is applied on the first
+    render.
+
+    Parameters
+    ----------
+    rc : dict, optional
+        rcParams to apply, by default None
+    """
+    apply_style()
+    if not rc:
+        with RENDER_LOCK.shared():
+            yield
+    else:
+        with RENDER_LOCK.exclusive(), mpl.rc_context(rc):
+            yield
+
+
+def with_rc(func):
+    """
+    Decorate a public plotting function so the whole call, from creating
+    the figure to saving it, runs inside rc_render(rc) with its rc kwarg
+
+    Parameters
+    ----------
+    func : function
+        Plotting function with an rc kwarg
+
+    Returns
+    -------
+    function
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with rc_render(kwargs.get('rc')):
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,351 @@
+"""
+Chunked access to array sources that do not fit in memory
+"""
+from collections.abc import Iterator
+import mmap
+import os
+import struct
+import zipfile
+import numpy as np
+
+CHUNKSIZE = 2 ** 20
+
+
+def _read_npy_header(f):
+    """
+    Read the header of an array stored in the .npy format
+
+    Parameters
+    ----------
+    f : file
+        File positioned at the start of the array
+
+    Returns
+    -------
+    tuple | None
+        (shape, fortran_order, dtype), None if the format version is not
+        supported
+    """
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(f)
+    elif version == (2, 0):
+        return np.lib.format.read_array_header_2_0(f)
+
+    return None
+
+
+def _npz_member(path, key=None):
+    """
+    Locate an array in a .npz file without reading it
+
+    Parameters
+    ----------
+    path : str
+        Path to .npz file
+    key : str, optional
+        Array to locate, by default None (first array)
+
+    Returns
+    -------
+    tuple
+        (member name, offset, shape, fortran_order, dtype), offset of the
+        array data in the file is None if the member is compressed
+    """
+    with zipfile.ZipFile(path) as zf:
+        name = key + '.npy' if key is not None else zf.namelist()[0]
+        info = zf.getinfo(name)
+        with zf.open(info) as member:
+            header = _read_npy_header(member)
+            header_size = member.tell()
+
+    if header is None:
+        msg = 'Unsupported .npy format version of {} in {}'.format(name, path)
+        raise ValueError(msg)
+
+    shape, fortran_order, dtype = header
+    if dtype.hasobject:
+        msg = ('Can not stream object array {} from {}, it can only be '
+               'loaded with numpy.load'.format(name, path))
+        raise ValueError(msg)
+
+    offset = None
+    if info.compress_type == zipfile.ZIP_STORED:
+        # the local file header is followed by the member name, extra
+        # field and the .npy data
+        with open(path, 'rb') as f:
+            f.seek(info.header_offset + 26)
+            name_size, extra_size = struct.unpack('<HH', f.read(4))
+
+        offset = (info.header_offset + 30 + name_size + extra_size
+                  + header_size)
+
+    return name, offset, shape, fortran_order, dtype
+
+
+def _iter_npz(path, name, shape, dtype, chunksize=CHUNKSIZE):
+    """
+    Iterate over the rows of a compressed .npz member, decompressing one
+    chunk at a time
+
+    Parameters
+    ----------
+    path : str
+        Path to .npz file
+    name : str
+        Member to read
+    shape : tuple
+        Array shape
+    dtype : numpy.dtype
+        Array dtype
+    chunksize : int, optional
+        Number of rows per chunk, by default 2**20
+
+    Yields
+    ------
+    ndarray
+        Chunk of rows
+    """
+    row_shape = tuple(shape[1:])
+    row_bytes = int(np.prod(row_shape, dtype=np.int64)) * dtype.itemsize
+    with zipfile.ZipFile(path) as zf, zf.open(name) as member:
+        _read_npy_header(member)
+        for start in range(0, shape[0], chunksize):
+            n = min(chunksize, shape[0] - start)
+            chunk = np.frombuffer(member.read(n * row_bytes), dtype=dtype)
+            yield chunk.reshape((n,) + row_shape)
+
+
+def _load_npz(path, key=None, chunksize=CHUNKSIZE):
+    """
+    Memory map an array stored uncompressed in a .npz file, or iterate over
+    the rows of a compressed array
+
+    Parameters
+    ----------
+    path : str
+        Path to .npz file
+    key : str, optional
+        Array to load, by default None (first array)
+    chunksize : int, optional
+        Number of rows per chunk of compressed arrays, by default 2**20
+
+    Returns
+    -------
+    np.memmap | generator
+    """
+    name, offset, shape, fortran_order, dtype = _npz_member(path, key=key)
+    if offset is not None:
+        return np.memmap(path, dtype=dtype, mode='r', offset=offset,
+                         shape=shape, order='F' if fortran_order else 'C')
+
+    if fortran_order and len(shape) > 1:
+        msg = ('Can not stream the rows of Fortran ordered array {} from '
+               'compressed {}'.format(name, path))
+        raise ValueError(msg)
+
+    return _iter_npz(path, name, shape, dtype, chunksize=chunksize)
+
+
+def load_source(source, key=None):
+    """
+    Open an array source without reading it into memory
+
+    Parameters
+    ----------
+    source : str | os.PathLike | ndarray
+        Path to a .npy or .npz file, or an array like object which is
+        returned as is. .npy files and arrays stored uncompressed in .npz
+        files (numpy.savez) are memory mapped, compressed arrays
+        (numpy.savez_compressed) are decompressed one chunk at a time
+    key : str, optional
+        Array to load from a .npz file, by default None (first array)
+
+    Returns
+    -------
+    ndarray | np.memmap | generator
+        Array like source, or generator of chunks of rows for a compressed
+        .npz array
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        return source
+
+    path = os.fspath(source)
+    if path.endswith('.npz'):
+        return _load_npz(path, key=key)
+    elif path.endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    else:
+        msg = ('Can only load .npy or .npz files, not {}'.format(path))
+        raise ValueError(msg)
+
+
+def is_array_like(source):
+    """
+    Check if source supports shape and slicing, e.g. ndarray, np.memmap or an
+    h5py.Dataset
+
+    Parameters
+    ----------
+    source : obj
+        Source to check
+
+    Returns
+    -------
+    bool
+    """
+    return (hasattr(source, 'shape') and hasattr(source, 'dtype')
+            and hasattr(source, '__getitem__'))
+
+
+def is_chunked(source):
+    """
+    Check if source should be streamed in chunks rather than used directly:
+    a file path, np.memmap, out of core dataset (an h5py.Dataset or an
+    array like without __array__) or an iterator of chunks. In memory
+    arrays such as ndarrays and pandas Series are not chunked.
+
+    Parameters
+    ----------
+    source : obj
+        Source to check
+
+    Returns
+    -------
+    bool
+    """
+    if isinstance(source, (str, os.PathLike, np.memmap)):
+        return True
+
+    if type(source).__module__.split('.')[0] == 'h5py':
+        return True
+
+    # in memory arrays, e.g. ndarray or pandas objects, are used directly
+    if hasattr(source, '__array__'):
+        return False
+
+    return is_array_like(source) or isinstance(source, Iterator)
+
+
+def is_reiterable(source):
+    """
+    Check if source can be read more than once
+
+    Parameters
+    ----------
+    source : obj
+        Source to check
+
+    Returns
+    -------
+    bool
+    """
+    if isinstance(source, (str, os.PathLike)) or is_array_like(source):
+        return True
+
+    return iter(source) is not source
+
+
+def _raw_file(source):
+    """
+    Location of the data of a C ordered .npy file or np.memmap so it can be
+    read with plain file reads, which unlike a memory map does not leave the
+    pages read resident in the process
+
+    Parameters
+    ----------
+    source : obj
+        Source to locate
+
+    Returns
+    -------
+    tuple | None
+        (path, offset, shape, dtype), None if source is not a file or its
+        layout is not supported
+    """
+    if isinstance(source, np.memmap):
+        if (isinstance(source.base, mmap.mmap) and source.ndim
+                and source.flags.c_contiguous and source.filename):
+            return (source.filename, source.offset, source.shape,
+                    source.dtype)
+    elif (isinstance(source, (str, os.PathLike))
+            and os.fspath(source).endswith('.npy')):
+        with open(source, 'rb') as f:
+            header = _read_npy_header(f)
+            if header is None:
+                return None
+
+            shape, fortran_order, dtype = header
+            if shape and not fortran_order and not dtype.hasobject:
+                return os.fspath(source), f.tell(), shape, dtype
+
+    return None
+
+
+def _iter_raw_file(path, offset, shape, dtype, chunksize=CHUNKSIZE):
+    """
+    Iterate over the rows of an array stored in a file
+
+    Parameters
+    ----------
+    path : str
+        Path to file
+    offset : int
+        Offset of the array data in bytes
+    shape : tuple
+        Array shape
+    dtype : numpy.dtype
+        Array dtype
+    chunksize : int, optional
+        Number of rows per chunk, by default 2**20
+
+    Yields
+    ------
+    ndarray
+        Chunk of rows
+    """
+    row_shape = tuple(shape[1:])
+    row_size = int(np.prod(row_shape, dtype=np.int64))
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for start in range(0, shape[0], chunksize):
+            n = min(chunksize, shape[0] - start)
+            chunk = np.fromfile(f, dtype=dtype, count=n * row_size)
+            yield chunk.reshape((n,) + row_shape)
+
+
+def iter_chunks(source, chunksize=CHUNKSIZE, key=None):
+    """
+    Iterate over a source in chunks along its first axis
+
+    Parameters
+    ----------
+    source : str | os.PathLike | ndarray | h5py.Dataset | iterable
+        Path to a .npy or .npz file, array like object or iterable of array
+        chunks
+    chunksize : int, optional
+        Number of rows per chunk for array like sources, by default 2**20
+    key : str, optional
+        Array to load from a .npz file, by default None
+
+    Yields
+    ------
+    ndarray
+        Chunk of source
+    """
+    if (isinstance(source, (str, os.PathLike))
+            and os.fspath(source).endswith('.npz')):
+        source = _load_npz(os.fspath(source), key=key, chunksize=chunksize)
+
+    raw = _raw_file(source)
+    if raw is not None:
+        yield from _iter_raw_file(*raw, chunksize=chunksize)
+        return
+
+    source = load_source(source, key=key)
+    if is_array_like(source):
+        for start in range(0, source.shape[0], chunksize):
+            yield np.asarray(source[start:start + chunksize])
+    else:
+        for chunk in source:
+            yield np.asarray(chunk)
@@ -0,0 +1,1048 @@
+"""
+Vectorized and streaming summary statistics of long format data
+"""
+import copy
+from statistics import NormalDist
+import matplotlib as mpl
+from matplotlib.collections import PolyCollection
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+BOX_STATS = ('q1', 'med', 'q3', 'whislo', 'whishi', 'mean', 'count',
+             'fliers')
+ESTIMATORS = ('mean', 'median', 'sum')
+CI_METHODS = ('bootstrap', 'normal')
+AGGFUNCS = ('sum', 'mean', 'median', 'min', 'max', 'count', 'first', 'last')
+
+
+def _long_form(df, x=None, y=None):
+    """
+    Long format view of df, wide DataFrames are stacked so each numeric
+    column is a category of 'variable' with values in 'value'
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long or wide format DataFrame
+    x : str, optional
+        Category column, by default None
+    y : str, optional
+        Value column, if None df is treated as wide format, by default None
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        Long format DataFrame
+    x : str
+        Category column
+    y : str
+        Value column
+    """
+    if y is None:
+        df = df.select_dtypes('number')
+        df = df.melt(var_name='variable', value_name='value')
+        return df, 'variable', 'value'
+
+    return df, x, y
+
+
+def _group_codes(df, names, y):
+    """
+    Group code of each finite row of df
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long format DataFrame
+    names : list
+        Grouping columns, if empty all rows are one group labelled y
+    y : str
+        Value column
+
+    Returns
+    -------
+    codes : ndarray
+        Group code of each row with a finite value and group key
+    values : ndarray
+        Value of each of those rows
+    index : pandas.Index | pandas.MultiIndex
+        Key of each group code, sorted
+    """
+    df = df.dropna(subset=[y])
+    values = df[y].to_numpy(dtype=np.float64)
+    if not names:
+        return np.zeros(len(values), dtype=np.intp), values, pd.Index([y])
+
+    groups = df.groupby(names, observed=True, sort=True)
+    # rows with a missing group key are not in any group, their code is NaN
+    codes = groups.ngroup().to_numpy(dtype=np.float64)
+    keep = ~np.isnan(codes)
+
+    return codes[keep].astype(np.intp), values[keep], groups.size().index
+
+
+def _dodge(index, width=0.8):
+    """
+    x position of each group, hue levels are dodged within each category
+
+    Parameters
+    ----------
+    index : pandas.Index | pandas.MultiIndex
+        Group keys, (category, hue) for a MultiIndex
+    width : float, optional
+        Width of each category, by default 0.8
+
+    Returns
+    -------
+    categories : list
+        Categories in order, drawn at 0, 1, ...
+    hue_levels : list
+        Hue levels in order, [None] without hue
+    hue_codes : ndarray
+        Hue level of each group
+    positions : ndarray
+        x position of each group
+    box_width : float
+        Width available to each group
+    """
+    if isinstance(index, pd.MultiIndex):
+        categories = index.get_level_values(0)
+        levels = index.get_level_values(1)
+        hue_levels = list(pd.unique(levels))
+        hue_codes = pd.Index(hue_levels).get_indexer(levels)
+    else:
+        categories = index
+        hue_levels = [None]
+        hue_codes = np.zeros(len(index), dtype=np.intp)
+
+    category_order = list(pd.unique(categories))
+    box_width = width / len(hue_levels)
+    offsets = -width / 2 + box_width * (np.arange(len(hue_levels)) + 0.5)
+    positions = (pd.Index(category_order).get_indexer(categories)
+                 + offsets[hue_codes])
+
+    return category_order, hue_levels, hue_codes, positions, box_width
+
+
+def _set_categories(axis, categories, xlabel=None, ylabel=None,
+                    max_ticks=None, rotation=None):
+    """
+    Label integer x positions with categories
+
+    Parameters
+    ----------
+    axis : matplotlib.axes.Axes
+        Axis to format
+    categories : list
+        Category drawn at each integer position
+    xlabel : str, optional
+        x-axis label, by default None
+    ylabel : str, optional
+        y-axis label, by default None
+    max_ticks : int, optional
+        Maximum number of labelled categories, every nth category is
+        labelled if there are more, by default None (all)
+    rotation : float, optional
+        Rotation of the tick labels in degrees, by default None
+    """
+    ticks = np.arange(len(categories))
+    if max_ticks is not None and len(categories) > max_ticks:
+        ticks = ticks[::-(-len(categories) // max_ticks)]
+
+    label_kwargs = {} if rotation is None else {'rotation': rotation}
+    axis.set_xticks(ticks)
+    axis.set_xticklabels([str(categories[i]) for i in ticks],
+                         **label_kwargs)
+    axis.set_xlim(-0.5, len(categories) - 0.5)
+    if xlabel is not None:
+        axis.set_xlabel(xlabel)
+
+    if ylabel is not None:
+        axis.set_ylabel(ylabel)
+
+
+def _group_index(keys, names):
+    """
+    Index of group keys
+
+    Parameters
+    ----------
+    keys : list
+        Group keys, tuples for more than one grouping column
+    names : list
+        Names of the grouping columns
+
+    Returns
+    -------
+    pandas.Index | pandas.MultiIndex
+    """
+    if len(names) > 1:
+        return pd.MultiIndex.from_tuples(keys, names=names)
+
+    return pd.Index(keys, name=names[0] if names else None)
+
+
+class QuantileSketch:
+    """
+    Mergeable KLL quantile sketch. Values are held in compactors of
+    exponentially decreasing capacity, a full compactor sorts its values
+    and promotes every other one to the next level with twice the weight,
+    so memory grows with log(count) while quantiles are approximated to a
+    rank error of roughly 1.7 / k. The exact count, sum, min and max are
+    tracked alongside.
+    """
+    def __init__(self, k=200, seed=None):
+        """
+        Parameters
+        ----------
+        k : int, optional
+            Capacity of the top compactor, controlling accuracy and size,
+            by default 200
+        seed : int, optional
+            Seed of the random compaction offsets, by default None
+        """
+        self._k = int(k)
+        self._rng = np.random.default_rng(seed)
+        self._levels = [np.empty(0)]
+        self.count = 0
+        self.sum = 0.
+        self.min = np.inf
+        self.max = -np.inf
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    @property
+    def size(self):
+        """
+        Number of values retained
+
+        Returns
+        -------
+        int
+        """
+        return sum(len(items) for items in self._levels)
+
+    def _capacity(self, level):
+        """
+        Capacity of a compactor
+
+        Parameters
+        ----------
+        level : int
+            Compactor level, items at level h have weight 2**h
+
+        Returns
+        -------
+        int
+        """
+        depth = len(self._levels) - level - 1
+
+        return max(int(np.ceil(self._k * (2 / 3) ** depth)), 2)
+
+    def _compress(self):
+        """
+        Compact every compactor over capacity
+        """
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+
+                items = np.sort(items)
+                odd = len(items) % 2
+                offset = odd + self._rng.integers(2)
+                self._levels[level + 1] = np.concatenate(
+                    [self._levels[level + 1], items[offset::2]])
+                self._levels[level] = items[:odd]
+
+            level += 1
+
+    def copy(self):
+        """
+        Copy of the sketch
+
+        Returns
+        -------
+        QuantileSketch
+        """
+        return copy.deepcopy(self)
+
+    def update(self, values):
+        """
+        Add values to the sketch, non-finite values are ignored
+
+        Parameters
+        ----------
+        values : ndarray
+            Chunk of values
+
+        Returns
+        -------
+        QuantileSketch
+            self
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if values.size:
+            self.count += values.size
+            self.sum += float(values.sum())
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+            self._levels[0] = np.concatenate([self._levels[0], values])
+            self._compress()
+
+        return self
+
+    def merge(self, other):
+        """
+        Add the values summarized by another sketch
+
+        Parameters
+        ----------
+        other : QuantileSketch
+            Sketch to merge
+
+        Returns
+        -------
+        QuantileSketch
+            self
+        """
+        for level, items in enumerate(other._levels):
+            if level == len(self._levels):
+                self._levels.append(np.empty(0))
+
+            self._levels[level] = np.concatenate([self._levels[level],
+                                                  items])
+
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+        return self
+
+    def items(self):
+        """
+        Retained values and their weights
+
+        Returns
+        -------
+        values : ndarray
+            Sorted retained values
+        weights : ndarray
+            Number of values each retained value stands for
+        """
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level)
+                                  for level, items
+                                  in enumerate(self._levels)])
+        order = np.argsort(values, kind='stable')
+
+        return values[order], weights[order]
+
+    def quantile(self, q):
+        """
+        Estimate quantiles, exact while no values have been compacted
+
+        Parameters
+        ----------
+        q : float | ndarray
+            Quantile(s) in [0, 1]
+
+        Returns
+        -------
+        float | ndarray
+        """
+        if not self.count:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+
+        if len(self._levels) == 1:
+            return np.quantile(self._levels[0], q)
+
+        values, weights = self.items()
+        cdf = (np.cumsum(weights) - weights / 2) / weights.sum()
+        cdf = np.concatenate([[0.], cdf, [1.]])
+        values = np.concatenate([[self.min], values, [self.max]])
+
+        return np.interp(q, cdf, values)
+
+
+def box_stats(df, x=None, y=None, hue=None, whis=1.5, max_fliers=100):
+    """
+    Box plot statistics of every group computed with vectorized groupby
+    reductions, matching matplotlib.cbook.boxplot_stats
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long format DataFrame, or wide format if y is None
+    x : str, optional
+        Category column, by default None
+    y : str, optional
+        Value column, by default None (each numeric column of a wide df)
+    hue : str, optional
+        Second category column, by default None
+    whis : float, optional
+        Whisker reach in units of the interquartile range, by default 1.5
+    max_fliers : int, optional
+        Maximum number of fliers kept per group, the most extreme are kept,
+        None to keep all, by default 100
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexed by group with columns q1, med, q3, whislo, whishi, mean,
+        count and fliers (array of flier values)
+    """
+    df, x, y = _long_form(df, x=x, y=y)
+    names = [k for k in (x, hue) if k is not None]
+    codes, values, index = _group_codes(df, names, y)
+    n_groups = len(index)
+    series = pd.Series(values)
+    groups = series.groupby(codes)
+    q1, med, q3 = groups.quantile([0.25, 0.5, 0.75]).unstack().to_numpy().T
+    iqr = q3 - q1
+    lo = (q1 - whis * iqr)[codes]
+    hi = (q3 + whis * iqr)[codes]
+    whislo = series.where(values >= lo).groupby(codes).min().to_numpy()
+    whishi = series.where(values <= hi).groupby(codes).max().to_numpy()
+    whislo = np.where(np.isnan(whislo), q1, whislo)
+    whishi = np.where(np.isnan(whishi), q3, whishi)
+
+    outside = (values < whislo[codes]) | (values > whishi[codes])
+    fliers = pd.DataFrame({'code': codes[outside],
+                           'value': values[outside]})
+    fliers['dist'] = np.abs(fliers['value'].to_numpy()
+                            - med[fliers['code'].to_numpy()])
+    fliers = fliers.sort_values(['code', 'dist'], ascending=[True, False])
+    if max_fliers is not None:
+        fliers = fliers.groupby('code', sort=False).head(max_fliers)
+
+    counts = np.bincount(fliers['code'], minlength=n_groups)
+    fliers = np.split(fliers['value'].to_numpy(), np.cumsum(counts)[:-1])
+
+    stats = pd.DataFrame({'q1': q1, 'med': med, 'q3': q3, 'whislo': whislo,
+                          'whishi': whishi,
+                          'mean': groups.mean().to_numpy(),
+                          'count': groups.size().to_numpy()},
+                         index=index)
+    stats['fliers'] = pd.Series(fliers, index=index, dtype=object)
+
+    return stats
+
+
+def sketch_groups(chunks, x=None, y=None, hue=None, k=200, seed=None,
+                  sketches=None):
+    """
+    Accumulate a QuantileSketch of the values of every group over chunks
+    of a long format DataFrame, memory use is bounded by the chunk size and
+    the number of groups
+
+    Parameters
+    ----------
+    chunks : iterable
+        pandas.DataFrame chunks, e.g. from pandas.read_csv(chunksize=...)
+    x : str, optional
+        Category column, by default None
+    y : str, optional
+        Value column, by default None (each numeric column of wide chunks)
+    hue : str, optional
+        Second category column, by default None
+    k : int, optional
+        Sketch accuracy parameter, by default 200
+    seed : int, optional
+        Seed of the sketch compactions, by default None
+    sketches : dict, optional
+        Sketches to update in place, by default None
+
+    Returns
+    -------
+    dict
+        {group key: QuantileSketch}
+    """
+    if sketches is None:
+        sketches = {}
+
+    for chunk in chunks:
+        chunk, cx, cy = _long_form(chunk, x=x, y=y)
+        names = [n for n in (cx, hue) if n is not None]
+        if names:
+            groups = chunk.groupby(names, observed=True, sort=False)[cy]
+        else:
+            groups = [(cy, chunk[cy])]
+
+        for key, values in groups:
+            if isinstance(key, tuple) and len(key) == 1:
+                key = key[0]
+
+            if key not in sketches:
+                sketches[key] = QuantileSketch(k=k, seed=seed)
+
+            sketches[key].update(values.to_numpy())
+
+    return sketches
+
+
+def sketch_box_stats(sketches, names=None, whis=1.5, max_fliers=100):
+    """
+    Approximate box plot statistics from the sketch of every group. Fliers
+    are drawn from the values retained by the sketches plus the exact min
+    and max.
+
+    Parameters
+    ----------
+    sketches : dict
+        {group key: QuantileSketch}
+    names : list, optional
+        Names of the grouping columns, by default None
+    whis : float, optional
+        Whisker reach in units of the interquartile range, by default 1.5
+    max_fliers : int, optional
+        Maximum number of fliers kept per group, the most extreme are kept,
+        None to keep all, by default 100
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexed by group with the columns of box_stats
+    """
+    keys = sorted(sketches)
+    rows = []
+    for key in keys:
+        sketch = sketches[key]
+        q1, med, q3 = sketch.quantile([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        values, _ = sketch.items()
+        values = np.concatenate([[sketch.min], values, [sketch.max]])
+        inside = values[(values >= q1 - whis * iqr)
+                        & (values <= q3 + whis * iqr)]
+        whislo = inside.min() if inside.size else q1
+        whishi = inside.max() if inside.size else q3
+        fliers = np.unique(values[(values < whislo) | (values > whishi)])
+        if max_fliers is not None and len(fliers) > max_fliers:
+            order = np.argsort(-np.abs(fliers - med), kind='stable')
+            fliers = np.sort(fliers[order[:max_fliers]])
+
+        rows.append({'q1': q1, 'med': med, 'q3': q3, 'whislo': whislo,
+                     'whishi': whishi, 'mean': sketch.sum / sketch.count,
+                     'count': sketch.count, 'fliers': fliers})
+
+    names = list(names) if names is not None else []
+
+    return pd.DataFrame(rows, index=_group_index(keys, names),
+                        columns=list(BOX_STATS))
+
+
+def box_stats_plot(axis, data, x=None, y=None, hue=None, whis=1.5,
+                   max_fliers=100, sketch=False, k=200, seed=None,
+                   width=0.8, palette=None, color=None, showmeans=False,
+                   showfliers=True, legend=None, **kwargs):
+    """
+    Box plot drawn with matplotlib.axes.Axes.bxp from pre-aggregated
+    statistics instead of the raw samples
+
+    Parameters
+    ----------
+    axis : matplotlib.axes.Axes
+        Axis to draw on
+    data : pandas.DataFrame | iterable | dict
+        Long (or wide) format DataFrame, iterable of DataFrame chunks which
+        are summarized with quantile sketches, a dict of
+        {group key: QuantileSketch} from sketch_groups, or a DataFrame of
+        statistics from box_stats / sketch_box_stats
+    x : str, optional
+        Category column, by default None
+    y : str, optional
+        Value column, by default None
+    hue : str, optional
+        Column to split boxes by within each category, by default None
+    whis : float, optional
+        Whisker reach in units of the interquartile range, by default 1.5
+    max_fliers : int, optional
+        Maximum number of fliers drawn per box, by default 100
+    sketch : bool, optional
+        Summarize an in memory DataFrame with quantile sketches instead of
+        exact quantiles, by default False
+    k : int, optional
+        Sketch accuracy parameter, by default 200
+    seed : int, optional
+        Seed of the sketch compactions, by default None
+    width : float, optional
+        Width of each category, split between hue levels, by default 0.8
+    palette : str | list, optional
+        Color palette for hue levels, by default None
+    color : str | tuple, optional
+        Box color without hue, by default None (first palette color)
+    showmeans : bool, optional
+        Draw the mean of each box, by default False
+    showfliers : bool, optional
+        Draw fliers, by default True
+    legend : bool, optional
+        Ignored, the legend is handled by plotting_base
+    kwargs : dict
+        kwargs for matplotlib.axes.Axes.bxp
+
+    Returns
+    -------
+    pandas.DataFrame
+        Statistics of each box
+    """
+    names = [n for n in (x if y is not None else 'variable', hue)
+             if n is not None]
+    if isinstance(data, pd.DataFrame) and set(BOX_STATS) <= set(data):
+        stats = data
+    elif isinstance(data, dict):
+        stats = sketch_box_stats(data, names=names, whis=whis,
+                                 max_fliers=max_fliers)
+    elif sketch or not isinstance(data, pd.DataFrame):
+        # any other iterable, e.g. a list or generator of chunks
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+        sketches = sketch_groups(chunks, x=x, y=y, hue=hue, k=k, seed=seed)
+        stats = sketch_box_stats(sketches, names=names, whis=whis,
+                                 max_fliers=max_fliers)
+    else:
+        stats = box_stats(data, x=x, y=y, hue=hue, whis=whis,
+                          max_fliers=max_fliers)
+
+    categories, hue_levels, hue_codes, positions, box_width = \
+        _dodge(stats.index, width=width)
+    has_hue = isinstance(stats.index, pd.MultiIndex)
+    if has_hue:
+        colors = sns.color_palette(palette, len(hue_levels))
+    else:
+        colors = [color if color is not None else sns.color_palette()[0]]
+
+    bxpstats = [dict(row, label=str(key))
+                for key, row in zip(stats.index,
+                                    stats.to_dict('records'))]
+    kwargs.setdefault('medianprops', {'color': 'k'})
+    artists = axis.bxp(bxpstats, positions=positions,
+                       widths=box_width * 0.9, patch_artist=True,
+                       showmeans=showmeans, showfliers=showfliers,
+                       manage_ticks=False, **kwargs)
+
+    labeled = set()
+    for box, code in zip(artists['boxes'], hue_codes):
+        box.set_facecolor(colors[code])
+        if has_hue and code not in labeled:
+            box.set_label(str(hue_levels[code]))
+            labeled.add(code)
+
+    _set_categories(axis, categories,
+                    xlabel=names[0] if names else None,
+                    ylabel=y if y is not None else 'value')
+
+    return stats
+
+
+def _segment_estimate(values, starts, counts, estimator):
+    """
+    Estimate of each contiguous segment along the last axis
+
+    Parameters
+    ----------
+    values : ndarray
+        (..., n) values sorted by segment, and by value within each segment
+        for the median
+    starts : ndarray
+        Start of each segment
+    counts : ndarray
+        Length of each segment, all > 0
+    estimator : str
+        'mean', 'median' or 'sum'
+
+    Returns
+    -------
+    ndarray
+        (..., n_segments) estimates
+    """
+    if estimator == 'median':
+        lower = values[..., starts + (counts - 1) // 2]
+        upper = values[..., starts + counts // 2]
+        return (lower + upper) / 2
+
+    sums = np.add.reduceat(values, starts, axis=-1)
+    if estimator == 'mean':
+        return sums / counts
+
+    return sums
+
+
+def group_estimates(df, x=None, y=None, hue=None, estimator='mean',
+                    ci_method='bootstrap', confidence=0.95, n_boot=1000,
+                    seed=None, max_batch=2 ** 24):
+    """
+    Estimate and confidence interval of every group, computed once for all
+    groups. Bootstrap resamples of every group are drawn together in
+    batches of up to max_batch values, so the cost does not depend on the
+    number of groups.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long format DataFrame, or wide format if y is None
+    x : str, optional
+        Category column, by default None
+    y : str, optional
+        Value column, by default None (each numeric column of a wide df)
+    hue : str, optional
+        Second category column, by default None
+    estimator : str, optional
+        'mean', 'median' or 'sum', by default 'mean'
+    ci_method : str, optional
+        'bootstrap' for percentile bootstrap intervals, 'normal' for
+        normal approximation intervals of the mean or sum, or None,
+        by default 'bootstrap'
+    confidence : float, optional
+        Confidence level of the intervals, by default 0.95
+    n_boot : int, optional
+        Number of bootstrap resamples, by default 1000
+    seed : int, optional
+        Seed of the bootstrap resamples, by default None
+    max_batch : int, optional
+        Maximum number of resampled values held in memory at once,
+        by default 2**24
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexed by group with columns estimate, ci_low, ci_high and count
+    """
+    if estimator not in ESTIMATORS:
+        msg = ('estimator must be one of {}, not {}'
+               .format(ESTIMATORS, estimator))
+        raise ValueError(msg)
+
+    if ci_method is not None and ci_method not in CI_METHODS:
+        msg = ('ci_method must be one of {} or None, not {}'
+               .format(CI_METHODS, ci_method))
+        raise ValueError(msg)
+
+    if ci_method == 'normal' and estimator == 'median':
+        raise ValueError('normal intervals are only available for the mean '
+                         'and sum, use ci_method="bootstrap"')
+
+    df, x, y = _long_form(df, x=x, y=y)
+    names = [k for k in (x, hue) if k is not None]
+    codes, values, index = _group_codes(df, names, y)
+    order = np.lexsort((values, codes))
+    codes = codes[order]
+    values = values[order]
+    counts = np.bincount(codes, minlength=len(index))
+    starts = np.cumsum(counts) - counts
+    estimate = _segment_estimate(values, starts, counts, estimator)
+
+    ci_low = ci_high = np.full(len(index), np.nan)
+    if ci_method == 'normal':
+        std = pd.Series(values).groupby(codes).std().to_numpy()
+        se = std / np.sqrt(counts)
+        if estimator == 'sum':
+            se *= counts
+
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        ci_low = estimate - z * se
+        ci_high = estimate + z * se
+    elif ci_method == 'bootstrap':
+        rng = np.random.default_rng(seed)
+        n = len(values)
+        batch = max(1, min(n_boot, max_batch // max(n, 1)))
+        group_starts = starts[codes]
+        group_counts = counts[codes]
+        boots = np.empty((n_boot, len(index)))
+        for start in range(0, n_boot, batch):
+            size = min(batch, n_boot - start)
+            idx = (rng.random((size, n)) * group_counts).astype(np.intp)
+            idx += group_starts
+            if estimator == 'median':
+                # values are sorted within each group, so sorting the
+                # resampled positions sorts the resampled values
+                idx.sort(axis=1)
+
+            boots[start:start + size] = _segment_estimate(
+                values[idx], starts, counts, estimator)
+
+        tail = 50 * (1 - confidence)
+        ci_low, ci_high = np.percentile(boots, [tail, 100 - tail], axis=0)
+
+    return pd.DataFrame({'estimate': estimate, 'ci_low': ci_low,
+                         'ci_high': ci_high, 'count': counts}, index=index)
+
+
+def estimates_plot(axis, data, x=None, y=None, hue=None, kind='bar',
+                   estimator='mean', ci_method='bootstrap', confidence=0.95,
+                   n_boot=1000, seed=None, width=0.8, palette=None,
+                   color=None, errcolor='.26', errwidth=None, capsize=0,
+                   markers='o', linestyles='-', dodge=False, legend=None,
+                   **kwargs):
+    """
+    Bar, count or point plot of pre-aggregated group estimates and
+    confidence intervals, drawn with one artist per hue level
+
+    Parameters
+    ----------
+    axis : matplotlib.axes.Axes
+        Axis to draw on
+    data : pandas.DataFrame
+        Long (or wide) format DataFrame, or a DataFrame of estimates from
+        group_estimates
+    x : str, optional
+        Category column, by default None
+    y : str, optional
+        Value column, not needed for kind='count', by default None
+    hue : str, optional
+        Column to split bars or lines by, by default None
+    kind : str, optional
+        'bar', 'count' or 'point', by default 'bar'
+    estimator : str, optional
+        'mean', 'median' or 'sum', by default 'mean'
+    ci_method : str, optional
+        'bootstrap', 'normal' or None, by default 'bootstrap'
+    confidence : float, optional
+        Confidence level of the intervals, by default 0.95
+    n_boot : int, optional
+        Number of bootstrap resamples, by default 1000
+    seed : int, optional
+        Seed of the bootstrap resamples, by default None
+    width : float, optional
+        Width of each category, split between hue levels for bars,
+        by default 0.8
+    palette : str | list, optional
+        Color palette for hue levels, by default None
+    color : str | tuple, optional
+        Color without hue, by default None (first palette color)
+    errcolor : str | tuple, optional
+        Color of the bar confidence intervals, by default '.26'
+    errwidth : float, optional
+        Width of the confidence interval lines, by default None
+    capsize : float, optional
+        Width of the interval caps as a fraction of the bar width,
+        by default 0
+    markers : str, optional
+        Marker of point estimates, by default 'o'
+    linestyles : str, optional
+        Style of the lines joining point estimates, by default '-'
+    dodge : bool | float, optional
+        Dodge point estimates of hue levels, True for width / 2 or the
+        total dodge width, by default False
+    legend : bool, optional
+        Ignored, the legend is handled by plotting_base
+    kwargs : dict
+        kwargs for matplotlib.axes.Axes.bar or matplotlib.axes.Axes.plot
+
+    Returns
+    -------
+    pandas.DataFrame
+        Estimate and interval of each group
+    """
+    kinds = ('bar', 'count', 'point')
+    if kind not in kinds:
+        msg = 'kind must be one of {}, not {}'.format(kinds, kind)
+        raise ValueError(msg)
+
+    names = [n for n in (x if y is not None or kind == 'count'
+                         else 'variable', hue) if n is not None]
+    if isinstance(data, pd.DataFrame) and 'estimate' in data:
+        stats = data
+    elif kind == 'count':
+        counts = data.groupby(names, observed=True, sort=True).size()
+        stats = pd.DataFrame({'estimate': counts.astype(np.float64),
+                              'ci_low': np.nan, 'ci_high': np.nan,
+                              'count': counts})
+    else:
+        stats = group_estimates(data, x=x, y=y, hue=hue,
+                                estimator=estimator, ci_method=ci_method,
+                                confidence=confidence, n_boot=n_boot,
+                                seed=seed)
+
+    has_hue = isinstance(stats.index, pd.MultiIndex)
+    if kind == 'point':
+        dodge_width = width / 2 if dodge is True else float(dodge or 0)
+        categories, hue_levels, hue_codes, positions, _ = \
+            _dodge(stats.index, width=dodge_width)
+        bar_width = 0.
+    else:
+        categories, hue_levels, hue_codes, positions, bar_width = \
+            _dodge(stats.index, width=width)
+
+    if has_hue:
+        colors = sns.color_palette(palette, len(hue_levels))
+    else:
+        colors = [color if color is not None else sns.color_palette()[0]]
+
+    estimate = stats['estimate'].to_numpy()
+    ci_low = stats['ci_low'].to_numpy()
+    ci_high = stats['ci_high'].to_numpy()
+    if errwidth is None:
+        errwidth = 1.5 * mpl.rcParams['lines.linewidth']
+
+    for code, level in enumerate(hue_levels):
+        mask = hue_codes == code
+        label = str(level) if has_hue else None
+        if kind == 'point':
+            err = colors[code]
+            axis.plot(positions[mask], estimate[mask], color=colors[code],
+                      marker=markers, linestyle=linestyles, label=label,
+                      **kwargs)
+        else:
+            err = errcolor
+            axis.bar(positions[mask], estimate[mask], width=bar_width,
+                     color=colors[code], label=label, **kwargs)
+
+        ci = mask & np.isfinite(ci_low)
+        if ci.any():
+            axis.vlines(positions[ci], ci_low[ci], ci_high[ci], colors=err,
+                        linewidths=errwidth)
+            if capsize:
+                cap = capsize * (bar_width or width) / 2
+                for bound in (ci_low[ci], ci_high[ci]):
+                    axis.hlines(bound, positions[ci] - cap,
+                                positions[ci] + cap, colors=err,
+                                linewidths=errwidth)
+
+    ylabel = 'count' if kind == 'count' else (y if y is not None
+                                             else 'value')
+    _set_categories(axis, categories,
+                    xlabel=names[0] if names else None, ylabel=ylabel)
+
+    return stats
+
+
+def stack_totals(df, x, y, stack, aggfunc='sum', order=None):
+    """
+    Aggregate y over every (x, stack) pair of a long format DataFrame with
+    a single groupby, duplicate pairs are combined with aggfunc instead of
+    raising like DataFrame.pivot
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long format DataFrame
+    x : str
+        Category column
+    y : str
+        Value column
+    stack : str
+        Column to stack
+    aggfunc : str, optional
+        Aggregation of the values of each pair, one of AGGFUNCS,
+        by default 'sum'
+    order : list, optional
+        Stack levels to keep in stacking order, by default None (all,
+        sorted)
+
+    Returns
+    -------
+    pandas.DataFrame
+        Aggregated values indexed by the sorted categories of x with a
+        column per stack level, 0 for missing pairs
+    """
+    if aggfunc not in AGGFUNCS:
+        msg = ('aggfunc must be one of {}, not {}'
+               .format(AGGFUNCS, aggfunc))
+        raise ValueError(msg)
+
+    totals = df.groupby([x, stack], observed=True, sort=True)[y]
+    totals = totals.agg(aggfunc)
+    index = totals.index.remove_unused_levels()
+    values = np.zeros((len(index.levels[0]), len(index.levels[1])))
+    values[index.codes[0], index.codes[1]] = totals.to_numpy(
+        dtype=np.float64, na_value=0.)
+    totals = pd.DataFrame(values, index=index.levels[0],
+                          columns=index.levels[1])
+    if order is not None:
+        totals = totals[order]
+
+    return totals
+
+
+def stacked_bar_plot(axis, data, x, y, stack, aggfunc='sum', order=None,
+                     width=0.5, color=None, colormap=None, rot=90,
+                     max_ticks=50, legend=None, **kwargs):
+    """
+    Stacked bar plot of the aggregated values of each (x, stack) pair.
+    Bar bottoms are computed for every stack level at once, positive and
+    negative values stacked separately as in pandas, and each stack level
+    is drawn as a single PolyCollection.
+
+    Parameters
+    ----------
+    axis : matplotlib.axes.Axes
+        Axis to draw on
+    data : pandas.DataFrame
+        Long format DataFrame
+    x : str
+        Category column
+    y : str
+        Value column
+    stack : str
+        Column to stack
+    aggfunc : str, optional
+        Aggregation of the values of each pair, by default 'sum'
+    order : list, optional
+        Stacking order, by default None (sorted stack levels)
+    width : float, optional
+        Bar width, by default 0.5
+    color : str | list, optional
+        Color or list of colors of the stack levels, by default None
+        (property cycle)
+    colormap : str | matplotlib.colors.Colormap, optional
+        Colormap to sample the stack level colors from, by default None
+    rot : float, optional
+        Rotation of the x tick labels, by default 90
+    max_ticks : int, optional
+        Maximum number of labelled categories, by default 50
+    legend : bool, optional
+        Ignored, the legend is handled by plotting_base
+    kwargs : dict
+        kwargs for matplotlib.collections.PolyCollection
+
+    Returns
+    -------
+    pandas.DataFrame
+        Aggregated value of each pair, see stack_totals
+    """
+    totals = stack_totals(data, x, y, stack, aggfunc=aggfunc, order=order)
+    values = totals.to_numpy()
+    n_levels = values.shape[1]
+    if colormap is not None:
+        colors = mpl.colormaps[colormap](np.linspace(0, 1, n_levels))
+    elif color is None or isinstance(color, str):
+        cycle = mpl.rcParams['axes.prop_cycle'].by_key()['color']
+        colors = ([color] * n_levels if color is not None
+                  else [cycle[i % len(cycle)] for i in range(n_levels)])
+    else:
+        colors = [color[i % len(color)] for i in range(n_levels)]
+
+    positive = np.clip(values, 0, None)
+    negative = np.clip(values, None, 0)
+    bottoms = np.where(values >= 0, np.cumsum(positive, axis=1) - positive,
+                       np.cumsum(negative, axis=1) - negative)
+    tops = bottoms + values
+    left = np.arange(len(values)) - width / 2
+    right = left + width
+    for j, level in enumerate(totals.columns):
+        drawn = values[:, j] != 0
+        verts = np.empty((drawn.sum(), 4, 2))
+        verts[:, [0, 1], 0] = left[drawn, None]
+        verts[:, [2, 3], 0] = right[drawn, None]
+        verts[:, [0, 3], 1] = bottoms[drawn, j, None]
+        verts[:, [1, 2], 1] = tops[drawn, j, None]
+        bars = PolyCollection(verts, facecolors=colors[j], label=str(level),
+                              **kwargs)
+        bars.sticky_edges.y.append(0)
+        axis.add_collection(bars, autolim=False)
+
+    if values.size:
+        axis.update_datalim([(left[0], min(tops.min(), 0)),
+                             (right[-1], max(tops.max(), 0))])
+
+    axis.autoscale_view()
+    _set_categories(axis, list(totals.index), xlabel=x,
+                    max_ticks=max_ticks, rotation=rot)
+
+    return totals
@@ -0,0 +1,106 @@
+"""
+Colors, line styles and the package's matplotlib/seaborn style. Importing
+this module does not import matplotlib or seaborn, the style is applied by
+apply_style on the first render.
+"""
+import threading
+
+COLORS = {
+    "red": (0.7176, 0.1098, 0.1098),
+    "green": (0.65 * 0.298, 0.65 * 0.6863, 0.65 * 0.3137),
+    "blue": (0.9 * 0.0824, 0.9 * 0.3961, 0.9 * 0.7529),
+    "orange": (0.85 * 1.0, 0.85 * 0.5961, 0.0),
+    "purple": (0.49412, 0.3412, 0.7608),
+    "grey": (0.45, 0.45, 0.45),
+    "cyan": (0.0, 0.7373, 0.8314),
+    "teal": (0.0, 0.5882, 0.5333),
+    "lime": (0.8039, 0.8627, 0.2235),
+    "brown": (0.4745, 0.3333, 0.2824),
+    "black": (0.0, 0.0, 0.0),
+    "white": (1.0, 1.0, 1.0)
+}
+LINESTYLES = ('-', '--', '-.', ':')
+MARKERS = (u'o', u'v', u'^', u'<', u'>', u'8', u's', u'p', u'*', u'h', u'H',
+           u'D', u'd')
+
+_STYLE_LOCK = threading.Lock()
+_STYLE_APPLIED = False
+
+
+def riffle_lines(*lines):
+    """
+    Riffle lines together to plot in alternating order
+
+    Parameters
+    ----------
+    *lines : Tuple
+        set of lists to be riffled together
+
+    Returns
+    -------
+    list
+        Flattened list of lists such that entries are riffled
+    """
+    return [item for sublist in zip(*lines) for item in sublist]
+
+
+def apply_style(force=False):
+    """
+    Set the seaborn style and palette and the matplotlib fonts used by the
+    plotting functions. Called on the first render, only the first call
+    changes rcParams unless force is True. Call it before changing
+    rcParams directly so the changes are not overridden on the first
+    render.
+
+    Parameters
+    ----------
+    force : bool, optional
+        Re-apply the style even if it has already been applied,
+        by default False
+    """
+    global _STYLE_APPLIED
+    if _STYLE_APPLIED and not force:
+        return
+
+    with _STYLE_LOCK:
+        if _STYLE_APPLIED and not force:
+            return
+
+        import matplotlib as mpl
+        import seaborn as sns
+        from plotting.rc import RENDER_LOCK
+
+        # wait for renders in other threads to finish before restyling
+        with RENDER_LOCK.exclusive():
+            sns.set_style("white")
+            sns.set_style("ticks")
+            sns.set_palette('colorblind')
+            mpl.rcParams['font.sans-serif'] = 'DejaVu Sans'
+            mpl.rcParams['pdf.fonttype'] = 42
+
+        _STYLE_APPLIED = True
+
+
+def change_tick_style(style='classic'):
+    """
+    Change the matplotlib style between classic and new
+
+    Parameters
+    ----------
+    style : str
+        style type to set up
+    """
+    import matplotlib as mpl
+    from plotting.rc import RENDER_LOCK
+
+    apply_style()
+    if style == 'classic':
+        rc = {'xtick.direction': 'in', 'ytick.direction': 'in',
+              'xtick.top': True, 'ytick.right': True}
+    else:
+        rc = {'xtick.direction': 'out', 'ytick.direction': 'out',
+              'xtick.top': False, 'ytick.right': False}
+
+    # wait for renders in other threads to finish before restyling
+    with RENDER_LOCK.exclusive():
+        mpl.rcParams.update(rc)
@@ -0,0 +1,282 @@
+"""
+Per-phase timing of figure rendering reported to registered callbacks
+"""
+from collections import namedtuple
+from contextlib import contextmanager
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+PHASES = ('cache', 'figure', 'plot', 'despine', 'format', 'legend',
+          'layout', 'save', 'show')
+
+TimingRecord = namedtuple('TimingRecord', ['plot_type', 'timings', 'total'])
+
+_CALLBACKS = []
+_LOCK = threading.Lock()
+
+
+def add_timing_callback(callback):
+    """
+    Register a callback to be called with a TimingRecord after each figure
+    is rendered. Only renders in the current process are reported.
+
+    Parameters
+    ----------
+    callback : function
+        Function taking a single TimingRecord argument
+    """
+    with _LOCK:
+        _CALLBACKS.append(callback)
+
+
+def remove_timing_callback(callback):
+    """
+    Unregister a timing callback
+
+    Parameters
+    ----------
+    callback : function
+        Previously registered callback
+    """
+    with _LOCK:
+        _CALLBACKS.remove(callback)
+
+
+@contextmanager
+def timing_callback(callback):
+    """
+    Register a timing callback for the duration of a with block
+
+    Parameters
+    ----------
+    callback : function
+        Function taking a single TimingRecord argument
+
+    Yields
+    ------
+    function
+        callback
+    """
+    add_timing_callback(callback)
+    try:
+        yield callback
+    finally:
+        remove_timing_callback(callback)
+
+
+def plot_name(plot_func):
+    """
+    Name of the public plotting function plot_func was defined in, e.g.
+    'line_plot' for line_plot's nested plot_func
+
+    Parameters
+    ----------
+    plot_func : function
+        Plotting function
+
+    Returns
+    -------
+    str
+    """
+    name = getattr(plot_func, '__qualname__', None) or repr(plot_func)
+
+    return name.split('.<locals>')[0]
+
+
+class PhaseTimer:
+    """
+    Times the phases of a single render. Timing is skipped entirely when no
+    callbacks are registered at the start of the render.
+    """
+    def __init__(self, plot_type):
+        """
+        Parameters
+        ----------
+        plot_type : str
+            Name of the plot type being rendered
+        """
+        with _LOCK:
+            self._callbacks = tuple(_CALLBACKS)
+
+        self._plot_type = plot_type
+        self._timings = {}
+
+    @property
+    def enabled(self):
+        """
+        Whether any callbacks will receive the timings
+
+        Returns
+        -------
+        bool
+        """
+        return bool(self._callbacks)
+
+    @property
+    def timings(self):
+        """
+        Seconds spent in each phase so far
+
+        Returns
+        -------
+        dict
+        """
+        return self._timings
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time the body of a with block as phase name, time spent in the same
+        phase more than once is summed
+
+        Parameters
+        ----------
+        name : str
+            Phase name
+        """
+        if not self._callbacks:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        """
+        Add time spent in a phase
+
+        Parameters
+        ----------
+        name : str
+            Phase name
+        seconds : float
+            Time spent in phase
+        """
+        self._timings[name] = self._timings.get(name, 0.) + seconds
+
+    def finish(self):
+        """
+        Report the timings to the registered callbacks
+
+        Returns
+        -------
+        TimingRecord | None
+            Timings of the render, None if timing is disabled
+        """
+        if not self._callbacks:
+            return None
+
+        record = TimingRecord(self._plot_type, dict(self._timings),
+                              sum(self._timings.values()))
+        for callback in self._callbacks:
+            callback(record)
+
+        return record
+
+
+class TimingStats:
+    """
+    Timing callback that collects TimingRecords and summarizes the
+    distribution of each phase per plot type
+    """
+    def __init__(self):
+        self._records = []
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    @property
+    def records(self):
+        """
+        Collected timings
+
+        Returns
+        -------
+        list
+            TimingRecord of each render
+        """
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        """
+        Remove all collected timings
+        """
+        with self._lock:
+            self._records = []
+
+    def to_frame(self):
+        """
+        Collected timings as a DataFrame
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per render with the plot type, seconds spent in each
+            phase (NaN if skipped) and the total
+        """
+        rows = [dict(record.timings, plot_type=record.plot_type,
+                     total=record.total)
+                for record in self.records]
+        columns = ['plot_type'] + list(PHASES) + ['total']
+        df = pd.DataFrame(rows)
+        extra = [c for c in df.columns if c not in columns]
+
+        return df.reindex(columns=columns + extra)
+
+    def summary(self, percentiles=(50, 95, 99)):
+        """
+        Percentiles of the time spent in each phase per plot type
+
+        Parameters
+        ----------
+        percentiles : tuple, optional
+            Percentiles to report, by default (50, 95, 99)
+
+        Returns
+        -------
+        pandas.DataFrame
+            Indexed by (plot_type, phase) with the number of renders, mean and
+            percentiles in seconds
+        """
+        df = self.to_frame()
+        df = df.melt(id_vars='plot_type', var_name='phase',
+                     value_name='seconds')
+        df = df.dropna(subset=['seconds'])
+        groups = df.groupby(['plot_type', 'phase'], sort=False)['seconds']
+        stats = groups.agg(['count', 'mean'])
+        quantiles = groups.quantile(np.asarray(percentiles) / 100)
+        quantiles = quantiles.unstack()
+        quantiles.columns = ['p{:g}'.format(p) for p in percentiles]
+
+        stats = stats.join(quantiles)
+
+        return stats.sort_index(level='plot_type', sort_remaining=False)
+
+
+@contextmanager
+def record_timings(stats=None):
+    """
+    Collect the timings of every render in a with block
+
+    Parameters
+    ----------
+    stats : TimingStats, optional
+        Aggregator to add the timings to, by default None (new TimingStats)
+
+    Yields
+    ------
+    TimingStats
+    """
+    if stats is None:
+        stats = TimingStats()
+
+    with timing_callback(stats):
+        yield stats
@@ -0,0 +1,368 @@
+"""
+Writing drawn figures to one or more files, in the foreground or background
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+import threading
+import matplotlib as mpl
+from matplotlib.collections import Collection, QuadMesh
+from matplotlib.lines import Line2D
+from plotting.rc import RENDER_LOCK, rc_render
+
+VECTOR_FORMATS = ('pdf', 'svg', 'svgz', 'eps', 'ps')
+# Lines and collections with more points are rasterized in vector output
+RASTERIZE_THRESHOLD = 10 ** 4
+
+
+def output_files(filename):
+    """
+    List of output files
+
+    Parameters
+    ----------
+    filename : str | os.PathLike | list
+        Name of file/path or list of files/paths to save the figure to
+
+    Returns
+    -------
+    list
+    """
+    if isinstance(filename, (str, os.PathLike)):
+        return [filename]
+
+    return list(filename)
+
+
+def is_vector(filename=None, buffer=None):
+    """
+    Check if any of the outputs is a vector format
+
+    Parameters
+    ----------
+    filename : str | os.PathLike | list, optional
+        Name of file/path or list of files/paths the figure is saved to,
+        by default None
+    buffer : str, optional
+        Format the figure is rendered to in memory, by default None
+
+    Returns
+    -------
+    bool
+    """
+    formats = [buffer]
+    if filename is not None:
+        formats += [os.path.splitext(f)[1][1:].lower()
+                    for f in output_files(filename)]
+
+    return any(fmt in VECTOR_FORMATS for fmt in formats)
+
+
+def artist_size(artist):
+    """
+    Number of data points drawn by a line or collection: vertices of a
+    line, cells of a mesh, and the larger of the number of offsets and path
+    vertices of other collections, e.g. scatter points, line segments or
+    contours
+
+    Parameters
+    ----------
+    artist : matplotlib.artist.Artist
+        Artist to measure
+
+    Returns
+    -------
+    int
+        Number of points, 0 for other artists
+    """
+    if isinstance(artist, Line2D):
+        return len(artist.get_xydata())
+
+    if isinstance(artist, QuadMesh):
+        rows, cols = artist.get_coordinates().shape[:2]
+        return (rows - 1) * (cols - 1)
+
+    if isinstance(artist, Collection):
+        n_vertices = sum(len(path.vertices) for path in artist.get_paths())
+        return max(len(artist.get_offsets()), n_vertices)
+
+    return 0
+
+
+def rasterize_artists(fig, threshold=RASTERIZE_THRESHOLD):
+    """
+    Rasterize the lines and collections of every axis of the figure with
+    more than threshold points. Vector backends draw rasterized artists as
+    images at the dpi the figure is saved with, while axes, text and
+    legends stay vector. Raster output is unchanged.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Drawn figure
+    threshold : int, optional
+        Number of points above which an artist is rasterized,
+        by default RASTERIZE_THRESHOLD
+
+    Returns
+    -------
+    list
+        Artists that were rasterized
+    """
+    rasterized = []
+    for axis in fig.axes:
+        for artist in list(axis.lines) + list(axis.collections):
+            if artist_size(artist) > threshold:
+                artist.set_rasterized(True)
+                rasterized.append(artist)
+
+    return rasterized
+
+
+def tight_bbox(fig):
+    """
+    Padded tight bounding box of the figure in inches, as computed by
+    savefig(bbox_inches='tight')
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Figure to measure
+
+    Returns
+    -------
+    matplotlib.transforms.Bbox
+    """
+    return fig.get_tightbbox().padded(mpl.rcParams['savefig.pad_inches'])
+
+
+def save_figure(fig, filename, dpi=100, bbox_inches='tight', **kwargs):
+    """
+    Save figure to one or more files. When saving to several files with
+    bbox_inches='tight' the tight bounding box is measured once and reused
+    for every file instead of being recomputed by each savefig call.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Figure to save
+    filename : str | os.PathLike | list
+        Name of file/path or list of files/paths to save the figure to, the
+        format is inferred from each extension
+    dpi : int, optional
+        DPI resolution of figure, by default 100
+    bbox_inches : str | matplotlib.transforms.Bbox, optional
+        Bounding box to save, by default 'tight'
+    kwargs : dict
+        kwargs for matplotlib.figure.Figure.savefig
+
+    Returns
+    -------
+    list
+        Files written
+    """
+    filenames = output_files(filename)
+    if bbox_inches == 'tight' and len(filenames) > 1:
+        bbox_inches = tight_bbox(fig)
+
+    for f in filenames:
+        fig.savefig(f, dpi=dpi, bbox_inches=bbox_inches, **kwargs)
+
+    return filenames
+
+
+class AsyncWriter:
+    """
+    Thread pool that encodes and writes drawn figures in the background.
+    At most max_pending figures are queued or being written at a time,
+    further submissions block until a slot frees up, which bounds the memory
+    held by figures waiting to be written. Figures are saved inside
+    plotting.rc.rc_render with the rc they were submitted with, so save time
+    rcParams match the render and other threads can not restyle them
+    mid-save. A submission from a thread holding the render lock is saved
+    in that thread when no slot is free, as waiting for a slot could wait on
+    a write blocked by its own lock.
+    """
+    def __init__(self, max_workers=2, max_pending=8):
+        """
+        Parameters
+        ----------
+        max_workers : int, optional
+            Number of writer threads, by default 2
+        max_pending : int, optional
+            Maximum number of figures queued or being written,
+            by default 8
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='plotting')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures = set()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown(wait=True)
+
+    @property
+    def pending(self):
+        """
+        Number of figures queued or being written
+
+        Returns
+        -------
+        int
+        """
+        with self._lock:
+            return len(self._futures)
+
+    def _done(self, future):
+        """
+        Free the slot held by a finished write
+
+        Parameters
+        ----------
+        future : concurrent.futures.Future
+            Finished write
+        """
+        with self._lock:
+            self._futures.discard(future)
+
+        self._slots.release()
+
+    @staticmethod
+    def _write(fig, filename, rc, written, kwargs):
+        """
+        Save figure
+
+        Parameters
+        ----------
+        fig : matplotlib.figure.Figure
+            Figure to save
+        filename : str | list
+            Name of file/path or list of files/paths to save the figure to
+        rc : dict | None
+            rcParams to save with
+        written : function | None
+            Called once the figure is written, before the write completes
+        kwargs : dict
+            kwargs for save_figure
+
+        Returns
+        -------
+        str | list
+            filename
+        """
+        with rc_render(rc):
+            save_figure(fig, filename, **kwargs)
+
+        if written is not None:
+            written()
+
+        return filename
+
+    def submit(self, fig, filename, rc=None, written=None, **kwargs):
+        """
+        Queue a figure to be written, blocks while max_pending figures are
+        already queued. The figure must not be modified until the returned
+        future is done.
+
+        Parameters
+        ----------
+        fig : matplotlib.figure.Figure
+            Drawn figure, should not be managed by pyplot
+        filename : str | list
+            Name of file/path or list of files/paths to save the figure to
+        rc : dict, optional
+            rcParams the figure was rendered with, e.g. the rc of the
+            plotting call, by default None
+        written : function, optional
+            Called without arguments in the writer thread once the figure is
+            written, before the returned future resolves, by default None
+        kwargs : dict
+            kwargs for save_figure
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future resolving to filename once the figure is written
+        """
+        rc = dict(rc) if rc else None
+        if RENDER_LOCK.held:
+            if not self._slots.acquire(blocking=False):
+                future = Future()
+                try:
+                    future.set_result(self._write(fig, filename, rc, written,
+                                                  kwargs))
+                except Exception as e:
+                    future.set_exception(e)
+
+                return future
+        else:
+            self._slots.acquire()
+
+        try:
+            future = self._executor.submit(self._write, fig, filename, rc,
+                                           written, kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._futures.add(future)
+
+        future.add_done_callback(self._done)
+
+        return future
+
+    def wait(self):
+        """
+        Block until all queued figures are written
+
+        Returns
+        -------
+        list
+            Exceptions raised by the writes that were pending
+        """
+        with self._lock:
+            futures = list(self._futures)
+
+        return [f.exception() for f in futures
+                if f.exception() is not None]
+
+    def shutdown(self, wait=True):
+        """
+        Stop the writer threads
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Wait for queued figures to be written, by default True
+        """
+        self._executor.shutdown(wait=wait)
+
+
+_WRITER = None
+
+
+def get_writer(writer=True):
+    """
+    Resolve the background writer to use
+
+    Parameters
+    ----------
+    writer : bool | AsyncWriter
+        True for the package wide default writer or an AsyncWriter
+
+    Returns
+    -------
+    AsyncWriter
+    """
+    global _WRITER
+    if isinstance(writer, AsyncWriter):
+        return writer
+
+    if _WRITER is None:
+        _WRITER = AsyncWriter()
+
+    return _WRITER
@@ -38,7 +38,7 @@ class PostDevelopCommand(develop):
         develop.run(self)
 
 
-install_requires = ["matplotlib", "seaborn", "pandas"]
+install_requires = ["matplotlib>=3.7", "seaborn", "pandas"]
 
 setup(
     name="plotting",
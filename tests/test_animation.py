@@ -0,0 +1,21 @@
+"""
+Tests for plotting.animation
+"""
+import numpy as np
+
+from plotting.animation import iter_frames
+from plotting.points import line_plot
+
+
+def test_line_collections_frames():
+    """
+    Updating one LineCollection per linestyle renders the same frame as
+    drawing it from scratch
+    """
+    frames = [[np.column_stack([np.arange(10), np.full(10, i + k)])
+               for i in range(3)] for k in range(3)]
+    kwargs = {'collection': True, 'linestyles': ['-', '--'], 'ylim': (0, 6)}
+    last = list(iter_frames(line_plot, frames, **kwargs))[-1]
+    fresh = next(iter_frames(line_plot, frames[-1:], **kwargs))
+
+    assert np.array_equal(last, fresh)
@@ -0,0 +1,41 @@
+"""
+Tests for plotting.batch
+"""
+import numpy as np
+import pytest
+
+import plotting
+from plotting.batch import BATCH_FUNCTIONS, PlotBatch
+
+
+@pytest.mark.parametrize('name', ['LivePlot', 'PlotBatch', 'get_colors',
+                                  'RENDER_LOCK', 'cache', 'missing'])
+def test_not_queued(name):
+    """
+    Only public plotting functions can be queued as attributes
+    """
+    batch = PlotBatch()
+    with pytest.raises(AttributeError):
+        getattr(batch, name)
+
+    assert not hasattr(batch, name)
+
+
+def test_run(tmp_path):
+    """
+    Queued plotting functions are rendered by the workers and their
+    results returned in order
+    """
+    assert all(callable(getattr(plotting, name)) for name in BATCH_FUNCTIONS)
+
+    x = np.arange(20.)
+    batch = PlotBatch(max_workers=1)
+    filenames = [str(tmp_path / '{}.png'.format(i)) for i in range(2)]
+    batch.line_plot(np.column_stack([x, x]), filename=filenames[0],
+                    showplot=False)
+    batch.scatter_plot(x, x, filename=filenames[1], writer=True)
+    results = batch.run()
+
+    assert not batch.errors
+    assert [r.result for r in results] == [None, filenames[1]]
+    assert all((tmp_path / '{}.png'.format(i)).exists() for i in range(2))
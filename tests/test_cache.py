@@ -0,0 +1,104 @@
+"""
+Tests for plotting.cache
+"""
+import numpy as np
+import pytest
+
+from plotting.cache import RenderCache
+from plotting.points import line_plot
+
+
+@pytest.fixture
+def lines():
+    """
+    Two different lines
+    """
+    x = np.arange(20.)
+
+    return np.column_stack([x, x ** 2]), np.column_stack([x, -x])
+
+
+def render(line, filename, cache, **kwargs):
+    """
+    Render line to filename through cache and return the written bytes
+    """
+    line_plot(line, filename=str(filename), showplot=False, cache=cache,
+              **kwargs)
+
+    return filename.read_bytes()
+
+
+@pytest.mark.parametrize('link', [False, True])
+def test_hit_miss(link, lines, tmp_path):
+    """
+    Repeated calls hit, changed data, kwargs or rcParams miss, and a hit
+    returns the figure the key was rendered with
+    """
+    cache = RenderCache(cache_dir=str(tmp_path / 'cache'), link=link)
+    out = tmp_path / 'out.png'
+    a, b = lines
+
+    first = render(a, out, cache)
+    assert render(a, out, cache) == first
+    assert cache.stats['hits'] == 1
+
+    render(b, out, cache)
+    render(a, out, cache, title='a')
+    render(a, out, cache, rc={'lines.linewidth': 5})
+    assert cache.stats['misses'] == 4
+
+    assert render(a, out, cache) == first
+    assert cache.stats['hits'] == 2
+
+
+def test_linked_miss(lines, tmp_path):
+    """
+    A miss rendered to a filename linked to an entry leaves the entry intact
+    """
+    cache = RenderCache(cache_dir=str(tmp_path / 'cache'), link=True)
+    out = tmp_path / 'out.png'
+    a, b = lines
+
+    first = render(a, out, cache)
+    render(a, out, cache)
+    assert render(b, out, cache) != first
+    assert render(a, out, cache) == first
+
+
+def test_evict(lines, tmp_path):
+    """
+    Least recently used entries are evicted past max_size
+    """
+    a, b = lines
+    size = len(render(a, tmp_path / 'size.png', None))
+    cache = RenderCache(cache_dir=str(tmp_path / 'cache'),
+                        max_size=int(size * 1.5))
+    out = tmp_path / 'out.png'
+
+    render(a, out, cache)
+    render(b, out, cache)
+    assert cache.stats['entries'] == 1
+
+    render(b, out, cache)
+    render(a, out, cache)
+    assert cache.stats['hits'] == 1
+    assert cache.stats['misses'] == 3
+
+
+def test_memmap_key(tmp_path):
+    """
+    Read only memory maps are keyed by their file and the view into it
+    """
+    path = tmp_path / 'arr.npy'
+    np.save(path, np.arange(100.))
+    arr = np.load(path, mmap_mode='r')
+    key = RenderCache.key(line_plot, (arr, ), {})
+
+    assert key == RenderCache.key(line_plot, (np.load(path, mmap_mode='r'), ),
+                                  {})
+    assert (RenderCache.key(line_plot, (arr[:50], ), {})
+            != RenderCache.key(line_plot, (arr[50:], ), {}))
+
+    np.save(path, np.arange(101.))
+    assert key != RenderCache.key(line_plot,
+                                  (np.load(path, mmap_mode='r'), ), {})
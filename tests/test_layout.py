@@ -0,0 +1,42 @@
+"""
+Tests for plotting.layout
+"""
+import numpy as np
+import pytest
+
+from plotting.layout import LayoutCache
+from plotting.points import line_plot
+
+
+@pytest.mark.parametrize('buffer', ['png', 'rgba'])
+def test_reuse(buffer):
+    """
+    Figures with fixed limits and the same text share a layout, and are
+    rendered as without the cache
+    """
+    rng = np.random.default_rng(42)
+    cache = LayoutCache()
+    kwargs = dict(xlabel='time (s)', ylabel='value', ylim=(-10, 10),
+                  title='walk', buffer=buffer)
+    for _ in range(3):
+        line = np.column_stack([np.arange(50), rng.standard_normal(50)])
+        out = line_plot(line, layout_cache=cache, **kwargs)
+        assert np.array_equal(out, line_plot(line, **kwargs))
+
+    assert cache.stats['misses'] == 1
+    assert cache.stats['hits'] == 2
+
+
+def test_invalidate():
+    """
+    Figures with different text or tick labels are laid out again
+    """
+    cache = LayoutCache(max_size=2)
+    line = np.column_stack([np.arange(50), np.arange(50.)])
+    line_plot(line, ylim=(0, 50), buffer='png', layout_cache=cache)
+    line_plot(line, ylim=(0, 50000), buffer='png', layout_cache=cache)
+    line_plot(line, ylim=(0, 50), ylabel='y', buffer='png',
+              layout_cache=cache)
+
+    assert cache.stats['misses'] == 3
+    assert cache.stats['entries'] == 2
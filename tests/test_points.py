@@ -0,0 +1,52 @@
+"""
+Tests for plotting.points
+"""
+import numpy as np
+import pytest
+
+from plotting.points import line_plot, scatter_plot
+from plotting.pool import agg_figure
+
+
+@pytest.mark.parametrize('linestyles', [None, [''], ['-', 'None'],
+                                        ['-', '']])
+def test_collection_linestyles(linestyles):
+    """
+    Collection mode skips lines without a linestyle like Line2D mode does
+    """
+    lines = [np.column_stack([np.arange(10), np.arange(10) + i])
+             for i in range(2)]
+    drawn = []
+    for collection in (False, True):
+        fig = agg_figure()
+        ax = fig.add_subplot(111)
+        line_plot(*lines, linestyles=linestyles, collection=collection,
+                  ax=ax)
+        if collection:
+            drawn.append(sum(len(c.get_segments()) for c in ax.collections))
+        else:
+            drawn.append(sum(line.get_linestyle() != 'None'
+                             for line in ax.lines))
+
+    assert drawn[0] == drawn[1]
+
+
+@pytest.mark.parametrize('density', [True, False])
+def test_density_scatter_kwargs(density, tmp_path):
+    """
+    Marker kwargs are ignored by density scatter plots, including chunked
+    inputs that are always drawn as a density
+    """
+    rng = np.random.default_rng(42)
+    x = rng.standard_normal(1000)
+    y = rng.standard_normal(1000)
+    if not density:
+        np.save(tmp_path / 'x.npy', x)
+        np.save(tmp_path / 'y.npy', y)
+        x, y = str(tmp_path / 'x.npy'), str(tmp_path / 'y.npy')
+
+    fig = agg_figure()
+    ax = fig.add_subplot(111)
+    scatter_plot(x, y, density=density, s=5, marker='x', edgecolor='k',
+                 linewidths=0.5, ax=ax)
+    assert len(ax.images) == 1
@@ -0,0 +1,47 @@
+"""
+Tests for plotting.pool
+"""
+import numpy as np
+
+from plotting.colormaps import heatmap_plot
+from plotting.pool import FigurePool
+from plotting.points import line_plot
+
+
+def test_reuse():
+    """
+    Released figures are cleared and reused for the same size and dpi only
+    """
+    pool = FigurePool(max_idle=1)
+    fig = pool.acquire(figsize=(4, 3), dpi=100)
+    fig.add_subplot(111)
+    fig.subplots_adjust(left=0.3)
+    pool.release(fig)
+    assert pool.idle == 1
+
+    assert pool.acquire(figsize=(4, 3), dpi=80) is not fig
+    reused = pool.acquire(figsize=(4, 3), dpi=100)
+    assert reused is fig
+    assert not reused.axes
+    assert reused.subplotpars.left != 0.3
+    assert pool.created == 2
+    assert pool.reused == 1
+
+
+def test_pooled_output():
+    """
+    Pooled renders match unpooled ones after a differently formatted render
+    on the same figure
+    """
+    pool = FigurePool()
+    x = np.arange(20.)
+    line = np.column_stack([x, np.sin(x)])
+    kwargs = dict(xlabel='x', ylabel='sin(x)', title='line', buffer='rgba')
+
+    expected = line_plot(line, **kwargs)
+    heatmap_plot(np.random.default_rng(42).random((5, 5)), cbar=True,
+                 xlim=(0, 10), buffer='rgba', pooled=pool)
+    out = line_plot(line, pooled=pool, **kwargs)
+
+    assert pool.reused == 1
+    assert np.array_equal(out, expected)
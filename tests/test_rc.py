@@ -0,0 +1,59 @@
+"""
+Tests for plotting.rc
+"""
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import matplotlib as mpl
+import numpy as np
+
+from plotting.points import line_plot
+from plotting.rc import RenderLock
+
+
+def test_upgrade():
+    """
+    A shared holder can take the lock exclusively, which blocks other
+    shared holders until it is released, and holds it shared again after
+    """
+    lock = RenderLock()
+    upgraded = threading.Event()
+    acquired = threading.Event()
+
+    def reader():
+        upgraded.wait()
+        with lock.shared():
+            acquired.set()
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    with lock.shared():
+        with lock.exclusive():
+            upgraded.set()
+            assert not acquired.wait(timeout=0.5)
+
+        assert lock.held
+        assert acquired.wait(timeout=30)
+
+    thread.join(timeout=30)
+    assert not lock.held
+
+
+def test_threads_rc():
+    """
+    Concurrent renders with different rc match sequential renders and do
+    not change the global rcParams
+    """
+    x = np.arange(20.)
+    line = np.column_stack([x, np.sin(x)])
+    rcs = [None, {'lines.linewidth': 6, 'axes.facecolor': 'yellow'}]
+    expected = [line_plot(line, buffer='rgba', rc=rc) for rc in rcs]
+    before = dict(mpl.rcParams)
+
+    def render(i):
+        return i % 2, line_plot(line, buffer='rgba', rc=rcs[i % 2])
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for i, out in executor.map(render, range(16)):
+            assert np.array_equal(out, expected[i])
+
+    assert dict(mpl.rcParams) == before
@@ -0,0 +1,66 @@
+"""
+Tests for plotting.sources
+"""
+from matplotlib.collections import PathCollection
+import numpy as np
+import pandas as pd
+import pytest
+
+from plotting.points import scatter_plot
+from plotting.pool import agg_figure
+from plotting.sources import is_chunked, iter_chunks, load_source
+
+
+def test_is_chunked(tmp_path):
+    """
+    In memory arrays are used directly, files, memory maps and iterators
+    are streamed
+    """
+    arr = np.arange(10.)
+    path = tmp_path / 'arr.npy'
+    np.save(path, arr)
+
+    assert not is_chunked(arr)
+    assert not is_chunked(pd.Series(arr))
+    assert not is_chunked(pd.DataFrame({'a': arr}))
+    assert is_chunked(str(path))
+    assert is_chunked(np.load(path, mmap_mode='r'))
+    assert is_chunked(iter([arr]))
+    assert not is_chunked([arr])
+
+
+def test_scatter_plot_series():
+    """
+    Scatter plots of Series are drawn as points, not as a density image
+    """
+    rng = np.random.default_rng(42)
+    x = pd.Series(rng.standard_normal(100))
+    y = pd.Series(rng.standard_normal(100))
+    fig = agg_figure()
+    ax = fig.add_subplot(111)
+    scatter_plot(x, y, ax=ax)
+    assert any(isinstance(c, PathCollection) for c in ax.collections)
+
+
+@pytest.mark.parametrize('save', [np.savez, np.savez_compressed])
+def test_npz_chunks(save, tmp_path):
+    """
+    Arrays in .npz files are memory mapped or decompressed chunk by chunk
+    instead of being loaded whole
+    """
+    rng = np.random.default_rng(42)
+    arrays = {'a': rng.standard_normal((1000, 2)), 'b': np.arange(10.)}
+    path = tmp_path / 'arrays.npz'
+    save(path, **arrays)
+
+    source = load_source(path)
+    if save is np.savez:
+        assert isinstance(source, np.memmap)
+        assert np.array_equal(source, arrays['a'])
+    else:
+        assert not isinstance(source, np.ndarray)
+
+    for key, arr in arrays.items():
+        chunks = list(iter_chunks(path, chunksize=64, key=key))
+        assert max(len(chunk) for chunk in chunks) <= 64
+        assert np.array_equal(np.concatenate(chunks), arr)
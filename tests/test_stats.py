@@ -0,0 +1,44 @@
+"""
+Tests for plotting.stats
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from plotting.dataframes import bar_plot, box_plot, point_plot
+
+
+@pytest.fixture
+def nan_keys_df():
+    """
+    Long DataFrame with missing x and hue keys
+    """
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({'group': rng.choice(['a', 'b', 'c'], 200),
+                       'hue': rng.choice(['x', 'y'], 200),
+                       'value': rng.standard_normal(200)})
+    df.loc[::7, 'group'] = np.nan
+    df.loc[::11, 'hue'] = np.nan
+
+    return df
+
+
+@pytest.mark.parametrize('plot', [box_plot, bar_plot, point_plot])
+def test_native_nan_keys(plot, nan_keys_df):
+    """
+    Rows with a missing x or hue key are dropped like seaborn does
+    """
+    out = plot(nan_keys_df, x='group', y='value', hue='hue',
+               engine='native', buffer='png')
+    assert out[:4] == b'\x89PNG'
+
+
+@pytest.mark.parametrize('chunks', [list, iter])
+def test_native_box_chunks(chunks, nan_keys_df):
+    """
+    A list or iterator of DataFrame chunks is summarized with sketches
+    """
+    parts = [nan_keys_df.iloc[i:i + 50] for i in range(0, 200, 50)]
+    out = box_plot(chunks(parts), x='group', y='value', hue='hue',
+                   engine='native', buffer='png')
+    assert out[:4] == b'\x89PNG'
@@ -0,0 +1,71 @@
+"""
+Tests for plotting.writer
+"""
+import threading
+import numpy as np
+import pytest
+
+from plotting.points import line_plot
+from plotting.pool import agg_figure
+from plotting.writer import AsyncWriter
+
+
+@pytest.fixture
+def line():
+    """
+    Line to plot
+    """
+    x = np.arange(20.)
+
+    return np.column_stack([x, np.sin(x)])
+
+
+def test_future(line, tmp_path):
+    """
+    Futures resolve to filename once written, with the same output as a
+    synchronous save, and re-raise errors of the write
+    """
+    expected = tmp_path / 'sync.png'
+    line_plot(line, filename=str(expected), showplot=False,
+              rc={'lines.linewidth': 4})
+
+    out = tmp_path / 'async.png'
+    with AsyncWriter() as writer:
+        future = line_plot(line, filename=str(out), writer=writer,
+                           rc={'lines.linewidth': 4})
+        assert future.result(timeout=30) == str(out)
+        assert out.read_bytes() == expected.read_bytes()
+
+        future = line_plot(line, filename=str(tmp_path / 'no' / 'out.png'),
+                           writer=writer)
+        with pytest.raises(FileNotFoundError):
+            future.result(timeout=30)
+
+
+def test_backpressure(tmp_path):
+    """
+    Submissions block while max_pending figures are queued or being written
+    """
+    release = threading.Event()
+    writer = AsyncWriter(max_workers=1, max_pending=2)
+    futures = []
+
+    def submit(i):
+        fig = agg_figure()
+        futures.append(writer.submit(fig, str(tmp_path / '{}.png'.format(i)),
+                                     written=release.wait))
+
+    submit(0)
+    submit(1)
+    blocked = threading.Thread(target=submit, args=(2, ))
+    blocked.start()
+    blocked.join(timeout=0.5)
+    assert blocked.is_alive()
+    assert writer.pending == 2
+
+    release.set()
+    blocked.join(timeout=30)
+    assert not blocked.is_alive()
+    writer.shutdown(wait=True)
+    assert [f.result() for f in futures] == [
+        str(tmp_path / '{}.png'.format(i)) for i in range(3)]